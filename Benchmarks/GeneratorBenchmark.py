@@ -0,0 +1,55 @@
+from GraphAnalyzer import GraphAnalyzer, AverageDegreeCalculator
+import numpy as np
+from time import time
+
+
+def time_generator(graph_type, model_parameters, repeats, generator, backend='networkx'):
+    graph = GraphAnalyzer(graph_type, model_parameters, generator=generator, backend=backend)
+    t1 = time()
+    for i in range(repeats):
+        graph.create_graph(graph_type, model_parameters)
+    t2 = time()
+    return (t2 - t1) / repeats, graph
+
+
+if __name__ == '__main__':
+    repeats = 20
+    N_list = [1000, 10000, 100000]
+    degree = 4
+    beta = 0.1
+
+    calculator = AverageDegreeCalculator(degree_to_get=degree)
+
+    for N in N_list:
+        calculator.change_number_of_nodes(N)
+        x1, x2 = calculator.parameter_from_ba_degree()
+        m = x1 if x1 < x2 else x2
+        parameters = ('BA', (N, m))
+
+        nx_time, nx_graph = time_generator(*parameters, repeats, 'networkx')
+        np_time, np_graph = time_generator(*parameters, repeats, 'numpy')
+        csr_time, _ = time_generator(*parameters, repeats, 'numpy', backend='csr')
+
+        nx_graph.graph_degree_list()
+        nx_graph.average_degree_and_histogram()
+        np_graph.graph_degree_list()
+        np_graph.average_degree_and_histogram()
+        nx_max_degree = max(nx_graph.degree_histogram.keys())
+        np_max_degree = max(np_graph.degree_histogram.keys())
+
+        print(f'BA N = {N}, m = {m}: networkx {round(nx_time, 4)} s, '
+              f'numpy {round(np_time, 4)} s, numpy + csr {round(csr_time, 4)} s, '
+              f'speedup {round(nx_time / csr_time, 1)}x')
+        print(f'    average degree: {round(nx_graph.average_degree, 3)} / {round(np_graph.average_degree, 3)}, '
+              f'max degree: {nx_max_degree} / {np_max_degree}')
+
+        k = calculator.parameter_from_ws_degree()
+        parameters = ('WS', (N, k, beta))
+
+        nx_time, _ = time_generator(*parameters, repeats, 'networkx')
+        np_time, _ = time_generator(*parameters, repeats, 'numpy')
+        csr_time, _ = time_generator(*parameters, repeats, 'numpy', backend='csr')
+
+        print(f'WS N = {N}, k = {k}, beta = {beta}: networkx {round(nx_time, 4)} s, '
+              f'numpy {round(np_time, 4)} s, numpy + csr {round(csr_time, 4)} s, '
+              f'speedup {round(nx_time / csr_time, 1)}x')
@@ -0,0 +1,139 @@
+from GraphAnalyzer import GraphAnalyzer, AverageDegreeCalculator
+from CommonFunctions import save_json_file, read_json_file, check_if_file_exists
+import argparse
+import numpy as np
+from time import time
+
+
+REMOVAL_STRATEGIES = ('random', 'degree', 'degree_adaptive', 'closeness_approx', 'betweenness_approx')
+
+
+def build_graph(graph_type, N, degree, analyzer_options):
+    calculator = AverageDegreeCalculator(N=N, degree_to_get=degree)
+    model_parameters = calculator.model_parameters(graph_type)
+    return GraphAnalyzer(graph_type, model_parameters, **analyzer_options), model_parameters
+
+
+def benchmark_cases(degree, analyzer_options):
+    # name -> (largest N worth timing, setup(N), timed function(state)),
+    # setup runs before every repeat and is not timed
+    cases = {}
+    for graph_type in ('ER', 'ERG', 'BA', 'WS'):
+        # p of ERG is rounded to three decimals and drops to 0 above N = 1000
+        cases[f'create_graph_{graph_type}'] = (
+            10 ** 3 if graph_type == 'ERG' else 10 ** 5,
+            lambda N, graph_type=graph_type: build_graph(graph_type, N, degree, analyzer_options),
+            lambda state, graph_type=graph_type: state[0].create_graph(graph_type, state[1]))
+    cases['calculate_giant_component'] = (
+        10 ** 5,
+        lambda N: build_graph('ER', N, degree, analyzer_options),
+        lambda state: state[0].calculate_giant_component())
+    for strategy in REMOVAL_STRATEGIES:
+        max_N = 10 ** 4 if strategy == 'betweenness_approx' else 10 ** 5
+        cases[f'remove_fraction_of_nodes_{strategy}'] = (
+            max_N,
+            lambda N: build_graph('ER', N, degree, analyzer_options),
+            lambda state, strategy=strategy: state[0].remove_fraction_of_nodes(0.1,
+                                                                               centrality=strategy))
+    cases['calculate_path_histogram'] = (
+        10 ** 4,
+        lambda N: build_graph('ER', N, degree, analyzer_options),
+        lambda state: state[0].calculate_path_histogram())
+    cases['clustering'] = (
+        10 ** 5,
+        lambda N: build_graph('WS', N, degree, analyzer_options),
+        lambda state: (state[0].calculate_clustering_coefficients(),
+                       state[0].calculate_average_coefficient()))
+    return cases
+
+
+def time_case(setup, timed_function, N, repeats):
+    # best of the repeats, the least disturbed measurement
+    best_time = None
+    for _ in range(repeats):
+        state = setup(N)
+        t1 = time()
+        timed_function(state)
+        elapsed = time() - t1
+        best_time = elapsed if best_time is None else min(best_time, elapsed)
+    return best_time
+
+
+def scaling_exponent(N_list, times):
+    # slope of log(time) against log(N)
+    if len(N_list) < 2:
+        return None
+    slope, _ = np.polyfit(np.log(N_list), np.log(np.maximum(times, 1e-9)), 1)
+    return float(slope)
+
+
+def run_benchmarks(N_ladder, repeats, degree, analyzer_options, case_names=None):
+    results = {}
+    for name, (max_N, setup, timed_function) in benchmark_cases(degree, analyzer_options).items():
+        if case_names is not None and name not in case_names:
+            continue
+        N_list = [N for N in N_ladder if N <= max_N]
+        times = [time_case(setup, timed_function, N, repeats) for N in N_list]
+        exponent = scaling_exponent(N_list, times)
+        results[name] = {'times': {str(N): case_time for N, case_time in zip(N_list, times)},
+                         'exponent': exponent}
+        time_str = ', '.join(f'N={N}: {case_time:.4f} s' for N, case_time in zip(N_list, times))
+        exponent_str = f'{exponent:.2f}' if exponent is not None else '-'
+        print(f'{name}: {time_str}, exponent {exponent_str}')
+    return results
+
+
+def find_regressions(results, baseline, threshold=0.25, exponent_threshold=0.25, noise_floor=1e-3):
+    # a case regresses when a time grows over (1 + threshold) times its
+    # baseline by more than the noise floor, or the exponent grows
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        for N, case_time in result['times'].items():
+            baseline_time = baseline[name]['times'].get(N)
+            if baseline_time is None:
+                continue
+            if case_time > (1 + threshold) * baseline_time and case_time - baseline_time > noise_floor:
+                regressions.append(f'{name} N={N}: {case_time:.4f} s, baseline {baseline_time:.4f} s')
+        exponent, baseline_exponent = result['exponent'], baseline[name]['exponent']
+        if exponent is not None and baseline_exponent is not None \
+                and exponent > baseline_exponent + exponent_threshold:
+            regressions.append(f'{name}: exponent {exponent:.2f}, baseline {baseline_exponent:.2f}')
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--max-n', type=int, default=10 ** 5, help='largest N of the ladder')
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--degree', type=int, default=4)
+    parser.add_argument('--backend', default='csr', choices=['csr', 'networkx'])
+    parser.add_argument('--cases', nargs='*', default=None, help='names of the cases to run')
+    parser.add_argument('--baseline', default='ScalingBaseline.json')
+    parser.add_argument('--update-baseline', action='store_true')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='relative slowdown reported as a regression')
+    arguments = parser.parse_args()
+
+    N_ladder = [N for N in (10 ** 2, 10 ** 3, 10 ** 4, 10 ** 5) if N <= arguments.max_n]
+    analyzer_options = {'backend': arguments.backend,
+                        'generator': 'numpy' if arguments.backend == 'csr' else 'networkx'}
+    results = run_benchmarks(N_ladder, arguments.repeats, arguments.degree, analyzer_options,
+                             case_names=arguments.cases)
+
+    # baselines of different backends are kept apart
+    if check_if_file_exists(arguments.baseline):
+        baselines = read_json_file(arguments.baseline)
+    else:
+        baselines = {}
+    baseline = baselines.get(arguments.backend, {})
+    regressions = find_regressions(results, baseline, threshold=arguments.threshold)
+    for regression in regressions:
+        print(f'REGRESSION {regression}')
+
+    if arguments.update_baseline or not baseline:
+        baselines[arguments.backend] = dict(baseline, **results)
+        save_json_file(baselines, arguments.baseline)
+    if regressions:
+        raise SystemExit(1)
@@ -0,0 +1,30 @@
+from GraphAnalyzer import GraphAnalyzer, AverageDegreeCalculator
+import numpy as np
+
+
+if __name__ == '__main__':
+    samples = 5
+    N = 2000
+    degree = 4
+    pivot_list = [32, 128, 512]
+
+    f_space = np.linspace(0, 1, 101)
+
+    calculator = AverageDegreeCalculator(N=N, degree_to_get=degree)
+    x1, x2 = calculator.parameter_from_ba_degree()
+    m = x1 if x1 < x2 else x2
+
+    graph = GraphAnalyzer('BA', (N, m))
+    for pivots in pivot_list:
+        max_deviation, mean_deviation, approx_time, exact_time = 0, 0, 0, 0
+        for i in range(samples):
+            report = graph.compare_attack_curves(f_space, centrality='betweenness_approx',
+                                                 pivots=pivots)
+            max_deviation = max(max_deviation, report['max_deviation'])
+            mean_deviation += report['mean_deviation'] / samples
+            approx_time += report['time']
+            exact_time += report['reference_time']
+            graph.create_graph('BA', (N, m))
+        print(f'Pivots: {pivots}, max deviation: {round(max_deviation, 4)}, '
+              f'mean deviation: {round(mean_deviation, 4)}, '
+              f'time: {round(approx_time, 2)} s (exact: {round(exact_time, 2)} s)')
@@ -0,0 +1,141 @@
+import networkx as nx
+import numpy as np
+from scipy.sparse import csr_array
+from scipy.sparse.csgraph import connected_components
+from UnionFind import UnionFind
+from TriangleCounter import TriangleCounter
+from CommonFunctions import load_edge_list
+
+
+class CSRGraph(object):
+    # undirected graph stored as int32 CSR arrays, nodes are 0..N-1 and
+    # removed nodes are only switched off in the alive mask
+    def __init__(self, N, indptr, indices, labels=None, rows=None):
+        self.N = N
+        self.indptr = indptr
+        self.indices = indices
+        self.alive = np.ones(N, dtype=bool)
+        self.labels = labels
+        if rows is None:
+            rows = np.repeat(np.arange(N, dtype=np.int32), np.diff(indptr))
+        self.rows = rows
+
+    @classmethod
+    def from_edges(cls, N, edges, labels=None):
+        edges = np.asarray(edges, dtype=np.int32).reshape(-1, 2)
+        edges = edges[edges[:, 0] != edges[:, 1]]
+        sources = np.concatenate((edges[:, 0], edges[:, 1]))
+        targets = np.concatenate((edges[:, 1], edges[:, 0]))
+        # duplicated links are dropped, sorting by (source, target) also
+        # groups the neighbours of every node together
+        keys = np.sort(sources.astype(np.int64) * N + targets)
+        keys = keys[np.concatenate(([True], np.diff(keys) > 0))] if len(keys) else keys
+        sources = (keys // N).astype(np.int32)
+        indices = (keys % N).astype(np.int32)
+        indptr = np.zeros(N + 1, dtype=np.int32)
+        np.cumsum(np.bincount(sources, minlength=N), out=indptr[1:])
+        return cls(N, indptr, indices, labels=labels)
+
+    @classmethod
+    def from_networkx(cls, graph):
+        nodes = list(graph.nodes)
+        node_index = {node: index for index, node in enumerate(nodes)}
+        edges = np.fromiter((node_index[node] for edge in graph.edges for node in edge),
+                            dtype=np.int32, count=2 * graph.number_of_edges())
+        labels = None if nodes == list(range(len(nodes))) else nodes
+        return cls.from_edges(len(nodes), edges.reshape(-1, 2), labels=labels)
+
+    @classmethod
+    def from_edge_list(cls, file_path, comments=('#', '%')):
+        edges, labels = load_edge_list(file_path, comments=comments)
+        return cls.from_edges(len(labels), edges, labels=labels)
+
+    def edge_array(self, alive_only=True):
+        mask = self.rows < self.indices
+        if alive_only:
+            mask &= self.alive[self.rows] & self.alive[self.indices]
+        return np.column_stack((self.rows[mask], self.indices[mask]))
+
+    def to_networkx(self, use_labels=True):
+        graph = nx.Graph()
+        alive_nodes = np.flatnonzero(self.alive)
+        edges = self.edge_array()
+        if self.labels is None or not use_labels:
+            graph.add_nodes_from(alive_nodes.tolist())
+            graph.add_edges_from(edges.tolist())
+        else:
+            graph.add_nodes_from(self.labels[node] for node in alive_nodes)
+            graph.add_edges_from((self.labels[source], self.labels[target])
+                                 for source, target in edges.tolist())
+        return graph
+
+    def number_of_nodes(self):
+        return int(np.count_nonzero(self.alive))
+
+    def alive_nodes(self):
+        return np.flatnonzero(self.alive)
+
+    def neighbors(self, node):
+        neighbors = self.indices[self.indptr[node]:self.indptr[node + 1]]
+        return neighbors[self.alive[neighbors]].tolist()
+
+    def remove_nodes(self, nodes):
+        self.alive[np.asarray(nodes, dtype=np.int64)] = False
+
+    def degree(self):
+        alive_edges = self.alive[self.rows] & self.alive[self.indices]
+        degrees = np.bincount(self.rows[alive_edges], minlength=self.N)
+        degrees[~self.alive] = 0
+        return degrees
+
+    def adjacency_matrix(self, alive_only=True):
+        # alive_only keeps the N x N shape, removed nodes simply lose their links
+        indptr, indices = self.indptr, self.indices
+        if alive_only and not self.alive.all():
+            alive_edges = self.alive[self.rows] & self.alive[self.indices]
+            indices = self.indices[alive_edges]
+            indptr = np.zeros(self.N + 1, dtype=np.int32)
+            np.cumsum(np.bincount(self.rows[alive_edges], minlength=self.N), out=indptr[1:])
+        data = np.ones(len(indices), dtype=np.int8)
+        return csr_array((data, indices.copy(), indptr.copy()), shape=(self.N, self.N))
+
+    def connected_components(self):
+        # component label of every node, removed nodes get -1
+        _, labels = connected_components(self.adjacency_matrix(), directed=False)
+        labels[~self.alive] = -1
+        return labels
+
+    def giant_component(self):
+        labels = self.connected_components()
+        labels = labels[labels >= 0]
+        if len(labels) == 0:
+            return 0
+        return int(np.bincount(labels).max())
+
+    def clustering_statistics(self):
+        # local coefficients, triangles, average and transitivity of the alive
+        # subgraph, removed nodes get zeros
+        return TriangleCounter(self.N, self.edge_array()).clustering()
+
+    def triangles(self):
+        return self.clustering_statistics()['triangles']
+
+    def clustering(self):
+        return self.clustering_statistics()['coefficients']
+
+    def giant_component_curve(self, removal_order):
+        # same reverse insertion as GraphAnalyzer.giant_component_curve
+        removal_order = np.asarray(removal_order, dtype=np.int64)
+        number_of_nodes = len(removal_order)
+        position = np.full(self.N, -1, dtype=np.int64)
+        position[removal_order] = np.arange(number_of_nodes)
+        union_find = UnionFind(number_of_nodes)
+        curve = np.zeros(number_of_nodes + 1, dtype=int)
+        for index in range(number_of_nodes - 1, -1, -1):
+            union_find.add(index)
+            node = removal_order[index]
+            neighbor_positions = position[self.indices[self.indptr[node]:self.indptr[node + 1]]]
+            for neighbor_index in neighbor_positions[neighbor_positions > index].tolist():
+                union_find.union(index, neighbor_index)
+            curve[number_of_nodes - index] = union_find.largest
+        return curve
@@ -1,4 +1,6 @@
-from GraphAnalyzer import GraphAnalyzer, AverageDegreeCalculator
+from GraphAnalyzer import AverageDegreeCalculator
+from SweepRunner import SweepRunner, parse_sweep_arguments
+from ResultCache import ResultCache
 import numpy as np
 from time import time
 from CommonFunctions import save_json_file, make_directories
@@ -9,7 +11,14 @@ if __name__ == '__main__':
     degrees = [2, 4]
     graph_type = 'BA'
 
+    # 'closeness_approx' ranks nodes with HyperANF counters instead of exact BFS
+    centrality = 'closeness'
+
     f_space = np.linspace(0, 1, 101)
+    arguments = parse_sweep_arguments()
+    runner = SweepRunner(graph_type, f_space, samples, centrality=centrality, jobs=arguments.jobs,
+                         cache=None if arguments.no_cache else ResultCache(),
+                         metrics_log=arguments.metrics_log)
 
     data_dict = {'type': graph_type,
                  'N': N,
@@ -19,8 +28,13 @@ if __name__ == '__main__':
 
     calculator = AverageDegreeCalculator(N=N)
 
+    approx_str = 'Approx' if centrality == 'closeness_approx' else ''
+
     results_path = 'results'
     make_directories([results_path])
+    checkpoint = runner.open_checkpoint(f'ClosenessCentrality{approx_str}', N, sub_dir=results_path,
+                                        resume=arguments.resume,
+                                        interval=arguments.checkpoint_interval)
 
     t_total = 0
     for degree in degrees:
@@ -30,21 +44,9 @@ if __name__ == '__main__':
         x1, x2 = calculator.parameter_from_ba_degree()
         m = x1 if x1 < x2 else x2
 
-        graph = GraphAnalyzer(graph_type, (N, m))
-        graph.assign_initial_n()
-
-        avg_component = np.zeros(len(f_space))
-
-        for index, f in enumerate(f_space):
-            print(f)
-            avg = 0
-            for i in range(samples):
-                graph.remove_fraction_of_nodes(f, centrality='closeness')
-                avg += graph.calculate_giant_component()
-                graph.create_graph(graph_type, (N, m))
-
-            avg_component[index] = avg / samples
-        avg_component = avg_component / graph.initial_N
+        store = runner.open_store(f'ClosenessCentrality{approx_str}', N, degree, sub_dir=results_path,
+                                  append=checkpoint.resumed)
+        avg_component = runner.run((N, m), store=store, checkpoint=checkpoint, key=str(degree))
 
         t2 = time()
         delta = round(t2 - t1)
@@ -58,6 +60,7 @@ if __name__ == '__main__':
     degree_str = ''
     for deg in degrees:
         degree_str += f'k{deg}'
-    file_title = f'ClosenessCentrality{graph_type}N{N}L{samples}deg{degree_str}.json'
+    file_title = f'ClosenessCentrality{approx_str}{graph_type}N{N}L{samples}deg{degree_str}.json'
 
     save_json_file(data_dict, file_title, sub_dir=results_path)
+    checkpoint.remove()
@@ -1,5 +1,6 @@
 from matplotlib import pyplot as plt
-from CommonFunctions import read_json_file, make_directories, check_if_file_exists
+from CommonFunctions import make_directories, check_if_file_exists
+from ResultCache import ResultCache, read_sweep_data
 import os
 
 
@@ -12,29 +13,21 @@ if __name__ == '__main__':
     image_path = 'images'
     results_path = 'results'
     make_directories([results_path, image_path])
+    cache = ResultCache(os.path.join(results_path, 'cache'))
 
-    degree_str = ''
-    for deg in degrees:
-        degree_str += f'k{deg}'
-    file_title = f'ClosenessCentrality{graph_type}N{N}L{samples}deg{degree_str}.json'
-
-    ba_dict = read_json_file(file_title, sub_dir=results_path)
+    ba_dict = read_sweep_data('ClosenessCentrality', graph_type, N, samples, degrees, sub_dir=results_path,
+                              cache=cache)
     print(ba_dict)
 
     graph_type = 'WS'
-    file_title = f'ClosenessCentrality{graph_type}N{N}L{samples}deg{degree_str}.json'
-
-    ws_dict = read_json_file(file_title, sub_dir=results_path)
+    ws_dict = read_sweep_data('ClosenessCentrality', graph_type, N, samples, degrees, sub_dir=results_path,
+                              cache=cache)
     print(ws_dict)
 
     degrees = [0.5, 1, 2, 4]
     graph_type = 'ERG'
-    degree_str = ''
-    for deg in degrees:
-        degree_str += f'k{deg}'
-    file_title = f'ClosenessCentrality{graph_type}N{N}L{samples}deg{degree_str}.json'
-
-    erg_dict = read_json_file(file_title, sub_dir=results_path)
+    erg_dict = read_sweep_data('ClosenessCentrality', graph_type, N, samples, degrees, sub_dir=results_path,
+                               cache=cache)
     print(erg_dict)
 
     figure, axes = plt.subplots(3, 1, layout='constrained', figsize=(8, 13))
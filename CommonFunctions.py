@@ -1,14 +1,140 @@
+import gzip
 import json
 import os
+import random
+import numpy as np
 from datetime import datetime
 
 
+def seed_generators(seed):
+    np.random.seed(seed)
+    random.seed(seed)
+
+
+def sample_seed(seed, index):
+    # seed of sample index of a run, the same child as
+    # SeedSequence(seed).spawn(index + 1)[index], so a seeded run gives the
+    # same samples however they are split into chunks
+    return int(np.random.SeedSequence(seed, spawn_key=(index,)).generate_state(1)[0])
+
+
 def read_tuple_data(connections_string):
     connections_string = connections_string.replace('\n', '')
     connections = connections_string.split(' ')
     return int(connections[0]), int(connections[1])
 
 
+def open_edge_file(file_path):
+    if file_path.endswith('.gz'):
+        return gzip.open(file_path, 'rb')
+    return open(file_path, 'rb')
+
+
+def read_text_chunks(file_path, chunk_bytes=2 ** 26):
+    # chunks always end on a line break so no line is split between them
+    with open_edge_file(file_path) as file:
+        leftover = b''
+        while True:
+            chunk = file.read(chunk_bytes)
+            if not chunk:
+                break
+            chunk = leftover + chunk
+            last_line_break = chunk.rfind(b'\n')
+            if last_line_break == -1:
+                leftover = chunk
+                continue
+            leftover = chunk[last_line_break + 1:]
+            yield chunk[:last_line_break + 1].decode()
+        if leftover:
+            yield leftover.decode()
+
+
+def row_widths(text):
+    # number of whitespace separated values on every non-blank line,
+    # counted as the value starts between two line breaks
+    characters = np.frombuffer(text.encode(), dtype=np.uint8)
+    blank = characters <= 32
+    value_starts = np.flatnonzero(~blank & np.concatenate(([True], blank[:-1])))
+    line_breaks = np.flatnonzero(characters == 10)
+    widths = np.diff(np.concatenate(([0], np.searchsorted(value_starts, line_breaks),
+                                     [len(value_starts)])))
+    return widths[widths > 0]
+
+
+def parse_edge_chunk(text, comments=('#', '%'), weighted=False):
+    if isinstance(comments, str):
+        comments = (comments,)
+    # a comment runs to the end of its line, whole-line and trailing ones
+    if any(comment in text for comment in comments):
+        lines = text.splitlines()
+        for comment in comments:
+            lines = [line.split(comment, 1)[0] for line in lines]
+        text = '\n'.join(lines)
+    columns = 3 if weighted else 2
+    widths = row_widths(text)
+    if np.any(widths != columns):
+        raise ValueError(f'Edge list chunk has rows without exactly {columns} columns.')
+    if len(widths) == 0:
+        # np.fromstring reads one bogus value from blank text
+        return np.zeros((0, 2), dtype=np.int64), np.zeros(0) if weighted else None
+    if weighted:
+        # node ids stay integers, float64 would round ids above 2^53
+        values = np.array(text.split()).reshape(-1, columns)
+        return values[:, :2].astype(np.int64), values[:, 2].astype(np.float64)
+    values = np.fromstring(text, sep=' ', dtype=np.int64)
+    return values.reshape(-1, columns), None
+
+
+def load_edge_list(file_path, comments=('#', '%'), weighted=False, chunk_bytes=2 ** 26):
+    # whitespace separated integer node ids, optional third column with weights,
+    # text after a comment character is ignored, rows with another number of
+    # values raise ValueError,
+    # node ids are relabeled to 0..N-1 and labels[i] is the original id of node i,
+    # self-loops and repeated links are dropped
+    edge_chunks = []
+    weight_chunks = []
+    for text in read_text_chunks(file_path, chunk_bytes=chunk_bytes):
+        edges, weights = parse_edge_chunk(text, comments=comments, weighted=weighted)
+        edge_chunks.append(edges)
+        if weighted:
+            weight_chunks.append(weights)
+    edges = np.concatenate(edge_chunks) if edge_chunks else np.zeros((0, 2), dtype=np.int64)
+
+    edges, labels = relabel_nodes(edges)
+    edges = np.sort(edges, axis=1)
+    keys = edges[:, 0].astype(np.int64) * len(labels) + edges[:, 1]
+    if weighted:
+        # the first occurrence of a link keeps its weight
+        order = np.argsort(keys, kind='stable')
+        keep = order[np.concatenate(([True], np.diff(keys[order]) > 0))] if len(keys) else order
+        keep = np.sort(keep[edges[keep, 0] != edges[keep, 1]])
+        return edges[keep], labels, np.concatenate(weight_chunks)[keep]
+    keys = np.sort(keys)
+    keys = keys[np.concatenate(([True], np.diff(keys) > 0))] if len(keys) else keys
+    edges = np.column_stack(np.divmod(keys, len(labels))).astype(np.int32)
+    return edges[edges[:, 0] != edges[:, 1]], labels
+
+
+def relabel_nodes(edges):
+    # contiguous int32 ids, a lookup table is used when the original ids are dense enough
+    if len(edges) == 0:
+        return edges.astype(np.int32), np.zeros(0, dtype=np.int64)
+    minimum, maximum = edges.min(), edges.max()
+    if maximum - minimum < 4 * edges.size:
+        present = np.zeros(maximum - minimum + 1, dtype=bool)
+        present[edges.ravel() - minimum] = True
+        labels = np.flatnonzero(present) + minimum
+        lookup = np.cumsum(present, dtype=np.int64) - 1
+        return lookup[edges - minimum].astype(np.int32), labels
+    flat = edges.ravel()
+    order = np.argsort(flat, kind='stable')
+    first = np.concatenate(([True], np.diff(flat[order]) > 0))
+    labels = flat[order][first]
+    inverse = np.empty(len(flat), dtype=np.int32)
+    inverse[order] = np.cumsum(first) - 1
+    return inverse.reshape(edges.shape), labels
+
+
 def check_if_file_is_empty(file_path):
     return os.stat(file_path).st_size == 0
 
@@ -1,6 +1,5 @@
-import networkx as nx
 from GraphAnalyzer import GraphAnalyzer
-from CommonFunctions import read_tuple_data
+from GraphCache import GraphCache
 from matplotlib import pyplot as plt
 from time import time
 
@@ -10,17 +9,14 @@ if __name__ == '__main__':
 
     time_start = time()
 
-    with open(path, 'r') as file:
-        nodes = file.readlines()
-
-    nodes = list(map(read_tuple_data, nodes))
+    # converted once into memory-mapped arrays, later runs only map them
+    graph_cache = GraphCache()
+    facebook_graph = graph_cache.load(path)
     time_stop = time()
     delta = round(time_stop - time_start, 3)
     print(f'Nodes loaded, time: {delta} seconds...')
 
     time_start = time()
-    facebook_graph = nx.Graph()
-    facebook_graph.add_edges_from(nodes)
 
     fb_graph_analyzer = GraphAnalyzer(model_name='custom',
                                       model_parameters='Ego-Facebook',
@@ -88,7 +84,7 @@ if __name__ == '__main__':
     axis[2].set(title=title, xlabel='path length', ylabel='path quantity')
 
     title = f'Graph of ego-Facebook dataset. Calculation time: {sim_time} seconds,\n' \
-            f'number of: nodes: {fb_graph_analyzer.N}, edges: {fb_graph_analyzer.graph.number_of_edges()}'
+            f'number of: nodes: {fb_graph_analyzer.N}, edges: {fb_graph_analyzer.number_of_edges()}'
     figure.suptitle(title)
     # figure.savefig('EgoFacebook.png')
     plt.show()
\ No newline at end of file
@@ -1,18 +1,15 @@
 import networkx as nx
 from matplotlib import pyplot as plt
-from CommonFunctions import read_tuple_data
+from CommonFunctions import load_edge_list
 
 
 if __name__ == '__main__':
     path = 'euroroad.txt'
 
-    with open(path, 'r') as file:
-        nodes = file.readlines()
-
-    nodes = list(map(read_tuple_data, nodes))
+    edges, labels = load_edge_list(path)
 
     road_graph = nx.Graph()
-    road_graph.add_edges_from(nodes)
+    road_graph.add_edges_from(labels[edges].tolist())
 
     figure, axes = plt.subplots(3, 1, layout='constrained', figsize=(9, 15))
 
@@ -0,0 +1,182 @@
+import argparse
+import os
+import numpy as np
+from time import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from GraphAnalyzer import AverageDegreeCalculator
+from SweepRunner import run_strategy_samples, add_profile_arguments, apply_profile_arguments
+from ResultStore import ResultStore, result_store_path, STRATEGY_PREFIXES, STRATEGY_DIRECTORIES
+from ResultCache import ResultCache
+from StageTimer import StageTimer
+from CommonFunctions import save_json_file, read_json_file
+
+
+REPOSITORY_PATH = os.path.dirname(os.path.abspath(__file__))
+
+
+class ExperimentRunner(object):
+    # config grid of experiments, each one a model with its N, degrees,
+    # samples and attack strategies, e.g.
+    # {"f_space": [0, 1, 101],
+    #  "experiments": [{"type": "BA", "N": 10000, "degrees": [2, 4], "samples": 500,
+    #                   "strategies": ["random", "degree"],
+    #                   "analyzer_options": {"backend": "csr", "generator": "numpy"}}]}
+    # results of a strategy go to <strategy directory>/results, where its
+    # plotting script reads them, an optional "results_path" (one directory
+    # or {strategy: directory}) overrides that, relative paths start at the
+    # repository and not at the working directory
+    chunks_per_job = 8
+
+    def __init__(self, config, jobs=1, use_cache=True, metrics_log=None):
+        self.config = config
+        self.jobs = jobs if jobs > 0 else os.cpu_count()
+        self.f_space = np.linspace(*config.get('f_space', [0, 1, 101]))
+        self.use_cache = use_cache
+        self.caches = {}
+        self.metrics_log = metrics_log
+        self.metrics = {}
+
+    @classmethod
+    def from_json(cls, file_path, jobs=1, use_cache=True, metrics_log=None):
+        return cls(read_json_file(file_path), jobs=jobs, use_cache=use_cache,
+                   metrics_log=metrics_log)
+
+    def results_path(self, strategy):
+        results_path = self.config.get('results_path')
+        if isinstance(results_path, dict):
+            results_path = results_path.get(strategy)
+        if results_path is None:
+            results_path = os.path.join(STRATEGY_DIRECTORIES[strategy], 'results')
+        return os.path.join(REPOSITORY_PATH, results_path)
+
+    def cache(self, strategy):
+        # every results directory has its own cache, as in the plotting scripts
+        if not self.use_cache:
+            return None
+        cache_path = os.path.join(self.results_path(strategy), 'cache')
+        if cache_path not in self.caches:
+            self.caches[cache_path] = ResultCache(cache_path)
+        return self.caches[cache_path]
+
+    def split_samples(self, samples):
+        number_of_chunks = max(min(self.chunks_per_job * self.jobs, samples), 1)
+        chunk_size, remainder = divmod(samples, number_of_chunks)
+        return [chunk_size + 1 if index < remainder else chunk_size
+                for index in range(number_of_chunks)]
+
+    def chunk_results(self, experiment, model_parameters, strategies, seed):
+        # ({strategy: (components, times)}, metrics) of every chunk in order of
+        # completion, every sample is seeded by its index, whatever the chunks
+        chunks = self.split_samples(experiment['samples'])
+        starts = np.cumsum([0] + chunks[:-1]).tolist()
+        arguments = (experiment['type'], model_parameters, self.f_space, strategies)
+        options = (experiment.get('strategy_options'), experiment.get('analyzer_options'))
+        if self.jobs == 1 or len(chunks) == 1:
+            for chunk, start in zip(chunks, starts):
+                yield run_strategy_samples(*arguments, chunk, seed, *options, start)
+            return
+        with ProcessPoolExecutor(max_workers=min(self.jobs, len(chunks))) as executor:
+            futures = [executor.submit(run_strategy_samples, *arguments, chunk, seed, *options, start)
+                       for chunk, start in zip(chunks, starts)]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def run_degree(self, experiment, degree, seed=None):
+        # {strategy: (avg_component, time)}, time is the wall time of the
+        # degree as in the sweep scripts, the strategies share the samples and
+        # that time, strategies found in the cache are not computed again
+        graph_type, N, samples = experiment['type'], experiment['N'], experiment['samples']
+        strategy_options = experiment.get('strategy_options') or {}
+        calculator = AverageDegreeCalculator(N=N, degree_to_get=degree)
+        model_parameters = calculator.model_parameters(graph_type, beta=experiment.get('beta', 0.01))
+        stores = {}
+        cache_keys = {}
+        results = {}
+        for strategy in experiment['strategies']:
+            metadata = {'model': graph_type, 'N': N, 'degree': degree, 'strategy': strategy,
+                        'seed': seed}
+            path = result_store_path(STRATEGY_PREFIXES[strategy], graph_type, N, samples, degree,
+                                     sub_dir=self.results_path(strategy))
+            stores[strategy] = ResultStore.create(path, metadata, self.f_space)
+            if self.use_cache:
+                cache_keys[strategy] = ResultCache.key(
+                    graph_type, model_parameters, strategy, self.f_space, samples,
+                    strategy_options=strategy_options.get(strategy),
+                    seed=seed if experiment.get('seed') is not None else None,
+                    analyzer_options=experiment.get('analyzer_options'))
+                cached = self.cache(strategy).get(cache_keys[strategy], store=stores[strategy])
+                if cached is not None:
+                    results[strategy] = cached
+        pending = [strategy for strategy in experiment['strategies'] if strategy not in results]
+        if not pending:
+            return results
+        t1 = time()
+        component_sums = {strategy: np.zeros(len(self.f_space)) for strategy in pending}
+        last_append = t1
+        stage_timer = StageTimer(total_samples=samples, log_path=self.metrics_log)
+        for chunk_results, metrics in self.chunk_results(experiment, model_parameters, pending, seed):
+            stage_timer.merge(metrics)
+            stage_timer.sample_done(len(chunk_results[pending[0]][1]), graph_type=graph_type,
+                                    model_parameters=list(model_parameters), strategies=pending)
+            self.metrics = stage_timer.metrics()
+            for strategy, (components, times) in chunk_results.items():
+                component_sums[strategy] += components.sum(axis=0)
+                stores[strategy].append(components / N, times)
+                stores[strategy].add_wall_time(time() - last_append)
+            last_append = time()
+        delta = round(time() - t1)
+        for strategy in pending:
+            results[strategy] = (component_sums[strategy] / samples / N, delta)
+            if self.use_cache:
+                self.cache(strategy).put(cache_keys[strategy], *results[strategy],
+                                         store=stores[strategy])
+        return results
+
+    def run_experiment(self, experiment):
+        graph_type, N, samples = experiment['type'], experiment['N'], experiment['samples']
+        data_dicts = {strategy: {'type': graph_type,
+                                 'N': N,
+                                 'samples': samples,
+                                 'fspace': self.f_space.tolist(),
+                                 'degrees': {}}
+                      for strategy in experiment['strategies']}
+        seed_sequence = np.random.SeedSequence(experiment.get('seed'))
+        degree_seeds = seed_sequence.spawn(len(experiment['degrees']))
+        for degree, degree_seed in zip(experiment['degrees'], degree_seeds):
+            results = self.run_degree(experiment, degree, seed=int(degree_seed.generate_state(1)[0]))
+            for strategy, (avg_component, delta) in results.items():
+                print(f'{graph_type}, degree: {degree}, strategy: {strategy}, time taken: {delta} seconds')
+                data_dicts[strategy]['degrees'][str(degree)] = (avg_component.tolist(), delta)
+
+        degree_str = ''
+        for deg in experiment['degrees']:
+            degree_str += f'k{deg}'
+        for strategy, data_dict in data_dicts.items():
+            file_title = f'{STRATEGY_PREFIXES[strategy]}{graph_type}N{N}L{samples}deg{degree_str}.json'
+            save_json_file(data_dict, file_title, sub_dir=self.results_path(strategy))
+        return data_dicts
+
+    def run(self):
+        for experiment in self.config['experiments']:
+            for strategy in experiment['strategies']:
+                os.makedirs(self.results_path(strategy), exist_ok=True)
+        return [self.run_experiment(experiment) for experiment in self.config['experiments']]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('config', help='JSON file with the experiment grid')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='number of worker processes, 0 uses every available core')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='recompute results that are already in the result cache')
+    parser.add_argument('--metrics-log', default=None,
+                        help='JSON lines file receiving stage times and throughput after every chunk')
+    add_profile_arguments(parser)
+    arguments = parser.parse_args()
+    apply_profile_arguments(arguments)
+
+    runner = ExperimentRunner.from_json(arguments.config, jobs=arguments.jobs,
+                                        use_cache=not arguments.no_cache,
+                                        metrics_log=arguments.metrics_log)
+    runner.run()
@@ -1,14 +1,111 @@
+import heapq
+import os
 import networkx as nx
 import numpy as np
 from networkx.exception import NetworkXError, NodeNotFound, NetworkXNoPath
 from matplotlib import pyplot as plt
 from math import sqrt
+from functools import partial
+from time import time
+from concurrent.futures import ProcessPoolExecutor
+from scipy.sparse.csgraph import shortest_path
+from HyperANF import HyperANF, approximate_closeness_centrality, edge_array_from_graph
+from GraphGenerators import gnp_edges, gnm_edges, barabasi_albert_edges, watts_strogatz_edges, \
+    graph_from_edges
+from UnionFind import UnionFind
+from CSRGraph import CSRGraph
+from TriangleCounter import TriangleCounter, WedgeSampler
+from StageTimer import timed_stage
+from Profiling import profile_methods
+
+
+def approximate_betweenness_centrality(graph, pivots=None, rank_stability=None, top_fraction=0.1):
+    # Brandes betweenness accumulated from pivots taken in the order of one
+    # random permutation, so no source is used twice, with rank_stability
+    # the number of pivots is doubled until that share of the top ranked
+    # nodes stays the same between two successive estimates
+    nodes = list(graph.nodes)
+    number_of_nodes = len(nodes)
+    if pivots is None:
+        pivots = max(64, int(4 * sqrt(number_of_nodes)))
+    pivots = min(pivots, number_of_nodes)
+    order = [nodes[index] for index in np.random.permutation(number_of_nodes)]
+
+    top = max(int(top_fraction * number_of_nodes), 1)
+    scores = dict.fromkeys(nodes, 0.0)
+    previous_top = None
+    used_pivots = 0
+    batch = pivots
+    while used_pivots < number_of_nodes:
+        sources = order[used_pivots:used_pivots + batch]
+        for node, score in nx.betweenness_centrality_subset(graph, sources, nodes,
+                                                            normalized=False).items():
+            scores[node] += score
+        used_pivots += len(sources)
+        if rank_stability is None:
+            break
+        current_top = set(heapq.nlargest(top, scores, key=scores.get))
+        if previous_top is not None and len(current_top & previous_top) / top >= rank_stability:
+            break
+        previous_top = current_top
+        batch = used_pivots
+    return normalize_pivot_betweenness(scores, order[:used_pivots], number_of_nodes)
+
+
+def normalize_pivot_betweenness(scores, sources, number_of_nodes):
+    # same scale as nx.betweenness_centrality(graph, k=len(sources)), the
+    # halved subset scores of the sources are extrapolated to all of them
+    if number_of_nodes <= 2 or not sources:
+        return dict.fromkeys(scores, 0.0)
+    used_pivots = len(sources)
+    source_scale = 2 / ((used_pivots - 1) * (number_of_nodes - 2)) if used_pivots > 1 else 0.0
+    other_scale = 2 / (used_pivots * (number_of_nodes - 2))
+    sources = set(sources)
+    return {node: score * (source_scale if node in sources else other_scale)
+            for node, score in scores.items()}
+
+
+CENTRALITY_TYPES = {'degree': nx.degree_centrality,
+                    'closeness': nx.closeness_centrality,
+                    'betweenness': nx.betweenness_centrality,
+                    'betweenness_approx': approximate_betweenness_centrality,
+                    'closeness_approx': approximate_closeness_centrality}
+
+
+def count_path_lengths(adjacency, sources, chunk_size=256):
+    # one BFS per source, only targets with a higher index are counted
+    # so every pair of nodes is counted once
+    number_of_nodes = adjacency.shape[0]
+    path_counts = np.zeros(number_of_nodes, dtype=np.int64)
+    for start in range(0, len(sources), chunk_size):
+        chunk = np.asarray(sources[start:start + chunk_size])
+        distances = shortest_path(adjacency, unweighted=True, indices=chunk)
+        distances[np.arange(number_of_nodes)[None, :] <= chunk[:, None]] = np.inf
+        distances = distances[np.isfinite(distances)].astype(np.int64)
+        path_counts += np.bincount(distances, minlength=number_of_nodes)
+    return path_counts
+
+
+def sample_path_lengths(adjacency, sources):
+    # histogram of distances from the sampled sources to every other node,
+    # plus the per-source sum of distances and number of reachable targets
+    number_of_nodes = adjacency.shape[0]
+    path_counts = np.zeros(number_of_nodes, dtype=np.int64)
+    distances = shortest_path(adjacency, unweighted=True, indices=np.asarray(sources))
+    distances[~np.isfinite(distances)] = 0
+    distances = distances.astype(np.int64)
+    path_counts += np.bincount(distances.ravel(), minlength=number_of_nodes)
+    path_counts[0] = 0
+    path_sums = distances.sum(axis=1)
+    reachable = np.count_nonzero(distances, axis=1)
+    return path_counts, path_sums, reachable
 
 
 class ErdosRenyiGraphGenerator(object):
-    def __init__(self, p=0.5, N=1):
+    def __init__(self, p=0.5, N=1, L=None):
         self.N = N
         self.p = p
+        self.L = L
         self.initial_grid = None
         self.current_grid = None
         self.link_list = None
@@ -43,15 +140,25 @@ class ErdosRenyiGraphGenerator(object):
         x_cords, y_cords = np.where(self.current_grid == 1)
         self.link_list = np.concatenate((x_cords[:, None], y_cords[:, None]), axis=1)
 
+    def generate_sparse_links(self):
+        # G(n, m) when the number of links is given, G(n, p) otherwise
+        if self.L is not None:
+            self.link_list = gnm_edges(self.N, self.L)
+        else:
+            self.link_list = gnp_edges(self.N, self.p)
+
     def create_graph(self):
-        self.graph.add_nodes_from(range(self.N))
-        self.graph.add_edges_from(self.link_list)
+        self.graph = graph_from_edges(self.N, self.link_list)
 
-    def generate_all_graph_data(self, initial_grid=None):
-        self.set_initial_grid(initial_grid=initial_grid)
-        self.grid_thresholding()
-        self.convert_grid_to_link_tuple()
-        self.create_graph()
+    def generate_all_graph_data(self, initial_grid=None, build_graph=True):
+        if initial_grid is None:
+            self.generate_sparse_links()
+        else:
+            self.set_initial_grid(initial_grid=initial_grid)
+            self.grid_thresholding()
+            self.convert_grid_to_link_tuple()
+        if build_graph:
+            self.create_graph()
 
     def get_nodes_and_links(self):
         return self.N, self.link_list
@@ -61,8 +168,17 @@ class ErdosRenyiGraphGenerator(object):
 
 
 class GraphAnalyzer(object):
-    def __init__(self, model_name, model_parameters, initial_graph=None):
+    def __init__(self, model_name, model_parameters, initial_graph=None, backend='networkx',
+                 generator='networkx', stage_timer=None):
+        # with backend='csr' the graph lives in self.csr_graph and self.graph is None,
+        # generator='numpy' builds BA and WS realizations from edge arrays,
+        # a StageTimer collects the time spent in generation, centrality,
+        # removal and component measurement
+        self.backend = backend
+        self.stage_timer = stage_timer
+        self.generator = generator
         self.graph = None
+        self.csr_graph = None
         self.graph_type = None
         self.initial_graph = None
         self.initial_N = None
@@ -75,170 +191,542 @@ class GraphAnalyzer(object):
                           initial_graph=initial_graph)
 
         self.graph_degrees = None
+        self.degree_values = None
+        self.degree_counts = np.zeros(0, dtype=np.int64)
         self.degree_histogram = {}
         self.average_degree = 0
 
         self.coefficient_dict = {}
+        self.coefficients = np.zeros(0)
+        self.coefficient_intervals = np.zeros((0, 2))
         self.average_coefficient = 0
+        self.average_coefficient_error = 0
+        self.average_coefficient_interval = (0, 0)
+        self.transitivity = 0
+        self.transitivity_error = 0
+        self.transitivity_interval = (0, 0)
+        self.coefficient_values = np.zeros(0)
+        self.coefficient_counts = np.zeros(0, dtype=np.int64)
         self.coefficient_histogram = {}
 
         self.diameter = 0
         self.average_path = 0
         self.path_histogram = {}
+        self.average_path_error = 0
+        self.path_sources = 0
+        self.effective_diameter = 0
 
     def plot_graph(self, layout=None, node_color='maroon', node_size=50, ax=None):
-        pos = layout(self.graph) if layout else None
-        nx.draw(self.graph, pos=pos, ax=ax, node_color=node_color, node_size=node_size, alpha=0.5)
+        graph = self.networkx_graph()
+        pos = layout(graph) if layout else None
+        nx.draw(graph, pos=pos, ax=ax, node_color=node_color, node_size=node_size, alpha=0.5)
+
+    def networkx_graph(self, use_labels=True):
+        # csr nodes are indices, use_labels=False keeps them for node removal
+        if self.csr_graph is not None:
+            return self.csr_graph.to_networkx(use_labels=use_labels)
+        return self.graph
+
+    def set_graph_from_edges(self, edges):
+        if self.backend == 'csr':
+            self.csr_graph = CSRGraph.from_edges(self.N, edges)
+        else:
+            self.graph = graph_from_edges(self.N, edges)
+
+    def set_initial_graph(self, initial_graph):
+        # a CSRGraph switches the analyzer to the csr backend
+        if isinstance(initial_graph, CSRGraph):
+            self.backend = 'csr'
+            self.csr_graph = initial_graph
+        else:
+            self.graph = initial_graph
 
+    @timed_stage('generation')
     def create_graph(self, model_name, model_parameters, initial_graph=None):
         self.N = model_parameters[0]
+        self.graph = None
+        self.csr_graph = None
         if model_name == 'ER':
             self.graph_type = 'Erdos-Renyi'
             self.L = model_parameters[1]
-            if initial_graph:
-                self.graph = initial_graph
+            if initial_graph is not None:
+                self.set_initial_graph(initial_graph)
             else:
-                self.graph = nx.gnm_random_graph(self.N, self.L)
+                self.set_graph_from_edges(gnm_edges(self.N, self.L))
         elif model_name == 'ERG':
             self.graph_type = 'Erdos-Renyi-Gilbert'
             self.p = model_parameters[1]
-            if initial_graph:
-                self.graph = initial_graph
+            if initial_graph is not None:
+                self.set_initial_graph(initial_graph)
             else:
-                self.graph = nx.erdos_renyi_graph(self.N, self.p)
+                self.set_graph_from_edges(gnp_edges(self.N, self.p))
         elif model_name == 'WS':
             self.graph_type = 'Watts-Strogatz'
             self.k = model_parameters[1]
             self.p = model_parameters[2]
-            if initial_graph:
-                self.graph = initial_graph
+            if initial_graph is not None:
+                self.set_initial_graph(initial_graph)
             else:
-                self.graph = nx.watts_strogatz_graph(self.N, self.k, self.p)
+                if self.generator == 'numpy':
+                    self.set_graph_from_edges(watts_strogatz_edges(self.N, self.k, self.p))
+                else:
+                    self.graph = nx.watts_strogatz_graph(self.N, self.k, self.p)
         elif model_name == 'BA':
             self.graph_type = 'Barabasi-Albert'
             self.m = model_parameters[1]
-            if initial_graph:
-                self.graph = initial_graph
+            if initial_graph is not None:
+                self.set_initial_graph(initial_graph)
             else:
-                self.graph = nx.barabasi_albert_graph(self.N, self.m)
+                if self.generator == 'numpy':
+                    self.set_graph_from_edges(barabasi_albert_edges(self.N, self.m))
+                else:
+                    self.graph = nx.barabasi_albert_graph(self.N, self.m)
         elif model_name == 'custom':
             self.graph_type = model_parameters
             self.N = initial_graph.number_of_nodes()
-            self.graph = initial_graph
+            self.set_initial_graph(initial_graph)
+        if self.backend == 'csr' and self.graph is not None:
+            self.csr_graph = CSRGraph.from_networkx(self.graph)
+            self.graph = None
+
+    def node_degrees(self):
+        if self.csr_graph is not None:
+            alive_nodes = self.csr_graph.alive_nodes()
+            return dict(zip(alive_nodes.tolist(), self.csr_graph.degree()[alive_nodes].tolist()))
+        return dict(self.graph.degree)
+
+    def number_of_edges(self):
+        if self.csr_graph is not None:
+            return int(self.csr_graph.degree().sum() // 2)
+        return self.graph.number_of_edges()
 
     def graph_degree_list(self):
-        self.graph_degrees = list(self.graph.degree)
+        # (node, degree) pairs and the same degrees as an array
+        if self.csr_graph is not None:
+            alive_nodes = self.csr_graph.alive_nodes()
+            self.degree_values = self.csr_graph.degree()[alive_nodes].astype(np.int64)
+            self.graph_degrees = list(zip(alive_nodes.tolist(), self.degree_values.tolist()))
+        else:
+            degrees = self.node_degrees()
+            self.graph_degrees = list(degrees.items())
+            self.degree_values = np.fromiter(degrees.values(), dtype=np.int64, count=len(degrees))
 
     def assign_initial_n(self):
         self.initial_N = self.N
 
     def update_n(self):
-        self.N = len(self.graph.nodes)
+        if self.csr_graph is not None:
+            self.N = self.csr_graph.number_of_nodes()
+        else:
+            self.N = len(self.graph.nodes)
 
+    @timed_stage('centrality')
     def calculate_centrality(self, centrality_type=None):
         if centrality_type:
-            centrality_nodes = centrality_type(self.graph)
+            centrality_nodes = centrality_type(self.networkx_graph(use_labels=False))
             centrality_nodes = sorted(centrality_nodes.items(),
                                       key=lambda x: x[1],
                                       reverse=True)
             return centrality_nodes
         return None
 
+    @timed_stage('centrality')
+    def calculate_centrality_ranking(self, centrality_type=None, number_of_nodes=None):
+        # nodes ordered by decreasing centrality, ties keep the graph node order
+        if centrality_type is None:
+            return None
+        centrality_nodes = centrality_type(self.networkx_graph(use_labels=False))
+        nodes = list(centrality_nodes.keys())
+        values = np.fromiter(centrality_nodes.values(), dtype=float, count=len(nodes))
+        if number_of_nodes is None or number_of_nodes >= len(nodes):
+            ranking = np.argsort(-values, kind='stable')
+        elif number_of_nodes <= 0:
+            ranking = np.array([], dtype=int)
+        else:
+            threshold = -np.partition(-values, number_of_nodes - 1)[number_of_nodes - 1]
+            above = np.flatnonzero(values > threshold)
+            equal = np.flatnonzero(values == threshold)[:number_of_nodes - len(above)]
+            top = np.concatenate((above, equal))
+            ranking = top[np.lexsort((top, -values[top]))]
+        return [nodes[index] for index in ranking]
+
+    @timed_stage('removal')
     def remove_listed_nodes(self, list_of_nodes):
-        if self.graph:
+        if self.csr_graph is not None:
+            self.csr_graph.remove_nodes(list_of_nodes)
+        elif self.graph:
             self.graph.remove_nodes_from(list_of_nodes)
 
+    @timed_stage('removal')
     def remove_nth_node(self, N):
-        if self.graph:
+        if self.csr_graph is not None:
+            self.csr_graph.remove_nodes([N])
+        elif self.graph:
             self.graph.remove_node(N)
 
-    def remove_fraction_of_nodes(self, fraction, centrality='random'):
+    def graph_nodes(self):
+        if self.csr_graph is not None:
+            return self.csr_graph.alive_nodes()
+        return list(self.graph.nodes)
+
+    @timed_stage('removal')
+    def remove_fraction_of_nodes(self, fraction, centrality='random', **centrality_options):
         number_to_remove = round(self.N * fraction)
         list_of_nodes_to_remove = []
         if centrality == 'random':
-            list_of_nodes_to_remove = np.random.choice(self.graph.nodes,
+            list_of_nodes_to_remove = np.random.choice(self.graph_nodes(),
                                                        size=number_to_remove,
                                                        replace=False)
-        elif centrality == 'degree':
-            nodes = self.calculate_centrality(centrality_type=nx.degree_centrality)
-            nodes = list(map(lambda x: x[0], nodes))
-            list_of_nodes_to_remove = nodes[0:number_to_remove]
-        elif centrality == 'closeness':
-            nodes = self.calculate_centrality(centrality_type=nx.closeness_centrality)
-            nodes = list(map(lambda x: x[0], nodes))
-            list_of_nodes_to_remove = nodes[0:number_to_remove]
-        elif centrality == 'betweenness':
-            nodes = self.calculate_centrality(centrality_type=nx.betweenness_centrality)
-            nodes = list(map(lambda x: x[0], nodes))
-            list_of_nodes_to_remove = nodes[0:number_to_remove]
+        elif centrality in CENTRALITY_TYPES:
+            list_of_nodes_to_remove = self.calculate_centrality_ranking(
+                centrality_type=partial(CENTRALITY_TYPES[centrality], **centrality_options),
+                number_of_nodes=number_to_remove)
+        elif centrality == 'degree_adaptive':
+            list_of_nodes_to_remove = self.adaptive_degree_order(number_of_nodes=number_to_remove)
 
         self.remove_listed_nodes(list_of_nodes_to_remove)
 
+    @timed_stage('component')
     def calculate_giant_component(self):
+        if self.csr_graph is not None:
+            return self.csr_graph.giant_component()
         try:
             giant_component = len(max(nx.connected_components(self.graph), key=len))
         except ValueError:
             giant_component = 0
         return giant_component
 
+    def node_removal_order(self, centrality='random', **centrality_options):
+        # a random order is removal work, a ranking is centrality work
+        if centrality == 'random':
+            return self.random_removal_order()
+        return self.centrality_removal_order(centrality=centrality, **centrality_options)
+
+    @timed_stage('removal')
+    def random_removal_order(self):
+        return list(np.random.permutation(self.graph_nodes()))
+
+    @timed_stage('centrality')
+    def centrality_removal_order(self, centrality, **centrality_options):
+        if centrality == 'degree' and self.csr_graph is not None:
+            alive_nodes = self.csr_graph.alive_nodes()
+            degrees = self.csr_graph.degree()[alive_nodes]
+            return alive_nodes[np.argsort(-degrees, kind='stable')].tolist()
+        elif centrality in CENTRALITY_TYPES:
+            return self.calculate_centrality_ranking(
+                centrality_type=partial(CENTRALITY_TYPES[centrality], **centrality_options))
+        elif centrality == 'degree_adaptive':
+            return self.adaptive_degree_order()
+        return None
+
+    @timed_stage('centrality')
+    def adaptive_degree_order(self, number_of_nodes=None):
+        # highest degree node is removed first and its neighbours' degrees
+        # are decremented, buckets[d] holds the alive nodes of degree d
+        graph = self.csr_graph if self.csr_graph is not None else self.graph
+        degrees = self.node_degrees()
+        if number_of_nodes is None:
+            number_of_nodes = len(degrees)
+        number_of_nodes = min(number_of_nodes, len(degrees))
+        max_degree = max(degrees.values(), default=0)
+        buckets = [{} for _ in range(max_degree + 1)]
+        for node, degree in degrees.items():
+            buckets[degree][node] = None
+        removed = set()
+        removal_order = []
+        current_degree = max_degree
+        while len(removal_order) < number_of_nodes:
+            while not buckets[current_degree]:
+                current_degree -= 1
+            node, _ = buckets[current_degree].popitem()
+            removed.add(node)
+            removal_order.append(node)
+            for neighbor in graph.neighbors(node):
+                if neighbor not in removed:
+                    degree = degrees[neighbor]
+                    del buckets[degree][neighbor]
+                    buckets[degree - 1][neighbor] = None
+                    degrees[neighbor] = degree - 1
+        return removal_order
+
+    @timed_stage('component')
+    def giant_component_curve(self, removal_order):
+        # nodes are added back in reverse removal order (Newman-Ziff),
+        # curve[n] is the giant component when n nodes are present
+        if self.csr_graph is not None:
+            return self.csr_graph.giant_component_curve(removal_order)
+        number_of_nodes = len(removal_order)
+        node_index = {node: index for index, node in enumerate(removal_order)}
+        union_find = UnionFind(number_of_nodes)
+        curve = np.zeros(number_of_nodes + 1, dtype=int)
+        for index in range(number_of_nodes - 1, -1, -1):
+            union_find.add(index)
+            for neighbor in self.graph.neighbors(removal_order[index]):
+                neighbor_index = node_index[neighbor]
+                if neighbor_index > index:
+                    union_find.union(index, neighbor_index)
+            curve[number_of_nodes - index] = union_find.largest
+        return curve
+
+    def giant_component_sweep(self, f_space, centrality='random', **centrality_options):
+        removal_order = self.node_removal_order(centrality=centrality, **centrality_options)
+        curve = self.giant_component_curve(removal_order)
+        number_of_nodes = len(removal_order)
+        components = np.zeros(len(f_space))
+        for index, fraction in enumerate(f_space):
+            number_to_remove = int(round(self.N * fraction))
+            components[index] = curve[max(number_of_nodes - number_to_remove, 0)]
+        return components
+
+    def compare_attack_curves(self, f_space, centrality='betweenness_approx',
+                              reference='betweenness', **centrality_options):
+        # deviation of an approximate attack from the reference attack on the
+        # same realization, curves are normalized by the number of nodes
+        time_start = time()
+        curve = self.giant_component_sweep(f_space, centrality=centrality,
+                                           **centrality_options) / self.N
+        approximate_time = time() - time_start
+        time_start = time()
+        reference_curve = self.giant_component_sweep(f_space, centrality=reference) / self.N
+        reference_time = time() - time_start
+        deviation = np.abs(curve - reference_curve)
+        return {'centrality': centrality,
+                'reference': reference,
+                'max_deviation': float(deviation.max()),
+                'mean_deviation': float(deviation.mean()),
+                'mean_difference': float((curve - reference_curve).mean()),
+                'time': round(approximate_time, 3),
+                'reference_time': round(reference_time, 3)}
+
     def average_degree_and_histogram(self, clear=True):
-        if self.graph_degrees is None:
+        # degree_counts[k] is the number of nodes of degree k, degree_histogram
+        # holds the nonzero counts as {degree: count} for the plots
+        if self.degree_values is None:
             self.graph_degree_list()
+        counts = np.bincount(self.degree_values)
         if clear:
-            self.degree_histogram = {}
             self.average_degree = 0
-        for degree_tuple in self.graph_degrees:
-            node_degree = degree_tuple[1]
-            self.average_degree += node_degree
-
-            if node_degree in self.degree_histogram.keys():
-                self.degree_histogram[node_degree] += 1
-            else:
-                self.degree_histogram[node_degree] = 1
-        self.average_degree = self.average_degree / self.N
-
-    def calculate_clustering_coefficients(self):
-        self.coefficient_dict = nx.clustering(self.graph)
-
-    def calculate_average_coefficient(self):
-        self.average_coefficient = round(sum(self.coefficient_dict.values()) / self.N, 3)
+        else:
+            size = max(len(counts), len(self.degree_counts))
+            counts = np.pad(counts, (0, size - len(counts))) + \
+                np.pad(self.degree_counts, (0, size - len(self.degree_counts)))
+        self.degree_counts = counts
+        degrees = np.flatnonzero(counts)
+        self.degree_histogram = dict(zip(degrees.tolist(), counts[degrees].tolist()))
+        self.average_degree = (self.average_degree + int(self.degree_values.sum())) / self.N
+        return self.degree_counts
+
+    def wedge_sampler(self, seed=None):
+        # sampler over the nodes in the order of self.coefficients, alive
+        # csr nodes are renumbered 0..N-1
+        if self.csr_graph is not None:
+            alive_nodes = self.csr_graph.alive_nodes()
+            position = np.full(self.csr_graph.N, -1, dtype=np.int64)
+            position[alive_nodes] = np.arange(len(alive_nodes))
+            edges = position[self.csr_graph.edge_array()]
+            return alive_nodes.tolist(), WedgeSampler(len(alive_nodes), edges, seed=seed)
+        nodes, edges = edge_array_from_graph(self.graph)
+        return nodes, WedgeSampler(len(nodes), edges, seed=seed)
+
+    def calculate_clustering_coefficients(self, samples=None, confidence=0.95, seed=None, local=False):
+        # triangles of every node counted once by TriangleCounter, the
+        # transitivity comes from the same count, with samples set the
+        # transitivity and average coefficient are estimated from that many
+        # random wedges in total, half each, with Wilson intervals, local=True
+        # splits the budget in three and also estimates every coefficient,
+        # which needs samples // 3 to give each node of degree >= 2 a wedge
+        if samples is not None:
+            nodes, sampler = self.wedge_sampler(seed=seed)
+            shares = 3 if local else 2
+            share = samples // shares
+            self.coefficient_dict = {}
+            self.coefficients = np.zeros(0)
+            self.coefficient_intervals = np.zeros((0, 2))
+            if local:
+                local_clustering = sampler.local_clustering(share, confidence=confidence)
+                self.coefficients = local_clustering['coefficients']
+                self.coefficient_intervals = local_clustering['intervals']
+                self.coefficient_dict = dict(zip(nodes, self.coefficients.tolist()))
+            average = sampler.average_clustering(share, confidence=confidence)
+            transitivity = sampler.transitivity(samples - (shares - 1) * share, confidence=confidence)
+            self.average_coefficient = round(average['estimate'], 3)
+            self.average_coefficient_error = round(average['error'], 3)
+            self.average_coefficient_interval = tuple(round(bound, 3) for bound in average['interval'])
+            self.transitivity = round(transitivity['estimate'], 3)
+            self.transitivity_error = round(transitivity['error'], 3)
+            self.transitivity_interval = tuple(round(bound, 3) for bound in transitivity['interval'])
+            return
+        if self.csr_graph is not None:
+            alive_nodes = self.csr_graph.alive_nodes()
+            statistics = self.csr_graph.clustering_statistics()
+            nodes = alive_nodes.tolist()
+            self.coefficients = statistics['coefficients'][alive_nodes]
+        else:
+            nodes, edges = edge_array_from_graph(self.graph)
+            statistics = TriangleCounter(len(nodes), edges).clustering()
+            self.coefficients = statistics['coefficients']
+        self.coefficient_dict = dict(zip(nodes, self.coefficients.tolist()))
+        self.coefficient_intervals = np.column_stack((self.coefficients, self.coefficients))
+        self.transitivity = round(statistics['transitivity'], 3)
+        self.transitivity_error = 0
+        self.transitivity_interval = (self.transitivity, self.transitivity)
+
+    def calculate_average_coefficient(self, samples=None, confidence=0.95, seed=None):
+        # with samples set the average is estimated from that many wedges at
+        # uniformly drawn nodes, without calculating the coefficients
+        if samples is not None:
+            _, sampler = self.wedge_sampler(seed=seed)
+            average = sampler.average_clustering(samples, confidence=confidence)
+            self.average_coefficient = round(average['estimate'], 3)
+            self.average_coefficient_error = round(average['error'], 3)
+            self.average_coefficient_interval = tuple(round(bound, 3) for bound in average['interval'])
+            return
+        if len(self.coefficients) != self.N:
+            self.calculate_clustering_coefficients()
+        self.average_coefficient = round(float(self.coefficients.sum()) / self.N, 3)
+        self.average_coefficient_error = 0
+        self.average_coefficient_interval = (self.average_coefficient, self.average_coefficient)
 
     def calculate_coefficient_histogram(self, clear=True):
+        # coefficients rounded to three decimals, coefficient_values holds the
+        # distinct values in ascending order and coefficient_counts their counts
         if clear:
-            self.coefficient_histogram = {}
             self.calculate_clustering_coefficients()
-        for coefficient in self.coefficient_dict.values():
-            node_coefficient = round(coefficient, 3)
-            if node_coefficient in self.coefficient_histogram.keys():
-                self.coefficient_histogram[node_coefficient] += 1
-            else:
-                self.coefficient_histogram[node_coefficient] = 1
+            values, counts = np.unique(np.round(self.coefficients, 3), return_counts=True)
+        else:
+            values, inverse = np.unique(np.concatenate((self.coefficient_values,
+                                                        np.round(self.coefficients, 3))),
+                                        return_inverse=True)
+            counts = np.bincount(inverse, weights=np.concatenate(
+                (self.coefficient_counts, np.ones(len(self.coefficients))))).astype(np.int64)
+        self.coefficient_values = values
+        self.coefficient_counts = counts
+        self.coefficient_histogram = dict(zip(values.tolist(), counts.tolist()))
+        return self.coefficient_values, self.coefficient_counts
 
     def calculate_graph_diameter_nx(self):
         try:
-            self.diameter = nx.diameter(self.graph)
+            self.diameter = nx.diameter(self.networkx_graph())
         except NetworkXError:
             self.diameter = -1
 
     def calculate_average_shortest_path_nx(self):
         try:
-            self.average_path = round(nx.average_shortest_path_length(self.graph), 3)
+            self.average_path = round(nx.average_shortest_path_length(self.networkx_graph()), 3)
         except NetworkXError:
             self.average_path = -1
 
-    def calculate_path_histogram(self, clear=True):
+    def adjacency_matrix(self):
+        if self.csr_graph is not None:
+            return self.csr_graph.adjacency_matrix()
+        return nx.to_scipy_sparse_array(self.graph, nodelist=list(self.graph.nodes),
+                                        dtype=np.int8, format='csr')
+
+    def calculate_path_counts(self, jobs=1):
+        # jobs <= 0 uses every available core, as the sweep runners do
+        adjacency = self.adjacency_matrix()
+        sources = np.arange(adjacency.shape[0])
+        if jobs <= 0:
+            jobs = os.cpu_count()
+        jobs = max(min(jobs, len(sources)), 1)
+        if jobs == 1:
+            return count_path_lengths(adjacency, sources)
+        # sources are interleaved so every shard gets a similar amount of work
+        shards = [sources[shard::jobs] for shard in range(jobs)]
+        path_counts = np.zeros(adjacency.shape[0], dtype=np.int64)
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            for shard_counts in executor.map(count_path_lengths, [adjacency] * jobs, shards):
+                path_counts += shard_counts
+        return path_counts
+
+    def calculate_path_histogram(self, clear=True, jobs=1):
         if clear:
             self.path_histogram = {}
-        for source in range(self.N):
-            for target in range(source + 1, self.N):
-                try:
-                    path = nx.shortest_path_length(self.graph, source=source, target=target)
-                    if path in self.path_histogram.keys():
-                        self.path_histogram[path] += 1
-                    else:
-                        self.path_histogram[path] = 1
-                except NetworkXNoPath:
-                    pass
+        path_counts = self.calculate_path_counts(jobs=jobs)
+        for path in np.flatnonzero(path_counts):
+            path = int(path)
+            if path in self.path_histogram.keys():
+                self.path_histogram[path] += int(path_counts[path])
+            else:
+                self.path_histogram[path] = int(path_counts[path])
+
+    def estimate_path_histogram(self, number_of_sources=None, relative_error=None,
+                                time_budget=None, batch_size=16):
+        # BFS from random sources until the requested number of sources, the
+        # relative standard error of the average path or the time budget
+        # (in seconds) is reached, diameter is then only a lower bound
+        adjacency = self.adjacency_matrix()
+        number_of_nodes = adjacency.shape[0]
+        if number_of_sources is None:
+            number_of_sources = number_of_nodes if relative_error or time_budget else 100
+        number_of_sources = min(number_of_sources, number_of_nodes)
+        sources = np.random.permutation(number_of_nodes)[:number_of_sources]
+
+        time_start = time()
+        path_counts = np.zeros(number_of_nodes, dtype=np.int64)
+        path_sums = []
+        reachable = []
+        used_sources = 0
+        average_path, average_path_error = 0, 0
+        while used_sources < number_of_sources:
+            batch = sources[used_sources:used_sources + batch_size]
+            batch_counts, batch_sums, batch_reachable = sample_path_lengths(adjacency, batch)
+            path_counts += batch_counts
+            path_sums.extend(batch_sums)
+            reachable.extend(batch_reachable)
+            used_sources += len(batch)
+
+            average_path, average_path_error = self.ratio_estimate(np.array(path_sums),
+                                                                   np.array(reachable),
+                                                                   number_of_nodes)
+            if relative_error and average_path and used_sources > 1 \
+                    and average_path_error / average_path <= relative_error:
+                break
+            if time_budget and time() - time_start >= time_budget:
+                break
+
+        # every unordered pair is seen from both ends, hence the factor 2
+        scale = number_of_nodes / (2 * used_sources)
+        self.path_histogram = {int(path): int(round(path_counts[path] * scale))
+                               for path in np.flatnonzero(path_counts)}
+        self.diameter = max(self.path_histogram.keys(), default=0)
+        self.average_path = round(average_path, 3)
+        self.average_path_error = round(average_path_error, 3)
+        self.path_sources = used_sources
+
+    @staticmethod
+    def ratio_estimate(path_sums, reachable, number_of_nodes):
+        total_reachable = reachable.sum()
+        if total_reachable == 0:
+            return 0, 0
+        average_path = path_sums.sum() / total_reachable
+        number_of_sources = len(path_sums)
+        if number_of_sources < 2:
+            return average_path, 0
+        residuals = path_sums - average_path * reachable
+        correction = 1 - number_of_sources / number_of_nodes
+        variance = correction * residuals.var(ddof=1) / number_of_sources
+        average_path_error = sqrt(max(variance, 0)) / reachable.mean()
+        return average_path, average_path_error
+
+    def estimate_distance_distribution(self, precision=6, seed=0):
+        # HyperANF approximation of the neighbourhood function
+        if self.csr_graph is not None:
+            number_of_nodes, edges = self.csr_graph.N, self.csr_graph.edge_array()
+        else:
+            nodes, edges = edge_array_from_graph(self.graph)
+            number_of_nodes = len(nodes)
+        hyper_anf = HyperANF(number_of_nodes, edges, precision=precision, seed=seed)
+        hyper_anf.run()
+        self.path_histogram = {distance: int(round(count))
+                               for distance, count in hyper_anf.distance_distribution().items()
+                               if round(count) > 0}
+        self.diameter = max(self.path_histogram.keys(), default=0)
+        self.average_path = round(hyper_anf.average_path(), 3)
+        self.effective_diameter = round(hyper_anf.effective_diameter(), 3)
+
+    def metrics(self):
+        return self.stage_timer.metrics() if self.stage_timer is not None else {}
 
     def calculate_diameter_from_histogram(self):
         self.diameter = max(self.path_histogram.keys())
@@ -280,6 +768,22 @@ class AverageDegreeCalculator(object):
         x_2 = round((-b - sqrt(delta)) / (2 * a))
         return x_1, x_2
 
+    def model_parameters(self, graph_type, beta=0.01):
+        # parameters of GraphAnalyzer.create_graph giving the current degree
+        if graph_type == 'BA':
+            x1, x2 = self.parameter_from_ba_degree()
+            return self.N, x1 if x1 < x2 else x2
+        elif graph_type == 'WS':
+            return self.N, self.parameter_from_ws_degree(), beta
+        elif graph_type == 'ERG':
+            return self.N, self.parameter_from_erg_degree()
+        elif graph_type == 'ER':
+            return self.N, self.parameter_from_er_degree()
+        raise ValueError(f'Unknown model {graph_type}')
+
+
+profile_methods(GraphAnalyzer)
+
 
 if __name__ == '__main__':
     graph = ErdosRenyiGraphGenerator(N=10)
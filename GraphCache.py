@@ -0,0 +1,72 @@
+import hashlib
+import json
+import os
+import shutil
+import numpy as np
+from CSRGraph import CSRGraph
+from CommonFunctions import make_directories, check_if_file_exists
+
+
+class GraphCache(object):
+    # text edge lists converted once into a directory of .npy arrays that are
+    # memory-mapped read only, so several processes share the same pages
+    array_names = ('indptr', 'indices', 'rows', 'labels')
+
+    def __init__(self, cache_dir='graph_cache', use_content_hash=False):
+        self.cache_dir = cache_dir
+        self.use_content_hash = use_content_hash
+
+    def cache_key(self, file_path):
+        file_path = os.path.abspath(file_path)
+        key = hashlib.sha1(file_path.encode())
+        if self.use_content_hash:
+            with open(file_path, 'rb') as file:
+                for block in iter(lambda: file.read(2 ** 20), b''):
+                    key.update(block)
+        else:
+            file_stat = os.stat(file_path)
+            key.update(f'{file_stat.st_size}:{file_stat.st_mtime_ns}'.encode())
+        return key.hexdigest()[:16]
+
+    def entry_path(self, file_path):
+        name = os.path.basename(file_path).split('.')[0]
+        return os.path.join(self.cache_dir, f'{name}-{self.cache_key(file_path)}')
+
+    def is_cached(self, file_path):
+        return check_if_file_exists(os.path.join(self.entry_path(file_path), 'meta.json'))
+
+    def store(self, file_path, csr_graph):
+        make_directories([self.cache_dir])
+        entry_path = self.entry_path(file_path)
+        # written to a private directory first and renamed, so readers never
+        # see half written arrays
+        temporary_path = f'{entry_path}.tmp{os.getpid()}'
+        make_directories([temporary_path])
+        labels = csr_graph.labels if csr_graph.labels is not None else np.arange(csr_graph.N)
+        arrays = {'indptr': csr_graph.indptr, 'indices': csr_graph.indices,
+                  'rows': csr_graph.rows, 'labels': np.asarray(labels)}
+        for name in self.array_names:
+            np.save(os.path.join(temporary_path, f'{name}.npy'), arrays[name])
+        meta = {'source': os.path.abspath(file_path), 'N': int(csr_graph.N),
+                'L': int(len(csr_graph.indices) // 2)}
+        with open(os.path.join(temporary_path, 'meta.json'), 'w') as meta_file:
+            json.dump(meta, meta_file)
+        try:
+            os.rename(temporary_path, entry_path)
+        except OSError:
+            # another process stored the same entry in the meantime
+            shutil.rmtree(temporary_path, ignore_errors=True)
+
+    def open(self, file_path):
+        entry_path = self.entry_path(file_path)
+        with open(os.path.join(entry_path, 'meta.json'), 'r') as meta_file:
+            meta = json.load(meta_file)
+        arrays = {name: np.load(os.path.join(entry_path, f'{name}.npy'), mmap_mode='r')
+                  for name in self.array_names}
+        return CSRGraph(meta['N'], arrays['indptr'], arrays['indices'],
+                        labels=arrays['labels'], rows=arrays['rows'])
+
+    def load(self, file_path, comments=('#', '%')):
+        if not self.is_cached(file_path):
+            self.store(file_path, CSRGraph.from_edge_list(file_path, comments=comments))
+        return self.open(file_path)
@@ -0,0 +1,220 @@
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from CSRGraph import CSRGraph
+from GraphGenerators import gnp_edges, gnm_edges, barabasi_albert_edges, watts_strogatz_edges, \
+    pair_index_to_edges
+from CommonFunctions import seed_generators, sample_seed
+
+
+def gnp_ensemble_edges(N, p, samples):
+    # geometric skipping over the pairs of all samples at once, pair k of
+    # sample s has index s * N(N - 1) / 2 + k
+    number_of_pairs = N * (N - 1) // 2
+    total_pairs = number_of_pairs * samples
+    if p <= 0 or total_pairs == 0:
+        return np.zeros((0, 2), dtype=np.int32)
+    if p >= 1:
+        pair_index = np.arange(total_pairs)
+    else:
+        expected = p * total_pairs
+        batch_size = int(expected + 5 * np.sqrt(expected) + 16)
+        batches = []
+        position = -1
+        while position < total_pairs:
+            pair_index = position + np.cumsum(np.random.geometric(p, size=batch_size))
+            position = pair_index[-1]
+            batches.append(pair_index[pair_index < total_pairs])
+            batch_size = max(batch_size // 4, 16)
+        pair_index = np.concatenate(batches)
+    sample_index, pair_index = np.divmod(pair_index, number_of_pairs)
+    # int64 offsets, N * samples may not fit into int32
+    return pair_index_to_edges(pair_index).astype(np.int64) + (sample_index * N)[:, None]
+
+
+def find_roots(parent, nodes):
+    # roots of many nodes at once, with path compression for the given nodes
+    roots = parent[nodes]
+    while True:
+        next_roots = parent[roots]
+        if np.array_equal(next_roots, roots):
+            break
+        roots = next_roots
+    parent[nodes] = roots
+    return roots
+
+
+class EnsembleBatch(object):
+    # disjoint union of several realizations, node u of sample s is s * N + u
+    def __init__(self, N, samples, edges):
+        # CSRGraph keeps int32 node indices
+        if N * samples > np.iinfo(np.int32).max:
+            raise ValueError(f'{samples} samples of N = {N} do not fit into one batch, '
+                             f'lower batch_size')
+        self.N = N
+        self.samples = samples
+        self.csr_graph = CSRGraph.from_edges(N * samples, edges)
+
+    def sample_of_nodes(self, nodes):
+        return nodes // self.N
+
+    def giant_components(self):
+        labels = self.csr_graph.connected_components()
+        alive = labels >= 0
+        component_sizes = np.bincount(labels[alive])
+        # every component lies inside one sample, its first node tells which
+        component_sample = np.zeros(len(component_sizes), dtype=np.int64)
+        nodes = np.flatnonzero(alive)
+        component_sample[labels[nodes]] = self.sample_of_nodes(nodes)
+        giant_components = np.zeros(self.samples, dtype=np.int64)
+        np.maximum.at(giant_components, component_sample, component_sizes)
+        return giant_components
+
+    def degrees(self):
+        return self.csr_graph.degree().reshape(self.samples, self.N)
+
+    def degree_histograms(self):
+        degrees = self.degrees()
+        width = int(degrees.max()) + 1 if degrees.size else 1
+        keys = np.arange(self.samples)[:, None] * width + degrees
+        return np.bincount(keys.ravel(), minlength=self.samples * width).reshape(self.samples, width)
+
+    def average_degrees(self):
+        return self.degrees().sum(axis=1) / self.N
+
+    def remove_fraction_of_nodes(self, fraction):
+        number_to_remove = round(self.N * fraction)
+        ranks = np.argsort(np.random.random((self.samples, self.N)), axis=1)
+        removed = ranks[:, :number_to_remove] + np.arange(self.samples)[:, None] * self.N
+        self.csr_graph.remove_nodes(removed.ravel())
+
+    def giant_component_sweep(self, f_space, removal_orders=None):
+        # giant components of every sample for every f, shape
+        # (samples, len(f_space)), removal_orders[s] is the removal order of
+        # the nodes 0..N-1 of sample s, random ones are drawn when not given,
+        # the union-find curve of all samples at once: going from the largest
+        # fraction down, nodes and links only come back, every step merges
+        # the components joined by the links that came back since the last
+        number_of_nodes = self.N * self.samples
+        if removal_orders is None:
+            removal_orders = np.argsort(np.random.random((self.samples, self.N)), axis=1)
+        position = np.empty((self.samples, self.N), dtype=np.int64)
+        position[np.arange(self.samples)[:, None], removal_orders] = np.arange(self.N)
+        position = position.ravel()
+        # nodes and links in the order they come back, a link comes back
+        # with the later of its two ends
+        node_order = np.argsort(-position, kind='stable')
+        edges = self.csr_graph.edge_array().astype(np.int64)
+        link_removal = np.minimum(position[edges[:, 0]], position[edges[:, 1]])
+        order = np.argsort(-link_removal, kind='stable')
+        edges, link_removal = edges[order], -link_removal[order]
+
+        removals = np.array([int(round(self.N * fraction)) for fraction in f_space], dtype=np.int64)
+        parent = np.arange(number_of_nodes)
+        size = np.zeros(number_of_nodes, dtype=np.int64)
+        giant = np.zeros(self.samples, dtype=np.int64)
+        components = np.zeros((self.samples, len(f_space)))
+        alive, kept = 0, 0
+        for index in np.argsort(-removals, kind='stable'):
+            number_to_remove = removals[index]
+            if number_to_remove >= self.N:
+                continue
+            # every sample has N - number_to_remove alive nodes
+            last_alive, alive = alive, self.samples * (self.N - int(number_to_remove))
+            size[node_order[last_alive:alive]] = 1
+            np.maximum(giant, 1, out=giant)
+            last_kept, kept = kept, int(np.searchsorted(link_removal, -number_to_remove, side='right'))
+            if kept > last_kept:
+                self.merge_components(parent, size, giant, edges[last_kept:kept])
+            components[:, index] = giant
+        return components
+
+    def merge_components(self, parent, size, giant, links):
+        # union by size of the components of both ends of every link, the
+        # components that links join are found by a connected components
+        # pass over their roots only
+        roots = find_roots(parent, links.ravel()).reshape(-1, 2)
+        roots = roots[roots[:, 0] != roots[:, 1]]
+        if len(roots) == 0:
+            return
+        unique_roots, inverse = np.unique(roots, return_inverse=True)
+        inverse = inverse.reshape(-1, 2)
+        _, groups = connected_components(
+            coo_matrix((np.ones(len(inverse), dtype=np.int8), (inverse[:, 0], inverse[:, 1])),
+                       shape=(len(unique_roots), len(unique_roots))), directed=False)
+        # the largest root of every group becomes the root of the merged component
+        order = np.lexsort((-size[unique_roots], groups))
+        _, first = np.unique(groups[order], return_index=True)
+        group_roots = unique_roots[order[first]]
+        group_sizes = np.bincount(groups, weights=size[unique_roots]).astype(np.int64)
+        parent[unique_roots] = group_roots[groups]
+        size[group_roots] = group_sizes
+        np.maximum.at(giant, self.sample_of_nodes(group_roots), group_sizes)
+
+
+class GraphEnsemble(object):
+    def __init__(self, model_name, model_parameters, samples, batch_size=100):
+        self.model_name = model_name
+        self.model_parameters = model_parameters
+        self.N = model_parameters[0]
+        self.samples = samples
+        self.batch_size = batch_size
+
+    def realization_edges(self):
+        if self.model_name == 'ER':
+            return gnm_edges(self.N, self.model_parameters[1])
+        elif self.model_name == 'ERG':
+            return gnp_edges(self.N, self.model_parameters[1])
+        elif self.model_name == 'WS':
+            return watts_strogatz_edges(self.N, self.model_parameters[1], self.model_parameters[2])
+        elif self.model_name == 'BA':
+            return barabasi_albert_edges(self.N, self.model_parameters[1])
+        raise ValueError(f'Unknown model {self.model_name}')
+
+    def batch_edges(self, samples):
+        if self.model_name == 'ERG':
+            return gnp_ensemble_edges(self.N, self.model_parameters[1], samples)
+        edges = [self.realization_edges().astype(np.int64) + sample * self.N
+                 for sample in range(samples)]
+        return np.concatenate(edges)
+
+    def sample_batch(self, samples, seed=None, first_sample=0):
+        # batch and one random removal order per sample, with a seed sample i
+        # draws its realization and then its order from
+        # sample_seed(seed, first_sample + i), the same draws as a seeded
+        # GraphAnalyzer sweep of that sample with the numpy generators
+        if seed is None:
+            batch = EnsembleBatch(self.N, samples, self.batch_edges(samples))
+            return batch, np.argsort(np.random.random((samples, self.N)), axis=1)
+        edges = []
+        removal_orders = np.zeros((samples, self.N), dtype=np.int64)
+        for sample in range(samples):
+            seed_generators(sample_seed(seed, first_sample + sample))
+            edges.append(self.realization_edges().astype(np.int64) + sample * self.N)
+            removal_orders[sample] = np.random.permutation(self.N)
+        return EnsembleBatch(self.N, samples, np.concatenate(edges)), removal_orders
+
+    def batches(self, seed=None, first_sample=0):
+        # at most batch_size realizations are held in memory at a time
+        for start in range(0, self.samples, self.batch_size):
+            samples = min(self.batch_size, self.samples - start)
+            yield self.sample_batch(samples, seed=seed, first_sample=first_sample + start)
+
+    def giant_component_curves(self, f_space, seed=None, first_sample=0):
+        # one row of giant components per sample
+        return np.concatenate([batch.giant_component_sweep(f_space, removal_orders)
+                               for batch, removal_orders in self.batches(seed, first_sample)])
+
+    def giant_component_sweep(self, f_space, seed=None):
+        # average giant component over the ensemble, same normalization
+        # as the sweep scripts
+        return self.giant_component_curves(f_space, seed=seed).sum(axis=0) / self.samples / self.N
+
+    def degree_histogram(self):
+        histogram = np.zeros(1, dtype=np.int64)
+        for batch, _ in self.batches():
+            batch_histogram = batch.degree_histograms().sum(axis=0)
+            if len(batch_histogram) > len(histogram):
+                histogram = np.pad(histogram, (0, len(batch_histogram) - len(histogram)))
+            histogram[:len(batch_histogram)] += batch_histogram
+        return histogram
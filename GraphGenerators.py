@@ -0,0 +1,187 @@
+import networkx as nx
+import numpy as np
+
+
+def pair_index_to_edges(pair_index):
+    # pair k of the lower triangle is (v, w) with k = v * (v - 1) / 2 + w, w < v
+    pair_index = np.asarray(pair_index, dtype=np.int64)
+    v = ((1 + np.sqrt(1 + 8 * pair_index.astype(np.float64))) // 2).astype(np.int64)
+    v[v * (v - 1) // 2 > pair_index] -= 1
+    v[(v + 1) * v // 2 <= pair_index] += 1
+    w = pair_index - v * (v - 1) // 2
+    return np.column_stack((w, v)).astype(np.int32)
+
+
+def gnp_edges(N, p):
+    # Batagelj-Brandes geometric skipping over the N(N - 1) / 2 possible pairs
+    number_of_pairs = N * (N - 1) // 2
+    if p <= 0 or number_of_pairs == 0:
+        return np.zeros((0, 2), dtype=np.int32)
+    if p >= 1:
+        return pair_index_to_edges(np.arange(number_of_pairs))
+    expected = p * number_of_pairs
+    batch_size = int(expected + 5 * np.sqrt(expected) + 16)
+    batches = []
+    position = -1
+    while position < number_of_pairs:
+        pair_index = position + np.cumsum(np.random.geometric(p, size=batch_size))
+        position = pair_index[-1]
+        batches.append(pair_index[pair_index < number_of_pairs])
+        batch_size = max(batch_size // 4, 16)
+    return pair_index_to_edges(np.concatenate(batches))
+
+
+def gnm_edges(N, L):
+    # L distinct pairs drawn uniformly from the N(N - 1) / 2 possible ones
+    number_of_pairs = N * (N - 1) // 2
+    L = min(L, number_of_pairs)
+    if L > number_of_pairs // 2:
+        pair_index = np.sort(np.random.permutation(number_of_pairs)[:L])
+        return pair_index_to_edges(pair_index)
+    pair_index = np.zeros(0, dtype=np.int64)
+    while len(pair_index) < L:
+        draws = np.random.randint(0, number_of_pairs, size=int(1.1 * (L - len(pair_index))) + 16,
+                                  dtype=np.int64)
+        pair_index = np.sort(np.concatenate((pair_index, draws)))
+        pair_index = pair_index[np.concatenate(([True], np.diff(pair_index) > 0))]
+    pair_index = np.random.permutation(pair_index)[:L]
+    return pair_index_to_edges(np.sort(pair_index))
+
+
+def graph_from_edges(N, edges):
+    graph = nx.Graph()
+    graph.add_nodes_from(range(N))
+    graph.add_edges_from(np.asarray(edges).tolist())
+    return graph
+
+
+def resolve_attachment_targets(sources, targets, draws, m, slots=None, unstable_rows=None):
+    # draws[j] is a position in the list of edge endpoints preceding the new
+    # node, even positions are edge sources and odd positions point further
+    # back to the draw of another new edge, which is chased until it resolves
+    number_of_star_edges = m
+    values = np.empty(len(draws), dtype=np.int64)
+    tainted = np.zeros(len(draws), dtype=bool)
+    if slots is None:
+        slots = np.arange(len(draws))
+    positions = draws[slots]
+    while len(slots):
+        edge = positions // 2
+        even = positions % 2 == 0
+        star = ~even & (edge < number_of_star_edges)
+        values[slots[even]] = sources[edge[even]]
+        values[slots[star]] = targets[edge[star]]
+        chase = ~even & ~star
+        slots, edge = slots[chase], edge[chase]
+        if unstable_rows is not None:
+            tainted[slots] |= unstable_rows[(edge - number_of_star_edges) // m]
+        positions = draws[edge - number_of_star_edges]
+    return values, tainted
+
+
+def barabasi_albert_edges(N, m):
+    # preferential attachment as in nx.barabasi_albert_graph: a star of m + 1
+    # nodes, then every new node links to m distinct nodes picked from the
+    # list of edge endpoints, drawn for all nodes at once
+    if m < 1 or m >= N:
+        raise nx.NetworkXError(f'Barabasi-Albert network must have m >= 1 and m < n, m = {m}, n = {N}')
+    new_nodes = np.repeat(np.arange(m + 1, N, dtype=np.int64), m)
+    sources = np.concatenate((np.zeros(m, dtype=np.int64), new_nodes))
+    targets = np.concatenate((np.arange(1, m + 1, dtype=np.int64), np.zeros(len(new_nodes), dtype=np.int64)))
+    pool_sizes = 2 * m * (new_nodes - m)
+    draws = (np.random.random(len(new_nodes)) * pool_sizes).astype(np.int64)
+
+    number_of_rows = N - m - 1
+    while True:
+        values, _ = resolve_attachment_targets(sources, targets, draws, m)
+        rows = values.reshape(number_of_rows, m)
+        order = np.argsort(rows, axis=1, kind='stable')
+        sorted_rows = np.take_along_axis(rows, order, axis=1)
+        repeated = np.zeros_like(rows, dtype=bool)
+        np.put_along_axis(repeated, order[:, 1:], sorted_rows[:, 1:] == sorted_rows[:, :-1], axis=1)
+        duplicate_rows = repeated.any(axis=1)
+        if not duplicate_rows.any():
+            break
+        # a duplicate is only redrawn when none of the row's choices went
+        # through a row that is itself about to change, as in sequential growth
+        duplicate_slots = np.flatnonzero(np.repeat(duplicate_rows, m))
+        _, tainted = resolve_attachment_targets(sources, targets, draws, m, slots=duplicate_slots,
+                                                unstable_rows=duplicate_rows)
+        trusted_rows = duplicate_rows & ~tainted.reshape(number_of_rows, m).any(axis=1)
+        redraw = (repeated & trusted_rows[:, None]).ravel()
+        draws[redraw] = (np.random.random(np.count_nonzero(redraw)) * pool_sizes[redraw]).astype(np.int64)
+    targets[m:] = values
+    return np.column_stack((sources, targets)).astype(np.int32)
+
+
+def place_pending_links(N, sources, original_targets, new_targets, pending, kept_keys):
+    # links that ran out of redraws keep their lattice pair, as the
+    # sequential model skips a rewiring when the node has no free partner,
+    # unless another rewired link took that pair, then the link goes to a
+    # free partner of its source, of its lattice target, or to any free pair
+    is_pending = np.zeros(len(sources), dtype=bool)
+    is_pending[pending] = True
+    placed = set(kept_keys.tolist())
+    placed.update((np.minimum(sources, new_targets) * N
+                   + np.maximum(sources, new_targets))[~is_pending].tolist())
+    for index in pending.tolist():
+        source, target = int(sources[index]), int(original_targets[index])
+        if min(source, target) * N + max(source, target) in placed:
+            source, target = free_pair(N, (source, target), placed)
+        sources[index], new_targets[index] = source, target
+        placed.add(min(source, target) * N + max(source, target))
+
+
+def free_pair(N, endpoints, placed):
+    for endpoint in endpoints:
+        for target in np.random.permutation(N).tolist():
+            if target != endpoint and min(endpoint, target) * N + max(endpoint, target) not in placed:
+                return endpoint, target
+    for source, target in pair_index_to_edges(np.random.permutation(N * (N - 1) // 2)).tolist():
+        if source * N + target not in placed:
+            return source, target
+    raise nx.NetworkXError('no free pair of nodes left')
+
+
+def watts_strogatz_edges(N, k, p, max_rounds=100):
+    # ring lattice where every link (u, u + j) is rewired to (u, w) with
+    # probability p, self-loops and multiple links are redrawn in bulk
+    if k > N:
+        raise nx.NetworkXError('k>n, choose smaller k or larger n')
+    if k == N:
+        return pair_index_to_edges(np.arange(N * (N - 1) // 2))
+    sources = np.tile(np.arange(N, dtype=np.int64), k // 2)
+    targets = (sources + np.repeat(np.arange(1, k // 2 + 1, dtype=np.int64), N)) % N
+    rewired = np.random.random(len(sources)) < p
+    kept_keys = np.sort(np.minimum(sources, targets)[~rewired] * N
+                        + np.maximum(sources, targets)[~rewired])
+
+    rewired_sources = sources[rewired].copy()
+    original_targets = targets[rewired]
+    # a link is never rewired onto the pair it leaves, as in the sequential model
+    original_keys = np.minimum(rewired_sources, original_targets) * N \
+        + np.maximum(rewired_sources, original_targets)
+    new_targets = np.random.randint(0, N, size=len(rewired_sources), dtype=np.int64)
+    pending = np.arange(len(rewired_sources))
+    for _ in range(max_rounds):
+        keys = np.minimum(rewired_sources, new_targets) * N + np.maximum(rewired_sources, new_targets)
+        conflict = (rewired_sources == new_targets) | (keys == original_keys)
+        position = np.minimum(np.searchsorted(kept_keys, keys), max(len(kept_keys) - 1, 0))
+        if len(kept_keys):
+            conflict |= kept_keys[position] == keys
+        # among equal new links only the first one is kept
+        order = np.argsort(keys, kind='stable')
+        repeated = np.zeros(len(keys), dtype=bool)
+        repeated[order[1:]] = keys[order[1:]] == keys[order[:-1]]
+        conflict |= repeated
+        pending = np.flatnonzero(conflict)
+        if len(pending) == 0:
+            break
+        new_targets[pending] = np.random.randint(0, N, size=len(pending), dtype=np.int64)
+    if len(pending):
+        place_pending_links(N, rewired_sources, original_targets, new_targets, pending, kept_keys)
+    sources = sources.copy()
+    sources[rewired] = rewired_sources
+    targets = targets.copy()
+    targets[rewired] = new_targets
+    return np.column_stack((sources, targets)).astype(np.int32)
@@ -0,0 +1,147 @@
+import numpy as np
+
+
+def edge_array_from_graph(graph):
+    nodes = list(graph.nodes)
+    node_index = {node: index for index, node in enumerate(nodes)}
+    edges = np.fromiter((node_index[node] for edge in graph.edges for node in edge),
+                        dtype=np.int32, count=2 * graph.number_of_edges())
+    return nodes, edges.reshape(-1, 2)
+
+
+def hash_nodes(nodes, seed=0):
+    # splitmix64 finalizer, uint64 arithmetic wraps around on purpose
+    values = nodes.astype(np.uint64) + np.uint64(seed) * np.uint64(0x9E3779B97F4A7C15)
+    values = values + np.uint64(0x9E3779B97F4A7C15)
+    values = (values ^ (values >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    values = (values ^ (values >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+class HyperANF(object):
+    def __init__(self, N, edges, precision=6, seed=0, chunk_size=2 ** 18):
+        self.N = N
+        self.precision = precision
+        self.m = 2 ** precision
+        self.seed = seed
+        self.chunk_size = chunk_size
+        if self.m >= 128:
+            self.alpha = 0.7213 / (1 + 1.079 / self.m)
+        else:
+            self.alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(self.m, 0.673)
+
+        edges = np.asarray(edges, dtype=np.int32).reshape(-1, 2)
+        sources = np.concatenate((edges[:, 0], edges[:, 1]))
+        targets = np.concatenate((edges[:, 1], edges[:, 0]))
+        order = np.argsort(sources, kind='stable')
+        self.indices = targets[order]
+        self.indptr = np.zeros(N + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=N), out=self.indptr[1:])
+
+        self.registers = None
+        self.neighbourhood_function = []
+        self.distance_sums = None
+        self.reachable = None
+
+    def initial_registers(self):
+        hashes = hash_nodes(np.arange(self.N), seed=self.seed)
+        register_index = (hashes >> np.uint64(64 - self.precision)).astype(np.int64)
+        low_bits = (hashes & np.uint64(0xFFFFFFFF)).astype(np.float64)
+        rho = np.full(self.N, 33, dtype=np.uint8)
+        nonzero = low_bits > 0
+        rho[nonzero] = 32 - np.floor(np.log2(low_bits[nonzero])).astype(np.uint8)
+        registers = np.zeros((self.N, self.m), dtype=np.uint8)
+        registers[np.arange(self.N), register_index] = rho
+        return registers
+
+    def estimate_counts(self, registers):
+        estimates = np.empty(self.N)
+        for start in range(0, self.N, self.chunk_size):
+            chunk = registers[start:start + self.chunk_size]
+            harmonic = np.ldexp(1.0, -chunk.astype(np.int32)).sum(axis=1)
+            raw = self.alpha * self.m ** 2 / harmonic
+            zeros = np.count_nonzero(chunk == 0, axis=1)
+            small = (raw <= 2.5 * self.m) & (zeros > 0)
+            raw[small] = self.m * np.log(self.m / zeros[small])
+            estimates[start:start + self.chunk_size] = raw
+        return estimates
+
+    def propagate(self, registers):
+        # every counter becomes the union of its own and its neighbours' counters
+        updated = registers.copy()
+        node_start = 0
+        while node_start < self.N:
+            node_stop = int(np.searchsorted(self.indptr, self.indptr[node_start] + self.chunk_size,
+                                            side='right')) - 1
+            node_stop = min(max(node_stop, node_start + 1), self.N)
+            edge_start, edge_stop = self.indptr[node_start], self.indptr[node_stop]
+            if edge_stop > edge_start:
+                degrees = np.diff(self.indptr[node_start:node_stop + 1])
+                has_neighbours = np.flatnonzero(degrees) + node_start
+                offsets = self.indptr[has_neighbours] - edge_start
+                gathered = registers[self.indices[edge_start:edge_stop]]
+                neighbour_max = np.maximum.reduceat(gathered, offsets, axis=0)
+                np.maximum(updated[has_neighbours], neighbour_max, out=neighbour_max)
+                updated[has_neighbours] = neighbour_max
+            node_start = node_stop
+        return updated
+
+    def run(self, max_distance=None):
+        # neighbourhood_function[t] is the estimated number of ordered pairs
+        # (including u, u) within distance t
+        self.registers = self.initial_registers()
+        previous = self.estimate_counts(self.registers)
+        self.neighbourhood_function = [float(previous.sum())]
+        self.distance_sums = np.zeros(self.N)
+        distance = 0
+        while max_distance is None or distance < max_distance:
+            registers = self.propagate(self.registers)
+            if np.array_equal(registers, self.registers):
+                break
+            distance += 1
+            self.registers = registers
+            current = np.maximum(self.estimate_counts(registers), previous)
+            self.distance_sums += distance * (current - previous)
+            self.neighbourhood_function.append(float(current.sum()))
+            previous = current
+        self.reachable = previous
+
+    def distance_distribution(self):
+        # estimated number of unordered pairs at each distance
+        pairs = np.diff(np.maximum.accumulate(self.neighbourhood_function)) / 2
+        return {distance + 1: float(count) for distance, count in enumerate(pairs)}
+
+    def average_path(self):
+        distribution = self.distance_distribution()
+        all_paths = sum(distribution.values())
+        if all_paths == 0:
+            return 0
+        return sum(distance * count for distance, count in distribution.items()) / all_paths
+
+    def effective_diameter(self, quantile=0.9):
+        distribution = self.distance_distribution()
+        if not distribution:
+            return 0
+        cumulative = np.cumsum([0] + list(distribution.values()))
+        target = quantile * cumulative[-1]
+        distance = int(np.searchsorted(cumulative, target))
+        below = cumulative[distance - 1]
+        step = cumulative[distance] - below
+        return distance - 1 + ((target - below) / step if step > 0 else 0)
+
+    def closeness(self):
+        # same normalization as nx.closeness_centrality with wf_improved=True
+        reachable = self.reachable - 1
+        closeness = np.zeros(self.N)
+        valid = (self.distance_sums > 0) & (reachable > 0)
+        closeness[valid] = reachable[valid] / self.distance_sums[valid]
+        if self.N > 1:
+            closeness[valid] *= reachable[valid] / (self.N - 1)
+        return closeness
+
+
+def approximate_closeness_centrality(graph, precision=6, seed=0):
+    nodes, edges = edge_array_from_graph(graph)
+    hyper_anf = HyperANF(len(nodes), edges, precision=precision, seed=seed)
+    hyper_anf.run()
+    return dict(zip(nodes, hyper_anf.closeness()))
@@ -16,6 +16,8 @@ if __name__ == '__main__':
     p = calculator.parameter_from_erg_degree()
     k = calculator.parameter_from_ws_degree()
     beta = 0.3
+    # exact all-pairs histogram when None, BFS from this many random sources otherwise
+    path_sources = None
 
     # ER model
     er_graph = GraphAnalyzer('ER', (N, L))
@@ -23,9 +25,12 @@ if __name__ == '__main__':
     er_graph.average_degree_and_histogram()
     # er_graph.calculate_graph_diameter_nx()
     # er_graph.calculate_average_shortest_path_nx()
-    er_graph.calculate_path_histogram()
-    er_graph.calculate_diameter_from_histogram()
-    er_graph.calculate_average_path_from_histogram()
+    if path_sources:
+        er_graph.estimate_path_histogram(number_of_sources=path_sources)
+    else:
+        er_graph.calculate_path_histogram()
+        er_graph.calculate_diameter_from_histogram()
+        er_graph.calculate_average_path_from_histogram()
 
     # ERG model
     generator = ErdosRenyiGraphGenerator(p=p, N=N)
@@ -38,9 +43,12 @@ if __name__ == '__main__':
     erg_graph.average_degree_and_histogram()
     # erg_graph.calculate_graph_diameter_nx()
     # erg_graph.calculate_average_shortest_path_nx()
-    erg_graph.calculate_path_histogram()
-    erg_graph.calculate_diameter_from_histogram()
-    erg_graph.calculate_average_path_from_histogram()
+    if path_sources:
+        erg_graph.estimate_path_histogram(number_of_sources=path_sources)
+    else:
+        erg_graph.calculate_path_histogram()
+        erg_graph.calculate_diameter_from_histogram()
+        erg_graph.calculate_average_path_from_histogram()
 
     # WS model
     ws_graph = GraphAnalyzer('WS', (N, k, beta))
@@ -48,9 +56,12 @@ if __name__ == '__main__':
     ws_graph.average_degree_and_histogram()
     # ws_graph.calculate_graph_diameter_nx()
     # ws_graph.calculate_average_shortest_path_nx()
-    ws_graph.calculate_path_histogram()
-    ws_graph.calculate_diameter_from_histogram()
-    ws_graph.calculate_average_path_from_histogram()
+    if path_sources:
+        ws_graph.estimate_path_histogram(number_of_sources=path_sources)
+    else:
+        ws_graph.calculate_path_histogram()
+        ws_graph.calculate_diameter_from_histogram()
+        ws_graph.calculate_average_path_from_histogram()
 
     print(er_graph.path_histogram)
     print(erg_graph.path_histogram)
@@ -0,0 +1,192 @@
+import cProfile
+import os
+import pstats
+import sys
+import threading
+from collections import Counter
+from functools import wraps
+from time import sleep
+
+
+# 'cprofile' (or '1') or 'sample', set in the environment so worker
+# processes of a sweep inherit it, the targets are 'sweep' for every chunk
+# of samples and/or names of GraphAnalyzer methods
+PROFILE_ENV = 'NETWORK_ROBUSTNESS_PROFILE'
+PROFILE_DIR_ENV = 'NETWORK_ROBUSTNESS_PROFILE_DIR'
+PROFILE_TARGETS_ENV = 'NETWORK_ROBUSTNESS_PROFILE_TARGETS'
+
+profile_counter = 0
+profile_active = False
+
+
+def enable_profiling(mode='cprofile', profile_dir=os.path.join('results', 'profiles'),
+                     targets=None):
+    os.environ[PROFILE_ENV] = mode
+    os.environ[PROFILE_DIR_ENV] = profile_dir
+    if targets:
+        os.environ[PROFILE_TARGETS_ENV] = ','.join(targets)
+
+
+def profile_mode():
+    mode = os.environ.get(PROFILE_ENV)
+    if not mode or mode == '0':
+        return None
+    return 'sample' if mode == 'sample' else 'cprofile'
+
+
+def profile_targets():
+    return set(os.environ.get(PROFILE_TARGETS_ENV, 'sweep').split(','))
+
+
+def is_networkx_function(file_name):
+    return f'{os.sep}networkx{os.sep}' in file_name
+
+
+def function_label(file_name, line, name):
+    # module:function:line, without the spaces and semicolons that separate
+    # the fields of a collapsed stack
+    if file_name == '~':
+        label = name
+    else:
+        module = os.path.splitext(os.path.basename(file_name))[0]
+        if is_networkx_function(file_name):
+            module = file_name.split(f'{os.sep}networkx{os.sep}')[-1][:-len('.py')]
+            module = 'networkx.' + module.replace(os.sep, '.')
+        label = f'{module}:{name}:{line}'
+    return label.replace(' ', '_').replace(';', ',')
+
+
+def networkx_summary(stats, top=10):
+    # share of the own time of every networkx function in the profile
+    total_time = sum(entry[2] for entry in stats.values())
+    networkx_times = Counter()
+    for function, entry in stats.items():
+        if is_networkx_function(function[0]):
+            networkx_times[function_label(*function)] += entry[2]
+    lines = [f'networkx internals: {sum(networkx_times.values()):.3f} s of {total_time:.3f} s']
+    for label, own_time in networkx_times.most_common(top):
+        share = own_time / total_time if total_time > 0 else 0
+        lines.append(f'    {label}: {own_time:.3f} s ({share:.1%})')
+    return lines
+
+
+class StackSampler(object):
+    # samples the stack of one thread every interval seconds, each sample is
+    # counted as a collapsed stack
+    def __init__(self, thread_id, interval=0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.running = False
+        self.thread = None
+
+    def sample(self):
+        while self.running:
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(function_label(code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+            sleep(self.interval)
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self.sample, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        self.thread.join()
+
+    def networkx_summary(self, top=10):
+        # samples with a networkx function anywhere on the stack
+        total_samples = sum(self.stacks.values())
+        networkx_samples = Counter()
+        for stack, samples in self.stacks.items():
+            for label in set(stack.split(';')):
+                if label.startswith('networkx.'):
+                    networkx_samples[label] += samples
+        lines = [f'{total_samples} samples every {self.interval} s']
+        for label, samples in networkx_samples.most_common(top):
+            lines.append(f'    {label}: {samples} samples ({samples / total_samples:.1%})')
+        return lines
+
+
+def write_profile_files(base_path, summary_lines, stacks=None):
+    # collapsed stacks only come from the sampler, cProfile keeps caller ->
+    # callee totals, which cannot tell which path a shared callee such as the
+    # timed_stage wrapper was reached through
+    if stacks is not None:
+        with open(f'{base_path}.collapsed', 'w') as collapsed_file:
+            for stack, value in sorted(stacks.items()):
+                collapsed_file.write(f'{stack} {value}\n')
+    with open(f'{base_path}.txt', 'w') as summary_file:
+        summary_file.write('\n'.join(summary_lines) + '\n')
+
+
+def profile_call(name, function, *args, **kwargs):
+    # runs function under the profiler selected in the environment and
+    # writes <name>-<pid>-<n>.prof and .txt to the profile directory with
+    # cProfile, .collapsed and .txt with the sampler,
+    # nested calls and disabled profiling run the function as it is
+    global profile_counter, profile_active
+    mode = profile_mode()
+    if mode is None or profile_active:
+        return function(*args, **kwargs)
+    profile_dir = os.environ.get(PROFILE_DIR_ENV, os.path.join('results', 'profiles'))
+    os.makedirs(profile_dir, exist_ok=True)
+    profile_counter += 1
+    base_path = os.path.join(profile_dir, f'{name}-{os.getpid()}-{profile_counter}')
+    profile_active = True
+    try:
+        if mode == 'sample':
+            sampler = StackSampler(threading.get_ident())
+            sampler.start()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                sampler.stop()
+                write_profile_files(base_path, sampler.networkx_summary(), stacks=sampler.stacks)
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(function, *args, **kwargs)
+        finally:
+            profiler.dump_stats(f'{base_path}.prof')
+            stats = pstats.Stats(profiler).stats
+            summary_lines = networkx_summary(stats)
+            top_functions = sorted(stats.items(), key=lambda item: item[1][2], reverse=True)[:20]
+            summary_lines.append('top functions by own time:')
+            summary_lines += [f'    {function_label(*function)}: {entry[2]:.3f} s, {entry[1]} calls'
+                              for function, entry in top_functions]
+            write_profile_files(base_path, summary_lines)
+    finally:
+        profile_active = False
+
+
+def profiled(name=None):
+    # a disabled hook costs one environment lookup per call
+    def decorator(function):
+        target = name or function.__name__
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if profile_mode() is None or target not in profile_targets():
+                return function(*args, **kwargs)
+            return profile_call(target, function, *args, **kwargs)
+        wrapper.profiled = True
+        return wrapper
+    return decorator
+
+
+def profile_methods(cls):
+    # wraps the methods of cls named in the profile targets, nothing is
+    # touched while profiling is disabled
+    if profile_mode() is None:
+        return
+    for name in profile_targets():
+        method = getattr(cls, name, None)
+        if callable(method) and not getattr(method, 'profiled', False):
+            setattr(cls, name, profiled(name)(method))
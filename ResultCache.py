@@ -0,0 +1,147 @@
+import hashlib
+import json
+import os
+import shutil
+import numpy as np
+from GraphAnalyzer import AverageDegreeCalculator
+from CommonFunctions import check_if_file_exists, read_json_file
+from ResultStore import ResultStore, STRATEGY_PREFIXES, result_store_path, read_result_stores
+
+
+# modules whose source decides the sweep results, edits invalidate the cache
+SOURCE_MODULES = ('GraphAnalyzer.py', 'GraphGenerators.py', 'CSRGraph.py', 'UnionFind.py',
+                  'HyperANF.py', 'SweepRunner.py', 'TriangleCounter.py', 'GraphCache.py')
+
+# GraphAnalyzer defaults, an empty analyzer_options dict means these
+DEFAULT_ANALYZER_OPTIONS = {'backend': 'networkx', 'generator': 'networkx'}
+
+code_version_hash = None
+
+
+def code_version():
+    global code_version_hash
+    if code_version_hash is None:
+        source_dir = os.path.dirname(os.path.abspath(__file__))
+        version = hashlib.sha1()
+        for module in SOURCE_MODULES:
+            with open(os.path.join(source_dir, module), 'rb') as file:
+                version.update(file.read())
+        code_version_hash = version.hexdigest()[:16]
+    return code_version_hash
+
+
+class ResultCache(object):
+    # averaged sweep curves stored under a hash of everything that decides
+    # them, entry <key>.json holds the curve and time and <key>.f32 the
+    # per-sample result store, least recently used entries are evicted once
+    # the directory grows over max_bytes
+    def __init__(self, cache_dir=os.path.join('results', 'cache'), max_bytes=2 ** 29):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def key(graph_type, model_parameters, strategy, f_space, samples, strategy_options=None,
+            seed=None, analyzer_options=None):
+        # seed is None for unseeded runs, any realization of those is a hit,
+        # the analyzer options pick the generator, which changes the model
+        description = {'type': graph_type,
+                       'parameters': [float(parameter) for parameter in model_parameters],
+                       'strategy': strategy,
+                       'fspace': [float(f) for f in f_space],
+                       'samples': samples,
+                       'options': strategy_options or {},
+                       'seed': seed,
+                       'analyzer': dict(DEFAULT_ANALYZER_OPTIONS, **(analyzer_options or {})),
+                       'code': code_version()}
+        return hashlib.sha1(json.dumps(description, sort_keys=True).encode()).hexdigest()
+
+    def entry_path(self, key, extension='json'):
+        return os.path.join(self.cache_dir, f'{key}.{extension}')
+
+    def get(self, key, store=None):
+        # (avg_component, time) or None, a hit also refills the given store
+        path = self.entry_path(key)
+        if not check_if_file_exists(path):
+            return None
+        with open(path, 'r') as file:
+            entry = json.load(file)
+        # the modification time is the last use for the eviction
+        os.utime(path)
+        store_path = self.entry_path(key, 'f32')
+        if store is not None and check_if_file_exists(store_path):
+            cached_store = ResultStore(store_path)
+            store.truncate(0)
+            store.append(cached_store.curves(), cached_store.read(columns=list(
+                range(len(cached_store.fspace), cached_store.number_of_columns))))
+            store.set_wall_time(cached_store.wall_time())
+        return np.array(entry['avg_component']), entry['time']
+
+    def put(self, key, avg_component, time, store=None):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        if store is not None:
+            shutil.copyfile(store.path, self.entry_path(key, 'f32'))
+        temporary_path = f'{self.entry_path(key)}.tmp{os.getpid()}'
+        with open(temporary_path, 'w') as file:
+            json.dump({'avg_component': np.asarray(avg_component).tolist(), 'time': time}, file)
+        os.replace(temporary_path, self.entry_path(key))
+        self.evict()
+
+    def evict(self):
+        entries = []
+        total_bytes = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.json'):
+                continue
+            key = name[:-len('.json')]
+            paths = [self.entry_path(key), self.entry_path(key, 'f32')]
+            size = sum(os.path.getsize(path) for path in paths if check_if_file_exists(path))
+            entries.append((os.path.getmtime(paths[0]), key, paths, size))
+            total_bytes += size
+        for _, key, paths, size in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            for path in paths:
+                if check_if_file_exists(path):
+                    os.remove(path)
+            total_bytes -= size
+
+
+def read_cached_sweep_data(cache, prefix, graph_type, N, samples, degrees, f_space, beta=0.01,
+                           analyzer_options=None):
+    # data_dict of the sweep scripts built from cache entries, None on a miss
+    strategies = {strategy_prefix: strategy for strategy, strategy_prefix in STRATEGY_PREFIXES.items()}
+    if prefix not in strategies:
+        return None
+    data_dict = {'type': graph_type, 'N': N, 'samples': samples,
+                 'fspace': [float(f) for f in f_space], 'degrees': {}}
+    calculator = AverageDegreeCalculator(N=N)
+    for degree in degrees:
+        calculator.change_degree(degree)
+        key = ResultCache.key(graph_type, calculator.model_parameters(graph_type, beta=beta),
+                              strategies[prefix], f_space, samples,
+                              analyzer_options=analyzer_options)
+        cached = cache.get(key)
+        if cached is None:
+            return None
+        data_dict['degrees'][str(degree)] = (cached[0].tolist(), cached[1])
+    return data_dict
+
+
+def read_sweep_data(prefix, graph_type, N, samples, degrees, sub_dir='', cache=None,
+                    f_space=np.linspace(0, 1, 101), beta=0.01, analyzer_options=None):
+    # result cache first, then the result stores when every degree has one
+    # and the JSON dump of the sweep script otherwise
+    if cache is not None:
+        data_dict = read_cached_sweep_data(cache, prefix, graph_type, N, samples, degrees, f_space,
+                                           beta=beta, analyzer_options=analyzer_options)
+        if data_dict is not None:
+            return data_dict
+    if all(check_if_file_exists(result_store_path(prefix, graph_type, N, samples, degree, sub_dir))
+           for degree in degrees):
+        return read_result_stores(prefix, graph_type, N, samples, degrees, sub_dir=sub_dir)
+    degree_str = ''.join(f'k{degree}' for degree in degrees)
+    file_title = f'{prefix}{graph_type}N{N}L{samples}deg{degree_str}.json'
+    path = os.path.join(sub_dir, file_title) if sub_dir else file_title
+    if not check_if_file_exists(path):
+        raise FileNotFoundError(f'No cached or stored results for {file_title}, run the sweep first.')
+    return read_json_file(file_title, sub_dir=sub_dir)
@@ -0,0 +1,163 @@
+import json
+import os
+import numpy as np
+from CommonFunctions import check_if_file_exists
+
+
+# file prefixes of the sweep scripts for every attack strategy
+STRATEGY_PREFIXES = {'random': 'Component',
+                     'degree': 'DegreeCentrality',
+                     'degree_adaptive': 'DegreeAdaptiveCentrality',
+                     'closeness': 'ClosenessCentrality',
+                     'closeness_approx': 'ClosenessCentralityApprox',
+                     'betweenness': 'BetweennessCentrality',
+                     'betweenness_approx': 'BetweennessCentralityApprox'}
+
+# directories of the sweep and plotting scripts for every attack strategy,
+# their results go to <directory>/results
+STRATEGY_DIRECTORIES = {'random': 'GiantComponent',
+                        'degree': 'DegreeCentrality',
+                        'degree_adaptive': 'DegreeCentrality',
+                        'closeness': 'ClosenessCentrality',
+                        'closeness_approx': 'ClosenessCentrality',
+                        'betweenness': 'BetweennessCentrality',
+                        'betweenness_approx': 'BetweennessCentrality'}
+
+
+class ResultStore(object):
+    # binary file with a JSON header followed by float32 rows, one row per
+    # sample: the curve over fspace and then the extra columns (e.g. time),
+    # rows are appended while a sweep runs and read back through np.memmap,
+    # a float64 slot before the header holds the wall time of the run
+    magic = b'NRSTORE2'
+    alignment = 64
+    wall_time_offset = len(magic) + 8
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as file:
+            if file.read(len(self.magic)) != self.magic:
+                raise ValueError(f'{path} is not a result store.')
+            header_length = int(np.frombuffer(file.read(8), dtype=np.uint64)[0])
+            file.seek(self.wall_time_offset + 8)
+            self.header = json.loads(file.read(header_length).decode())
+        self.data_offset = self.aligned_offset(header_length)
+        self.fspace = self.header['fspace']
+        self.column_names = [str(f) for f in self.fspace] + self.header['extra_columns']
+        self.number_of_columns = len(self.column_names)
+
+    @classmethod
+    def aligned_offset(cls, header_length):
+        offset = cls.wall_time_offset + 8 + header_length
+        return offset + (-offset) % cls.alignment
+
+    @classmethod
+    def create(cls, path, metadata, f_space, extra_columns=('time',), append=False):
+        # with append an existing store with the same header is reopened,
+        # otherwise it is replaced
+        header = dict(metadata)
+        header['fspace'] = [float(f) for f in f_space]
+        header['extra_columns'] = list(extra_columns)
+        header['dtype'] = 'float32'
+        if append and check_if_file_exists(path):
+            store = cls(path)
+            if store.header != json.loads(json.dumps(header)):
+                raise ValueError(f'{path} already holds results of a different run.')
+            return store
+        header_bytes = json.dumps(header).encode()
+        padding = cls.aligned_offset(len(header_bytes)) - cls.wall_time_offset - 8 - len(header_bytes)
+        with open(path, 'wb') as file:
+            file.write(cls.magic)
+            file.write(np.array([len(header_bytes)], dtype=np.uint64).tobytes())
+            file.write(np.array([0.0], dtype=np.float64).tobytes())
+            file.write(header_bytes)
+            file.write(b'\0' * padding)
+        return cls(path)
+
+    def row_bytes(self):
+        return self.number_of_columns * 4
+
+    def number_of_samples(self):
+        return (os.path.getsize(self.path) - self.data_offset) // self.row_bytes()
+
+    def append(self, curves, extra=None):
+        rows = np.asarray(curves, dtype=np.float32).reshape(-1, len(self.fspace))
+        if extra is not None:
+            extra = np.asarray(extra, dtype=np.float32).reshape(len(rows), -1)
+            rows = np.concatenate((rows, extra), axis=1)
+        if rows.shape[1] != self.number_of_columns:
+            raise ValueError(f'Expected {self.number_of_columns} columns, got {rows.shape[1]}.')
+        with open(self.path, 'r+b') as file:
+            # a row cut short by an interrupted write is dropped
+            file.truncate(self.data_offset + self.number_of_samples() * self.row_bytes())
+            file.seek(0, os.SEEK_END)
+            file.write(np.ascontiguousarray(rows).tobytes())
+
+    def truncate(self, samples):
+        with open(self.path, 'r+b') as file:
+            file.truncate(self.data_offset + min(samples, self.number_of_samples()) * self.row_bytes())
+
+    def read(self, columns=None):
+        samples = self.number_of_samples()
+        if samples == 0:
+            return np.zeros((0, self.number_of_columns if columns is None else len(columns)),
+                            dtype=np.float32)
+        data = np.memmap(self.path, dtype=np.float32, mode='r', offset=self.data_offset,
+                         shape=(samples, self.number_of_columns))
+        return data if columns is None else data[:, columns]
+
+    def column_index(self, name):
+        return self.column_names.index(name)
+
+    def curves(self):
+        return self.read(columns=list(range(len(self.fspace))))
+
+    def mean_curve(self):
+        return self.curves().mean(axis=0, dtype=np.float64)
+
+    def standard_error(self):
+        curves = self.curves()
+        if len(curves) < 2:
+            return np.zeros(len(self.fspace))
+        return curves.std(axis=0, ddof=1, dtype=np.float64) / np.sqrt(len(curves))
+
+    def total_time(self):
+        # summed over samples, with several workers this exceeds the wall time
+        if 'time' not in self.column_names:
+            return 0
+        return float(self.read(columns=[self.column_index('time')]).sum(dtype=np.float64))
+
+    def wall_time(self):
+        with open(self.path, 'rb') as file:
+            file.seek(self.wall_time_offset)
+            return float(np.frombuffer(file.read(8), dtype=np.float64)[0])
+
+    def set_wall_time(self, seconds):
+        with open(self.path, 'r+b') as file:
+            file.seek(self.wall_time_offset)
+            file.write(np.array([seconds], dtype=np.float64).tobytes())
+
+    def add_wall_time(self, seconds):
+        # a resumed run adds the time it spends to that of the earlier runs
+        self.set_wall_time(self.wall_time() + seconds)
+
+
+def result_store_title(prefix, graph_type, N, samples, degree):
+    return f'{prefix}{graph_type}N{N}L{samples}k{degree}.f32'
+
+
+def result_store_path(prefix, graph_type, N, samples, degree, sub_dir=''):
+    title = result_store_title(prefix, graph_type, N, samples, degree)
+    return os.path.join(sub_dir, title) if sub_dir else title
+
+
+def read_result_stores(prefix, graph_type, N, samples, degrees, sub_dir=''):
+    # same layout as the JSON written by the sweep scripts, only the curve
+    # columns are read and time is the wall time of the run, as in the JSON
+    data_dict = {'type': graph_type, 'N': N, 'samples': samples, 'fspace': None, 'degrees': {}}
+    for degree in degrees:
+        store = ResultStore(result_store_path(prefix, graph_type, N, samples, degree, sub_dir))
+        data_dict['fspace'] = store.fspace
+        data_dict['degrees'][str(degree)] = (store.mean_curve().tolist(), round(store.wall_time()))
+    return data_dict
+
@@ -0,0 +1,77 @@
+import json
+from contextlib import contextmanager
+from functools import wraps
+from time import time
+
+
+# generation of realizations, centrality rankings, removing nodes or
+# drawing a random removal order, and measuring giant components, the
+# union-find sweep counts as component
+STAGES = ('generation', 'centrality', 'removal', 'component')
+
+
+def timed_stage(stage):
+    # GraphAnalyzer methods report to self.stage_timer when one is attached
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.stage_timer is None:
+                return method(self, *args, **kwargs)
+            with self.stage_timer.measure(stage):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class StageTimer(object):
+    # cumulative time per stage, nested stages are subtracted from the
+    # enclosing one so the stage times add up to the measured total
+    def __init__(self, total_samples=None, log_path=None):
+        self.total_samples = total_samples
+        self.log_path = log_path
+        self.stage_times = {stage: 0.0 for stage in STAGES}
+        self.stage_calls = {stage: 0 for stage in STAGES}
+        self.samples = 0
+        self.start_time = time()
+        self.active = []
+
+    @contextmanager
+    def measure(self, stage):
+        # active holds [stage, start, time spent in nested stages]
+        self.active.append([stage, time(), 0.0])
+        try:
+            yield
+        finally:
+            stage, start, nested_time = self.active.pop()
+            elapsed = time() - start
+            self.stage_times[stage] = self.stage_times.get(stage, 0.0) + elapsed - nested_time
+            self.stage_calls[stage] = self.stage_calls.get(stage, 0) + 1
+            if self.active:
+                self.active[-1][2] += elapsed
+
+    def merge(self, metrics):
+        # adds the stage times of another timer, e.g. of a worker process
+        for stage, stage_time in metrics['stage_times'].items():
+            self.stage_times[stage] = self.stage_times.get(stage, 0.0) + stage_time
+        for stage, calls in metrics['stage_calls'].items():
+            self.stage_calls[stage] = self.stage_calls.get(stage, 0) + calls
+
+    def sample_done(self, samples=1, **extra):
+        self.samples += samples
+        if self.log_path is not None:
+            with open(self.log_path, 'a') as log_file:
+                log_file.write(json.dumps(dict(self.metrics(), **extra)) + '\n')
+
+    def metrics(self):
+        elapsed = time() - self.start_time
+        samples_per_second = self.samples / elapsed if elapsed > 0 else 0.0
+        eta = None
+        if self.total_samples is not None and samples_per_second > 0:
+            eta = max(self.total_samples - self.samples, 0) / samples_per_second
+        return {'samples': self.samples,
+                'total_samples': self.total_samples,
+                'elapsed': elapsed,
+                'samples_per_second': samples_per_second,
+                'eta': eta,
+                'stage_times': dict(self.stage_times),
+                'stage_calls': dict(self.stage_calls)}
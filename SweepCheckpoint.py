@@ -0,0 +1,69 @@
+import json
+import os
+import numpy as np
+from time import time
+from CommonFunctions import check_if_file_exists
+
+
+class SweepCheckpoint(object):
+    # completed chunks of a sweep, every entry holds the first sample, sample
+    # count and partial curve sum of a chunk, so a resumed run only computes the
+    # missing chunks and sums everything in the same order
+    def __init__(self, path, resume=False, interval=60):
+        self.path = path
+        self.interval = interval
+        self.config = None
+        self.entries = {}
+        self.last_save = time()
+        self.resumed = False
+        if resume and check_if_file_exists(path):
+            with open(path, 'r') as file:
+                data = json.load(file)
+            self.config = data['config']
+            self.entries = data['entries']
+            self.resumed = True
+            print(f'Resuming from checkpoint {path}...')
+
+    def start(self, config):
+        config = json.loads(json.dumps(config))
+        if self.config is not None and self.config != config:
+            raise ValueError(f'Checkpoint {self.path} belongs to a different sweep.')
+        self.config = config
+
+    def entry(self, key, model_parameters):
+        model_parameters = json.loads(json.dumps(list(model_parameters)))
+        entry = self.entries.setdefault(key, {'model_parameters': model_parameters,
+                                              'chunks': {}, 'store_rows': 0})
+        if entry['model_parameters'] != model_parameters:
+            raise ValueError(f'Checkpoint entry {key} was run with {entry["model_parameters"]}.')
+        return entry
+
+    def completed(self, key, model_parameters):
+        chunks = self.entry(key, model_parameters)['chunks']
+        return {int(index): np.array(chunk['component_sum']) for index, chunk in chunks.items()}
+
+    def store_rows(self, key, model_parameters):
+        return self.entry(key, model_parameters)['store_rows']
+
+    def record(self, key, model_parameters, index, samples, first_sample, component_sum, elapsed,
+               store_rows=0):
+        entry = self.entry(key, model_parameters)
+        entry['chunks'][str(index)] = {'samples': int(samples), 'first_sample': int(first_sample),
+                                       'component_sum': np.asarray(component_sum).tolist(),
+                                       'time': float(elapsed)}
+        entry['store_rows'] = int(store_rows)
+        if time() - self.last_save >= self.interval:
+            self.save()
+
+    def save(self):
+        # written next to the checkpoint and renamed, an interrupted write
+        # leaves the previous checkpoint intact
+        temporary_path = f'{self.path}.tmp'
+        with open(temporary_path, 'w') as file:
+            json.dump({'config': self.config, 'entries': self.entries}, file)
+        os.replace(temporary_path, self.path)
+        self.last_save = time()
+
+    def remove(self):
+        if check_if_file_exists(self.path):
+            os.remove(self.path)
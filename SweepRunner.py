@@ -0,0 +1,281 @@
+import argparse
+import os
+import numpy as np
+from time import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from GraphAnalyzer import GraphAnalyzer
+from GraphEnsemble import GraphEnsemble
+from Profiling import enable_profiling, profile_methods, profiled
+from ResultStore import ResultStore, result_store_path
+from SweepCheckpoint import SweepCheckpoint
+from ResultCache import ResultCache
+from StageTimer import StageTimer
+from CommonFunctions import seed_generators, sample_seed
+
+
+def parse_sweep_arguments(default_jobs=1):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--jobs', type=int, default=default_jobs,
+                        help='number of worker processes, 0 uses every available core')
+    parser.add_argument('--resume', action='store_true',
+                        help='continue from the checkpoint of an interrupted run')
+    parser.add_argument('--checkpoint-interval', type=float, default=60,
+                        help='seconds between checkpoint writes')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='recompute results that are already in the result cache')
+    parser.add_argument('--metrics-log', default=None,
+                        help='JSON lines file receiving stage times and throughput after every chunk')
+    add_profile_arguments(parser)
+    arguments, _ = parser.parse_known_args()
+    apply_profile_arguments(arguments)
+    return arguments
+
+
+def add_profile_arguments(parser):
+    parser.add_argument('--profile', nargs='?', const='cprofile', default=None,
+                        choices=['cprofile', 'sample'],
+                        help='profile every chunk of samples, cprofile writes .prof files and '
+                             'sample writes collapsed stacks to results/profiles')
+    parser.add_argument('--profile-targets', nargs='*', default=None,
+                        help="'sweep' and/or GraphAnalyzer methods to profile instead of whole chunks")
+
+
+def apply_profile_arguments(arguments):
+    # set in the environment, worker processes started later inherit it
+    if arguments.profile is not None:
+        enable_profiling(arguments.profile, targets=arguments.profile_targets)
+        profile_methods(GraphAnalyzer)
+
+
+def parse_jobs_argument(default_jobs=1):
+    return parse_sweep_arguments(default_jobs).jobs
+
+
+@profiled('sweep')
+def run_strategy_samples(graph_type, model_parameters, f_space, strategies, samples, seed=None,
+                         strategy_options=None, analyzer_options=None, first_sample=0):
+    # every strategy is evaluated on the same realization, returns
+    # {strategy: (components, times)} with one row per sample, the time of a
+    # strategy includes generating the realization, and the stage metrics,
+    # with a seed the generators are reseeded for every sample from the run
+    # seed and the sample's index first_sample + i
+    if strategy_options is None:
+        strategy_options = {}
+    if analyzer_options is None:
+        analyzer_options = {}
+    results = {strategy: (np.zeros((samples, len(f_space))), np.zeros(samples))
+               for strategy in strategies}
+    stage_timer = StageTimer(total_samples=samples)
+    graph = None
+    for i in range(samples):
+        if seed is not None:
+            seed_generators(sample_seed(seed, first_sample + i))
+        t1 = time()
+        if graph is None:
+            graph = GraphAnalyzer(graph_type, model_parameters, stage_timer=stage_timer,
+                                  **analyzer_options)
+        else:
+            graph.create_graph(graph_type, model_parameters)
+        generation_time = time() - t1
+        for strategy in strategies:
+            t1 = time()
+            components, times = results[strategy]
+            components[i] = graph.giant_component_sweep(f_space, centrality=strategy,
+                                                        **strategy_options.get(strategy, {}))
+            times[i] = time() - t1 + generation_time
+        stage_timer.sample_done()
+    return results, stage_timer.metrics()
+
+
+@profiled('sweep')
+def run_ensemble_samples(graph_type, model_parameters, f_space, samples, seed=None, batch_size=100,
+                         first_sample=0):
+    # random removal curves of batches of realizations swept together, the
+    # same curves as run_strategy_samples with the numpy generators, every
+    # sample of a batch gets an equal share of its time
+    stage_timer = StageTimer(total_samples=samples)
+    ensemble = GraphEnsemble(graph_type, model_parameters, samples, batch_size=batch_size)
+    components = np.zeros((samples, len(f_space)))
+    times = np.zeros(samples)
+    for start in range(0, samples, batch_size):
+        t1 = time()
+        batch_samples = min(batch_size, samples - start)
+        # the removal orders are drawn together with the realizations
+        with stage_timer.measure('generation'):
+            batch, removal_orders = ensemble.sample_batch(batch_samples, seed=seed,
+                                                          first_sample=first_sample + start)
+        with stage_timer.measure('component'):
+            components[start:start + batch_samples] = batch.giant_component_sweep(f_space,
+                                                                                  removal_orders)
+        times[start:start + batch_samples] = (time() - t1) / batch_samples
+        stage_timer.sample_done(batch_samples)
+    return components, times, stage_timer.metrics()
+
+
+def run_samples(graph_type, model_parameters, f_space, centrality, samples, seed=None,
+                centrality_options=None, analyzer_options=None, first_sample=0, ensemble_batch=None):
+    # giant component curves of one shard of samples, one row per sample,
+    # the time every sample took and the stage metrics, with ensemble_batch
+    # random removal runs on batches of that many realizations
+    if ensemble_batch is not None:
+        return run_ensemble_samples(graph_type, model_parameters, f_space, samples, seed=seed,
+                                    batch_size=ensemble_batch, first_sample=first_sample)
+    if centrality_options is None:
+        centrality_options = {}
+    results, metrics = run_strategy_samples(graph_type, model_parameters, f_space, [centrality],
+                                            samples, seed=seed,
+                                            strategy_options={centrality: centrality_options},
+                                            analyzer_options=analyzer_options,
+                                            first_sample=first_sample)
+    return results[centrality] + (metrics,)
+
+
+class SweepRunner(object):
+    chunks_per_job = 8
+
+    def __init__(self, graph_type, f_space, samples, centrality='random', jobs=1, seed=None,
+                 centrality_options=None, analyzer_options=None, cache=None, metrics_log=None,
+                 ensemble_batch=None):
+        self.graph_type = graph_type
+        self.f_space = f_space
+        self.samples = samples
+        self.centrality = centrality
+        self.jobs = jobs if jobs > 0 else os.cpu_count()
+        # without a seed fresh entropy is drawn once, so a checkpoint can
+        # store it and a resumed run gets the same chunk seeds
+        self.seeded = seed is not None
+        self.seed = seed if seed is not None else int(np.random.SeedSequence().entropy)
+        self.shards = None
+        self.centrality_options = centrality_options
+        # passed to GraphAnalyzer, e.g. {'backend': 'csr', 'generator': 'numpy'}
+        self.analyzer_options = analyzer_options
+        # ResultCache consulted before a run and filled after it
+        self.cache = cache
+        # stage times and throughput of the last run, also appended to
+        # metrics_log as JSON lines when given
+        self.metrics_log = metrics_log
+        self.metrics = {}
+        # random removal on GraphEnsemble batches of that many realizations,
+        # which use the numpy generators, so a seeded run gives the same
+        # curves as GraphAnalyzer with {'generator': 'numpy'}
+        if ensemble_batch is not None:
+            if centrality != 'random':
+                raise ValueError('ensemble_batch only sweeps random node removal.')
+            if graph_type in ('BA', 'WS') and (analyzer_options or {}).get('generator') != 'numpy':
+                raise ValueError("ensemble_batch needs analyzer_options with 'generator': 'numpy'.")
+        self.ensemble_batch = ensemble_batch
+
+    def split_samples(self):
+        # several chunks per worker keep the pool busy and the checkpoints
+        # frequent, every sample has its own seed so the split does not change
+        # the result
+        if self.shards is not None:
+            return self.shards
+        number_of_shards = max(min(self.chunks_per_job * self.jobs, self.samples), 1)
+        shard_size, remainder = divmod(self.samples, number_of_shards)
+        return [shard_size + 1 if index < remainder else shard_size
+                for index in range(number_of_shards)]
+
+    def shard_starts(self):
+        # index of the first sample of every shard
+        shards = self.split_samples()
+        return [int(start) for start in np.cumsum([0] + shards[:-1])]
+
+    def open_store(self, prefix, N, degree, sub_dir='', append=False):
+        metadata = {'model': self.graph_type, 'N': N, 'degree': degree,
+                    'strategy': self.centrality, 'seed': self.seed}
+        path = result_store_path(prefix, self.graph_type, N, self.samples, degree, sub_dir)
+        return ResultStore.create(path, metadata, self.f_space, append=append)
+
+    def cache_key(self, model_parameters):
+        return ResultCache.key(self.graph_type, model_parameters, self.centrality, self.f_space,
+                               self.samples, strategy_options=self.centrality_options,
+                               seed=self.seed if self.seeded else None,
+                               analyzer_options=self.analyzer_options)
+
+    def checkpoint_config(self):
+        return {'graph_type': self.graph_type, 'f_space': list(self.f_space),
+                'samples': self.samples, 'centrality': self.centrality, 'seed': self.seed,
+                'shards': self.split_samples(), 'centrality_options': self.centrality_options,
+                'analyzer_options': self.analyzer_options}
+
+    def open_checkpoint(self, prefix, N, sub_dir='', resume=False, interval=60):
+        # a resumed run takes over the seed and chunking of the interrupted one
+        title = f'{prefix}{self.graph_type}N{N}L{self.samples}.checkpoint.json'
+        checkpoint = SweepCheckpoint(os.path.join(sub_dir, title) if sub_dir else title,
+                                     resume=resume, interval=interval)
+        if checkpoint.config is not None:
+            self.seed = checkpoint.config['seed']
+            self.shards = checkpoint.config['shards']
+        checkpoint.start(self.checkpoint_config())
+        return checkpoint
+
+    def shard_results(self, model_parameters, indices):
+        # (index, components, times, metrics) of the given shards in order of completion
+        shards = self.split_samples()
+        starts = self.shard_starts()
+        if self.jobs == 1 or len(indices) <= 1:
+            for index in indices:
+                yield (index,) + run_samples(self.graph_type, model_parameters, self.f_space,
+                                             self.centrality, shards[index], seed=self.seed,
+                                             centrality_options=self.centrality_options,
+                                             analyzer_options=self.analyzer_options,
+                                             first_sample=starts[index],
+                                             ensemble_batch=self.ensemble_batch)
+            return
+        with ProcessPoolExecutor(max_workers=min(self.jobs, len(indices))) as executor:
+            futures = {executor.submit(run_samples, self.graph_type, model_parameters,
+                                       self.f_space, self.centrality, shards[index], self.seed,
+                                       self.centrality_options, self.analyzer_options,
+                                       starts[index], self.ensemble_batch): index
+                       for index in indices}
+            for future in as_completed(futures):
+                yield (futures[future],) + future.result()
+
+    def run(self, model_parameters, store=None, checkpoint=None, key=None):
+        # per-sample curves are appended to the store as soon as a shard is
+        # done, shards already in the checkpoint are skipped
+        N = model_parameters[0]
+        if self.cache is not None:
+            cached = self.cache.get(self.cache_key(model_parameters), store=store)
+            if cached is not None:
+                return cached[0]
+        t1 = time()
+        shards = self.split_samples()
+        starts = self.shard_starts()
+        shard_sums = {}
+        if checkpoint is not None:
+            shard_sums = checkpoint.completed(key, model_parameters)
+            if store is not None:
+                store.truncate(checkpoint.store_rows(key, model_parameters))
+        pending = [index for index in range(len(shards)) if index not in shard_sums]
+        stage_timer = StageTimer(total_samples=sum(shards[index] for index in pending),
+                                 log_path=self.metrics_log)
+        last_append = time()
+        for index, components, times, metrics in self.shard_results(model_parameters, pending):
+            shard_sums[index] = components.sum(axis=0)
+            stage_timer.merge(metrics)
+            stage_timer.sample_done(len(times), graph_type=self.graph_type,
+                                    model_parameters=list(model_parameters),
+                                    centrality=self.centrality)
+            self.metrics = stage_timer.metrics()
+            if store is not None:
+                store.append(components / N, times)
+                # wall time, not the per-sample times, which add up over workers
+                store.add_wall_time(time() - last_append)
+                last_append = time()
+            if checkpoint is not None:
+                checkpoint.record(key, model_parameters, index, shards[index], starts[index],
+                                  shard_sums[index], times.sum(),
+                                  store_rows=store.number_of_samples() if store is not None else 0)
+        if checkpoint is not None:
+            checkpoint.save()
+        # summed in shard order, the result does not depend on completion order
+        component_sum = np.zeros(len(self.f_space))
+        for index in range(len(shards)):
+            component_sum += shard_sums[index]
+        avg_component = component_sum / self.samples / N
+        if self.cache is not None:
+            self.cache.put(self.cache_key(model_parameters), avg_component, round(time() - t1),
+                           store=store)
+        return avg_component
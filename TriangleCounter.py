@@ -0,0 +1,209 @@
+import numpy as np
+from math import sqrt
+from scipy.stats import norm
+
+
+def unique_links(N, edges):
+    # (u, v) with u < v, self-loops and repeated links dropped, sorting and
+    # dropping repeats is much faster than np.unique here
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    edges = edges[edges[:, 0] != edges[:, 1]]
+    keys = np.sort(np.minimum(edges[:, 0], edges[:, 1]) * N + np.maximum(edges[:, 0], edges[:, 1]))
+    keys = keys[np.concatenate(([True], np.diff(keys) > 0))] if len(keys) else keys
+    return np.column_stack((keys // N, keys % N))
+
+
+def wilson_bounds(successes, samples, confidence=0.95):
+    # Wilson score interval of successes / samples, element-wise for arrays,
+    # it stays inside [0, 1] and keeps a width at proportions of 0 and 1
+    successes = np.asarray(successes, dtype=np.float64)
+    samples = np.asarray(samples, dtype=np.float64)
+    z = float(norm.ppf(0.5 + confidence / 2))
+    proportion = successes / samples
+    centre = (proportion + z ** 2 / (2 * samples)) / (1 + z ** 2 / samples)
+    half_width = z * np.sqrt(proportion * (1 - proportion) / samples + z ** 2 / (4 * samples ** 2)) \
+        / (1 + z ** 2 / samples)
+    # rounding leaves tiny offsets at 0 and 1, the bounds there are exact
+    lower = np.where(successes == 0, 0.0, np.maximum(centre - half_width, 0.0))
+    upper = np.where(successes == samples, 1.0, np.minimum(centre + half_width, 1.0))
+    return lower, upper
+
+
+def wilson_interval(successes, samples, confidence=0.95):
+    # proportion, its standard error and the Wilson score interval, which
+    # stays inside [0, 1] for the small proportions of sparse graphs
+    if samples == 0:
+        return 0.0, 0.0, (0.0, 1.0)
+    proportion = successes / samples
+    error = sqrt(proportion * (1 - proportion) / samples)
+    lower, upper = wilson_bounds(successes, samples, confidence)
+    return proportion, error, (float(lower), float(upper))
+
+
+class TriangleCounter(object):
+    # degree-ordered forward algorithm, every link points from the node of
+    # lower (degree, index) rank to the higher one, so a node keeps at most
+    # sqrt(2L) out-links and every triangle is found exactly once, as a pair
+    # of out-links of its lowest node closed by a link between the other two
+    def __init__(self, N, edges, chunk_size=2 ** 22):
+        self.N = N
+        self.chunk_size = chunk_size
+        edges = unique_links(N, edges)
+        self.degrees = np.bincount(edges.ravel(), minlength=N)
+
+        order = np.lexsort((np.arange(N), self.degrees))
+        self.rank = np.empty(N, dtype=np.int64)
+        self.rank[order] = np.arange(N)
+        ranked = self.rank[edges]
+        self.sources = ranked.min(axis=1)
+        self.targets = ranked.max(axis=1)
+        keys = np.sort(self.sources * N + self.targets)
+        self.sources = keys // N
+        self.targets = keys % N
+        self.keys = keys
+        self.triangles = None
+
+    def wedge_chunks(self):
+        # index pairs (first, second) of out-links of the same node with
+        # first < second, in chunks of about chunk_size pairs
+        out_degrees = np.bincount(self.sources, minlength=self.N)
+        starts = np.cumsum(out_degrees) - out_degrees
+        positions = np.arange(len(self.sources)) - starts[self.sources]
+        pairs_per_link = out_degrees[self.sources] - 1 - positions
+        boundaries = np.cumsum(pairs_per_link)
+        first_link = 0
+        while first_link < len(self.sources):
+            done = boundaries[first_link - 1] if first_link else 0
+            last_link = int(np.searchsorted(boundaries, done + self.chunk_size, side='right'))
+            last_link = max(last_link, first_link + 1)
+            counts = pairs_per_link[first_link:last_link]
+            first = np.repeat(np.arange(first_link, last_link), counts)
+            offsets = np.arange(len(first)) - np.repeat(np.cumsum(counts) - counts, counts)
+            yield first, first + 1 + offsets
+            first_link = last_link
+
+    def count(self):
+        # number of triangles through every node
+        triangles = np.zeros(self.N, dtype=np.int64)
+        for first, second in self.wedge_chunks():
+            if len(first) == 0:
+                continue
+            # sorted queries keep the binary searches cache friendly
+            order = np.argsort(self.targets[first] * self.N + self.targets[second])
+            first, second = first[order], second[order]
+            closing_keys = self.targets[first] * self.N + self.targets[second]
+            positions = np.searchsorted(self.keys, closing_keys)
+            closed = positions < len(self.keys)
+            closed[closed] = self.keys[positions[closed]] == closing_keys[closed]
+            corners = np.concatenate((self.sources[first[closed]], self.targets[first[closed]],
+                                      self.targets[second[closed]]))
+            triangles += np.bincount(corners, minlength=self.N)
+        self.triangles = triangles[self.rank]
+        return self.triangles
+
+    def clustering(self):
+        # local coefficients, their average over all N nodes and the
+        # transitivity 3 * triangles / connected triples
+        if self.triangles is None:
+            self.count()
+        pairs = self.degrees * (self.degrees - 1) // 2
+        coefficients = np.zeros(self.N)
+        valid = pairs > 0
+        coefficients[valid] = self.triangles[valid] / pairs[valid]
+        total_pairs = pairs.sum()
+        return {'coefficients': coefficients,
+                'triangles': self.triangles,
+                'average': float(coefficients.mean()) if self.N else 0.0,
+                'transitivity': float(self.triangles.sum() / total_pairs) if total_pairs else 0.0}
+
+
+class WedgeSampler(object):
+    # estimates from random wedges u - centre - w, a wedge is closed when u
+    # and w are linked, for graphs where counting every triangle takes too
+    # long, every estimate uses its own budget of samples
+    def __init__(self, N, edges, seed=None, chunk_size=2 ** 20):
+        self.N = N
+        self.chunk_size = chunk_size
+        self.random = np.random.default_rng(seed)
+        edges = unique_links(N, edges)
+        sources = np.concatenate((edges[:, 0], edges[:, 1]))
+        targets = np.concatenate((edges[:, 1], edges[:, 0]))
+        self.keys = np.sort(sources * N + targets)
+        self.indices = self.keys % N
+        self.degrees = np.bincount(sources, minlength=N)
+        self.indptr = np.zeros(N + 1, dtype=np.int64)
+        np.cumsum(self.degrees, out=self.indptr[1:])
+        self.pairs = self.degrees * (self.degrees - 1) // 2
+
+    def closed_wedges(self, centres):
+        # one uniform wedge at every centre, centres of degree < 2 give open ones
+        degrees = self.degrees[centres]
+        closed = np.zeros(len(centres), dtype=bool)
+        valid = degrees > 1
+        centres, degrees = centres[valid], degrees[valid]
+        first = self.random.integers(0, degrees)
+        second = self.random.integers(0, degrees - 1)
+        second += second >= first
+        closing_keys = self.indices[self.indptr[centres] + first] * self.N \
+            + self.indices[self.indptr[centres] + second]
+        positions = np.searchsorted(self.keys, closing_keys)
+        found = positions < len(self.keys)
+        found[found] = self.keys[positions[found]] == closing_keys[found]
+        closed[valid] = found
+        return closed
+
+    def count_closed(self, draw_centres, samples):
+        closed = 0
+        for start in range(0, samples, self.chunk_size):
+            closed += int(self.closed_wedges(draw_centres(min(self.chunk_size, samples - start))).sum())
+        return closed
+
+    def transitivity(self, samples, confidence=0.95):
+        # centres drawn in proportion to their number of wedges make every
+        # wedge equally likely, the closed fraction is the transitivity
+        total_pairs = self.pairs.sum()
+        if total_pairs == 0:
+            return {'estimate': 0.0, 'error': 0.0, 'interval': (0.0, 0.0), 'samples': 0}
+        cumulative_pairs = np.cumsum(self.pairs)
+
+        def draw_centres(size):
+            return np.searchsorted(cumulative_pairs, self.random.random(size) * total_pairs,
+                                   side='right')
+        estimate, error, interval = wilson_interval(self.count_closed(draw_centres, samples),
+                                                    samples, confidence)
+        return {'estimate': estimate, 'error': error, 'interval': interval, 'samples': samples}
+
+    def average_clustering(self, samples, confidence=0.95):
+        # uniform centres, the closed fraction estimates the average of the
+        # local coefficients over all N nodes (0 below degree 2, as nx does)
+        if self.N == 0:
+            return {'estimate': 0.0, 'error': 0.0, 'interval': (0.0, 0.0), 'samples': 0}
+        closed = self.count_closed(lambda size: self.random.integers(0, self.N, size), samples)
+        estimate, error, interval = wilson_interval(closed, samples, confidence)
+        return {'estimate': estimate, 'error': error, 'interval': interval, 'samples': samples}
+
+    def local_clustering(self, samples, confidence=0.95):
+        # the budget is split evenly over the nodes of degree >= 2, the
+        # coefficient of a node is its closed fraction with a Wilson interval,
+        # nodes of lower degree have the exact coefficient 0
+        coefficients = np.zeros(self.N)
+        intervals = np.zeros((self.N, 2))
+        valid_nodes = np.flatnonzero(self.degrees > 1)
+        if len(valid_nodes) == 0:
+            return {'coefficients': coefficients, 'intervals': intervals, 'samples_per_node': 0}
+        samples_per_node = samples // len(valid_nodes)
+        if samples_per_node == 0:
+            raise ValueError(f'{samples} samples do not give one wedge to each of the '
+                             f'{len(valid_nodes)} nodes of degree >= 2, raise the budget or '
+                             f'estimate only the average coefficient and the transitivity')
+        closed = np.zeros(self.N, dtype=np.int64)
+        nodes_per_chunk = max(self.chunk_size // samples_per_node, 1)
+        for start in range(0, len(valid_nodes), nodes_per_chunk):
+            centres = np.repeat(valid_nodes[start:start + nodes_per_chunk], samples_per_node)
+            closed += np.bincount(centres[self.closed_wedges(centres)], minlength=self.N)
+        coefficients[valid_nodes] = closed[valid_nodes] / samples_per_node
+        lower, upper = wilson_bounds(closed[valid_nodes], samples_per_node, confidence)
+        intervals[valid_nodes, 0] = lower
+        intervals[valid_nodes, 1] = upper
+        return {'coefficients': coefficients, 'intervals': intervals,
+                'samples_per_node': samples_per_node}
@@ -0,0 +1,30 @@
+class UnionFind(object):
+    def __init__(self, N):
+        self.parent = list(range(N))
+        self.size = [1] * N
+        self.largest = 0
+
+    def find(self, node):
+        parent = self.parent
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    def add(self, node):
+        self.parent[node] = node
+        self.size[node] = 1
+        if self.largest < 1:
+            self.largest = 1
+
+    def union(self, node_a, node_b):
+        root_a = self.find(node_a)
+        root_b = self.find(node_b)
+        if root_a == root_b:
+            return
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size[root_b]
+        if self.size[root_a] > self.largest:
+            self.largest = self.size[root_a]
@@ -0,0 +1,49 @@
+import networkx as nx
+import numpy as np
+import pytest
+from GraphAnalyzer import GraphAnalyzer
+
+
+GRAPHS = [lambda: nx.barabasi_albert_graph(200, 3, seed=1),
+          lambda: nx.gnm_random_graph(150, 200, seed=2),
+          lambda: nx.star_graph(20),
+          lambda: nx.empty_graph(10)]
+
+
+def check_adaptive_order(graph, order):
+    # every removed node has the highest degree among the remaining nodes
+    remaining = graph.copy()
+    for node in order:
+        assert remaining.degree(node) == max(degree for _, degree in remaining.degree)
+        remaining.remove_node(node)
+
+
+@pytest.mark.parametrize('make_graph', GRAPHS)
+@pytest.mark.parametrize('backend', ['networkx', 'csr'])
+def test_adaptive_order_removes_the_current_highest_degree(make_graph, backend):
+    graph = make_graph()
+    analyzer = GraphAnalyzer('custom', 'graph', initial_graph=graph.copy(), backend=backend)
+    order = analyzer.adaptive_degree_order()
+    assert sorted(order) == sorted(graph.nodes)
+    check_adaptive_order(graph, order)
+
+
+@pytest.mark.parametrize('number_of_nodes', [0, 1, 15, 500])
+def test_partial_adaptive_order(number_of_nodes):
+    graph = nx.barabasi_albert_graph(100, 2, seed=3)
+    analyzer = GraphAnalyzer('custom', 'BA', initial_graph=graph.copy())
+    order = analyzer.adaptive_degree_order(number_of_nodes=number_of_nodes)
+    assert len(order) == min(number_of_nodes, 100) and len(set(order)) == len(order)
+    check_adaptive_order(graph, order)
+
+
+@pytest.mark.parametrize('backend', ['networkx', 'csr'])
+def test_adaptive_sweep_matches_removal_per_fraction(backend):
+    graph = nx.barabasi_albert_graph(120, 2, seed=4)
+    f_space = np.linspace(0, 1, 11)
+    curve = GraphAnalyzer('custom', 'BA', initial_graph=graph.copy(), backend=backend) \
+        .giant_component_sweep(f_space, centrality='degree_adaptive')
+    for fraction, giant_component in zip(f_space, curve):
+        analyzer = GraphAnalyzer('custom', 'BA', initial_graph=graph.copy(), backend=backend)
+        analyzer.remove_fraction_of_nodes(fraction, centrality='degree_adaptive')
+        assert giant_component == analyzer.calculate_giant_component()
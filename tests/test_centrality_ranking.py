@@ -0,0 +1,35 @@
+import networkx as nx
+import numpy as np
+import pytest
+from GraphAnalyzer import GraphAnalyzer
+
+
+F_SPACE = np.linspace(0, 1, 11)
+
+
+def realization(backend):
+    # integer degrees give many ties, which the ranking must break alike
+    graph = nx.barabasi_albert_graph(100, 2, seed=6)
+    return GraphAnalyzer('custom', 'BA', initial_graph=graph, backend=backend)
+
+
+@pytest.mark.parametrize('backend', ['networkx', 'csr'])
+@pytest.mark.parametrize('centrality', ['degree', 'closeness', 'betweenness'])
+def test_one_ranking_sweep_matches_removal_per_fraction(backend, centrality):
+    # the sweep ranks once, the old path ranked and removed the top nodes anew
+    # for every fraction of the same realization
+    curve = realization(backend).giant_component_sweep(F_SPACE, centrality=centrality)
+    for fraction, giant_component in zip(F_SPACE, curve):
+        analyzer = realization(backend)
+        analyzer.remove_fraction_of_nodes(fraction, centrality=centrality)
+        assert giant_component == analyzer.calculate_giant_component()
+
+
+@pytest.mark.parametrize('number_of_nodes', [None, 0, 1, 7, 40, 100, 400])
+def test_partial_ranking_is_a_prefix_of_the_full_one(number_of_nodes):
+    analyzer = realization('networkx')
+    full = analyzer.calculate_centrality_ranking(nx.degree_centrality)
+    top = analyzer.calculate_centrality_ranking(nx.degree_centrality, number_of_nodes=number_of_nodes)
+    assert list(top) == list(full[:number_of_nodes] if number_of_nodes is not None else full)
+    degrees = dict(analyzer.graph.degree)
+    assert all(degrees[a] >= degrees[b] for a, b in zip(full, full[1:]))
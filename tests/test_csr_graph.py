@@ -0,0 +1,77 @@
+import networkx as nx
+import numpy as np
+import pytest
+from CSRGraph import CSRGraph
+from GraphAnalyzer import GraphAnalyzer
+
+
+def graphs():
+    return [nx.karate_club_graph(),
+            nx.gnm_random_graph(200, 300, seed=1),
+            nx.barabasi_albert_graph(300, 3, seed=2),
+            nx.watts_strogatz_graph(200, 6, 0.2, seed=3),
+            nx.complete_graph(200),
+            nx.empty_graph(5)]
+
+
+@pytest.mark.parametrize('graph', graphs())
+def test_degree_matches_networkx(graph):
+    csr_graph = CSRGraph.from_networkx(graph)
+    assert csr_graph.degree().tolist() == [graph.degree(node) for node in graph.nodes]
+
+
+@pytest.mark.parametrize('graph', graphs())
+def test_connected_components_match_networkx(graph):
+    csr_graph = CSRGraph.from_networkx(graph)
+    labels = csr_graph.connected_components()
+    components = {}
+    for node, label in enumerate(labels.tolist()):
+        components.setdefault(label, set()).add(node)
+    assert sorted(map(sorted, components.values())) == \
+        sorted(map(sorted, nx.connected_components(graph)))
+    expected = max((len(component) for component in nx.connected_components(graph)), default=0)
+    assert csr_graph.giant_component() == expected
+
+
+@pytest.mark.parametrize('graph', graphs())
+def test_clustering_matches_networkx(graph):
+    csr_graph = CSRGraph.from_networkx(graph)
+    expected = nx.clustering(graph)
+    assert np.allclose(csr_graph.clustering(), [expected[node] for node in graph.nodes])
+    triangles = nx.triangles(graph)
+    assert csr_graph.triangles().tolist() == [triangles[node] for node in graph.nodes]
+
+
+def test_removed_nodes_match_networkx_subgraph():
+    graph = nx.barabasi_albert_graph(300, 4, seed=4)
+    removed = list(range(0, 300, 7))
+    csr_graph = CSRGraph.from_networkx(graph)
+    csr_graph.remove_nodes(removed)
+    subgraph = graph.copy()
+    subgraph.remove_nodes_from(removed)
+    degrees = csr_graph.degree()
+    clustering = csr_graph.clustering()
+    expected_clustering = nx.clustering(subgraph)
+    for node in subgraph.nodes:
+        assert degrees[node] == subgraph.degree(node)
+        assert clustering[node] == pytest.approx(expected_clustering[node])
+    assert degrees[removed].sum() == 0
+    expected = max(len(component) for component in nx.connected_components(subgraph))
+    assert csr_graph.giant_component() == expected
+
+
+def test_from_edges_accepts_no_edges():
+    csr_graph = CSRGraph.from_edges(4, np.zeros((0, 2), dtype=np.int32))
+    assert csr_graph.degree().tolist() == [0, 0, 0, 0]
+    assert csr_graph.giant_component() == 1
+
+
+@pytest.mark.parametrize('model_name, model_parameters', [('ER', (200, 300)), ('ERG', (200, 0.015)),
+                                                          ('WS', (200, 6, 0.2)), ('BA', (200, 3)),
+                                                          ('custom', 'given graph')])
+def test_analyzer_takes_a_csr_initial_graph_in_every_model(model_name, model_parameters):
+    graph = nx.gnm_random_graph(200, 300, seed=4)
+    analyzer = GraphAnalyzer(model_name, model_parameters, initial_graph=CSRGraph.from_networkx(graph))
+    assert analyzer.backend == 'csr' and analyzer.graph is None
+    assert analyzer.number_of_edges() == graph.number_of_edges()
+    assert analyzer.calculate_giant_component() == len(max(nx.connected_components(graph), key=len))
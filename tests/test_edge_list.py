@@ -0,0 +1,112 @@
+import gzip
+import networkx as nx
+import numpy as np
+import pytest
+from CommonFunctions import load_edge_list, relabel_nodes
+
+
+EDGE_TEXT = '''# a comment line
+1 2
+2 3  # a trailing comment
+3 1
+% another comment style
+4 5
+5 5
+2 1
+10 4
+
+7 10
+'''
+
+
+def write(tmp_path, text, name='edges.txt'):
+    path = tmp_path / name
+    if name.endswith('.gz'):
+        with gzip.open(path, 'wb') as file:
+            file.write(text.encode())
+    else:
+        path.write_bytes(text.encode())
+    return str(path)
+
+
+def reference_graph(text, comments='#'):
+    # nx.read_edgelist with one comment character and without self-loops
+    lines = [line.split('%')[0] for line in text.splitlines()]
+    graph = nx.parse_edgelist(lines, comments=comments, nodetype=int,
+                              data=[('weight', float)] if text.count(' ') > 2 * len(lines) else False)
+    graph.remove_edges_from(list(nx.selfloop_edges(graph)))
+    return graph
+
+
+def loaded_links(edges, labels):
+    return {frozenset(pair) for pair in labels[edges].tolist()}
+
+
+def reference_links(graph):
+    return {frozenset(pair) for pair in graph.edges()}
+
+
+@pytest.mark.parametrize('name', ['edges.txt', 'edges.txt.gz'])
+@pytest.mark.parametrize('chunk_bytes', [2 ** 26, 1, 5, 17])
+def test_edges_match_networkx(tmp_path, name, chunk_bytes):
+    edges, labels = load_edge_list(write(tmp_path, EDGE_TEXT, name), chunk_bytes=chunk_bytes)
+    graph = reference_graph(EDGE_TEXT)
+    assert loaded_links(edges, labels) == reference_links(graph)
+    # self-loops and repeated links are dropped, ids are contiguous
+    assert len(edges) == graph.number_of_edges()
+    assert edges.dtype == np.int32 and edges.min() == 0 and edges.max() == len(labels) - 1
+    assert sorted(labels.tolist()) == sorted(set(labels.tolist()) | {5})
+
+
+def test_crlf_line_breaks(tmp_path):
+    text = EDGE_TEXT.replace('\n', '\r\n')
+    edges, labels = load_edge_list(write(tmp_path, text), chunk_bytes=9)
+    assert loaded_links(edges, labels) == reference_links(reference_graph(EDGE_TEXT))
+
+
+@pytest.mark.parametrize('chunk_bytes', [2 ** 26, 4, 11])
+def test_weighted_edges_match_networkx(tmp_path, chunk_bytes):
+    text = '# weighted\n1 2 0.5\n2 3 1.5 # trailing\n3 4 2\r\n9 1 -1e-3\n'
+    edges, labels, weights = load_edge_list(write(tmp_path, text), weighted=True,
+                                            chunk_bytes=chunk_bytes)
+    graph = nx.parse_edgelist([line.strip() for line in text.splitlines()], nodetype=int,
+                              data=[('weight', float)])
+    loaded = {frozenset(pair): weight for pair, weight in zip(labels[edges].tolist(), weights)}
+    assert loaded == {frozenset((u, v)): weight for u, v, weight in graph.edges(data='weight')}
+
+
+def test_weighted_repeated_links_keep_the_first_weight(tmp_path):
+    text = '1 2 0.5\n2 1 3.0\n2 2 1.0\n2 3 2.0\n'
+    edges, labels, weights = load_edge_list(write(tmp_path, text), weighted=True)
+    assert labels[edges].tolist() == [[1, 2], [2, 3]]
+    assert weights.tolist() == [0.5, 2.0]
+
+
+def test_weighted_ids_stay_exact_above_float_precision(tmp_path):
+    big = 2 ** 60 + 1
+    edges, labels, _ = load_edge_list(write(tmp_path, f'{big} {big + 2} 1.0\n'), weighted=True)
+    assert sorted(labels.tolist()) == [big, big + 2]
+
+
+@pytest.mark.parametrize('text, weighted', [('1 2\n3\n4 5\n', False),
+                                            ('1 2\n3 4 5\n', False),
+                                            ('1 2 1.0\n3 4\n', True)])
+@pytest.mark.parametrize('chunk_bytes', [2 ** 26, 3])
+def test_ragged_rows_raise(tmp_path, text, weighted, chunk_bytes):
+    with pytest.raises(ValueError):
+        load_edge_list(write(tmp_path, text), weighted=weighted, chunk_bytes=chunk_bytes)
+
+
+def test_empty_and_comment_only_files(tmp_path):
+    for text in ('', '# nothing\n% here\n'):
+        edges, labels = load_edge_list(write(tmp_path, text))
+        assert edges.shape == (0, 2) and len(labels) == 0
+
+
+@pytest.mark.parametrize('spacing', [1, 10 ** 12])
+def test_relabel_nodes_dense_and_sparse_ids(spacing):
+    # dense ids use a lookup table, sparse ones a sort
+    original = np.array([[3, 7], [7, 11], [3, 11], [19, 3]], dtype=np.int64) * spacing
+    edges, labels = relabel_nodes(original)
+    assert labels.tolist() == sorted(set(original.ravel().tolist()))
+    assert np.array_equal(labels[edges], original)
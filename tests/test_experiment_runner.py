@@ -0,0 +1,55 @@
+import os
+import numpy as np
+from time import time
+from ExperimentRunner import ExperimentRunner
+from ResultStore import ResultStore, result_store_path, STRATEGY_PREFIXES
+
+
+def config(results_path):
+    return {'results_path': str(results_path), 'f_space': [0, 1, 11],
+            'experiments': [{'type': 'ERG', 'N': 60, 'degrees': [2], 'samples': 8, 'seed': 4,
+                             'strategies': ['random', 'degree']}]}
+
+
+def test_degree_time_is_wall_time(tmp_path):
+    runner = ExperimentRunner(config(tmp_path), jobs=2, use_cache=False)
+    start = time()
+    data_dicts = runner.run()[0]
+    elapsed = time() - start
+    for strategy in ('random', 'degree'):
+        curve, delta = data_dicts[strategy]['degrees']['2']
+        assert len(curve) == 11
+        # shared by the strategies and not summed over workers
+        assert delta <= round(elapsed)
+        store = ResultStore(result_store_path(STRATEGY_PREFIXES[strategy], 'ERG', 60, 8, 2,
+                                              sub_dir=str(tmp_path)))
+        assert store.number_of_samples() == 8
+        assert store.wall_time() <= elapsed
+        assert np.allclose(store.mean_curve(), curve)
+
+
+def test_results_go_where_the_plotting_scripts_read_them(tmp_path):
+    runner = ExperimentRunner({'experiments': []})
+    repository = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    assert runner.results_path('random') == os.path.join(repository, 'GiantComponent', 'results')
+    assert runner.results_path('betweenness_approx') == \
+        os.path.join(repository, 'BetweennessCentrality', 'results')
+    runner = ExperimentRunner({'experiments': [], 'results_path': {'degree': str(tmp_path)}})
+    assert runner.results_path('degree') == str(tmp_path)
+    assert runner.results_path('closeness') == os.path.join(repository, 'ClosenessCentrality', 'results')
+    assert runner.cache('degree').cache_dir == os.path.join(str(tmp_path), 'cache')
+
+
+def test_cached_strategies_are_read_back(tmp_path):
+    first = ExperimentRunner(config(tmp_path)).run()[0]
+    second = ExperimentRunner(config(tmp_path)).run()[0]
+    for strategy in ('random', 'degree'):
+        assert np.allclose(first[strategy]['degrees']['2'][0], second[strategy]['degrees']['2'][0])
+
+
+def test_seeded_experiment_does_not_depend_on_jobs(tmp_path):
+    curves = []
+    for jobs in (1, 3):
+        data_dicts = ExperimentRunner(config(tmp_path / str(jobs)), jobs=jobs, use_cache=False).run()[0]
+        curves.append([data_dicts[strategy]['degrees']['2'][0] for strategy in ('random', 'degree')])
+    assert np.array_equal(curves[0], curves[1])
@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+from GraphGenerators import (barabasi_albert_edges, watts_strogatz_edges, gnp_edges, gnm_edges,
+                             pair_index_to_edges)
+
+
+def link_keys(N, edges):
+    edges = np.sort(np.asarray(edges, dtype=np.int64), axis=1)
+    return edges[:, 0] * N + edges[:, 1]
+
+
+@pytest.mark.parametrize('N, m', [(10, 1), (50, 3), (200, 5), (1000, 10), (30, 29)])
+@pytest.mark.parametrize('seed', range(5))
+def test_barabasi_albert_edges_invariants(N, m, seed):
+    np.random.seed(seed)
+    edges = barabasi_albert_edges(N, m)
+    # a star of m + 1 nodes, then m links for every further node
+    assert len(edges) == m * (N - m)
+    assert np.all(edges[:, 0] != edges[:, 1])
+    assert len(np.unique(link_keys(N, edges))) == len(edges)
+    new_nodes = edges.max(axis=1)
+    older_nodes = edges.min(axis=1)
+    for node in range(m + 1, N):
+        targets = older_nodes[new_nodes == node]
+        assert len(targets) == m
+        assert len(np.unique(targets)) == m
+        assert np.all(targets < node)
+
+
+@pytest.mark.parametrize('N, k, p', [(20, 18, 1.0), (7, 6, 1.0), (10, 8, 0.5), (30, 28, 0.5),
+                                     (100, 4, 0.0), (100, 10, 0.3), (500, 6, 1.0)])
+@pytest.mark.parametrize('seed', range(20))
+def test_watts_strogatz_edges_invariants(N, k, p, seed):
+    np.random.seed(seed)
+    edges = watts_strogatz_edges(N, k, p)
+    assert len(edges) == N * (k // 2)
+    assert np.all(edges[:, 0] != edges[:, 1])
+    assert np.all((edges >= 0) & (edges < N))
+    assert len(np.unique(link_keys(N, edges))) == len(edges)
+
+
+def test_watts_strogatz_edges_without_rewiring_is_the_ring_lattice():
+    N, k = 50, 6
+    edges = watts_strogatz_edges(N, k, 0.0)
+    sources = np.tile(np.arange(N), k // 2)
+    targets = (sources + np.repeat(np.arange(1, k // 2 + 1), N)) % N
+    assert np.array_equal(np.sort(link_keys(N, edges)),
+                          np.sort(link_keys(N, np.column_stack((sources, targets)))))
+
+
+def test_pair_index_to_edges_enumerates_every_pair_once():
+    N = 300
+    number_of_pairs = N * (N - 1) // 2
+    edges = pair_index_to_edges(np.arange(number_of_pairs))
+    assert np.all(edges[:, 0] < edges[:, 1])
+    assert np.all(edges[:, 1] < N)
+    assert len(np.unique(link_keys(N, edges))) == number_of_pairs
+
+
+@pytest.mark.parametrize('N, p', [(10, 0.5), (100, 0.01), (500, 0.02), (2000, 0.001), (50, 0.9)])
+@pytest.mark.parametrize('seed', range(5))
+def test_gnp_edges_invariants(N, p, seed):
+    np.random.seed(seed)
+    edges = gnp_edges(N, p)
+    number_of_pairs = N * (N - 1) // 2
+    assert np.all(edges[:, 0] < edges[:, 1])
+    assert np.all((edges >= 0) & (edges < N))
+    assert len(np.unique(link_keys(N, edges))) == len(edges)
+    # binomial number of links, 5 standard deviations around the mean
+    expected = p * number_of_pairs
+    assert abs(len(edges) - expected) <= 5 * np.sqrt(expected * (1 - p)) + 1
+
+
+def test_gnp_edges_is_uniform_over_pairs():
+    N, p, runs = 20, 0.3, 2000
+    np.random.seed(0)
+    counts = np.zeros(N * (N - 1) // 2)
+    for _ in range(runs):
+        edges = gnp_edges(N, p).astype(np.int64)
+        counts[edges[:, 1] * (edges[:, 1] - 1) // 2 + edges[:, 0]] += 1
+    assert np.all(np.abs(counts / runs - p) < 5 * np.sqrt(p * (1 - p) / runs))
+
+
+def test_gnp_edges_limits():
+    assert len(gnp_edges(100, 0.0)) == 0
+    assert len(gnp_edges(1, 0.5)) == 0
+    edges = gnp_edges(30, 1.0)
+    assert len(edges) == 30 * 29 // 2
+    assert len(np.unique(link_keys(30, edges))) == len(edges)
+
+
+@pytest.mark.parametrize('N, L', [(10, 5), (10, 40), (100, 250), (1000, 5000), (50, 1225)])
+@pytest.mark.parametrize('seed', range(5))
+def test_gnm_edges_invariants(N, L, seed):
+    np.random.seed(seed)
+    edges = gnm_edges(N, L)
+    assert len(edges) == L
+    assert np.all(edges[:, 0] < edges[:, 1])
+    assert np.all((edges >= 0) & (edges < N))
+    assert len(np.unique(link_keys(N, edges))) == L
+
+
+def test_gnm_edges_caps_at_the_number_of_pairs():
+    assert len(gnm_edges(10, 100)) == 45
+    assert len(gnm_edges(10, 0)) == 0
@@ -0,0 +1,42 @@
+import networkx as nx
+import numpy as np
+import pytest
+from GraphAnalyzer import GraphAnalyzer
+
+
+def brute_force_curve(graph, removal_order):
+    # giant component after removing the first len(order) - n nodes, for every n
+    number_of_nodes = len(removal_order)
+    curve = np.zeros(number_of_nodes + 1, dtype=int)
+    for present in range(1, number_of_nodes + 1):
+        subgraph = graph.subgraph(removal_order[number_of_nodes - present:])
+        curve[present] = max(len(component) for component in nx.connected_components(subgraph))
+    return curve
+
+
+@pytest.mark.parametrize('backend', ['networkx', 'csr'])
+@pytest.mark.parametrize('graph_type, model_parameters', [('ER', (60, 70)), ('BA', (60, 2)),
+                                                          ('WS', (60, 4, 0.2))])
+def test_giant_component_curve_matches_brute_force(backend, graph_type, model_parameters):
+    np.random.seed(0)
+    analyzer = GraphAnalyzer(graph_type, model_parameters, backend=backend)
+    graph = analyzer.networkx_graph(use_labels=False)
+    removal_order = analyzer.node_removal_order('random')
+    curve = analyzer.giant_component_curve(removal_order)
+    assert np.array_equal(curve, brute_force_curve(graph, removal_order))
+
+
+@pytest.mark.parametrize('backend', ['networkx', 'csr'])
+def test_giant_component_sweep_matches_node_removal(backend):
+    np.random.seed(1)
+    analyzer = GraphAnalyzer('ER', (80, 100), backend=backend)
+    graph = analyzer.networkx_graph(use_labels=False)
+    f_space = np.linspace(0, 1, 11)
+    np.random.seed(2)
+    components = analyzer.giant_component_sweep(f_space)
+    np.random.seed(2)
+    removal_order = analyzer.node_removal_order('random')
+    for fraction, component in zip(f_space, components):
+        remaining = graph.subgraph(removal_order[int(round(80 * fraction)):])
+        expected = max((len(c) for c in nx.connected_components(remaining)), default=0)
+        assert component == expected
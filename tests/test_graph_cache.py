@@ -0,0 +1,70 @@
+import os
+import numpy as np
+from CSRGraph import CSRGraph
+from GraphCache import GraphCache
+
+
+EDGE_TEXT = '''# a comment line
+1 2
+2 3
+3 1
+4 5
+10 4
+7 10
+'''
+
+
+def write(path, text):
+    path.write_text(text)
+    return str(path)
+
+
+def assert_same_graph(graph, reference):
+    assert graph.N == reference.N
+    for name in ('indptr', 'indices', 'rows', 'labels'):
+        assert np.array_equal(getattr(graph, name), getattr(reference, name))
+
+
+def test_load_matches_the_edge_list_and_is_memory_mapped(tmp_path):
+    path = write(tmp_path / 'graph.txt', EDGE_TEXT)
+    cache = GraphCache(str(tmp_path / 'cache'))
+    assert not cache.is_cached(path)
+    graph = cache.load(path)
+    assert cache.is_cached(path)
+    assert_same_graph(graph, CSRGraph.from_edge_list(path))
+    assert isinstance(graph.indices, np.memmap)
+    assert not graph.indices.flags.writeable
+    assert graph.number_of_nodes() == 7
+    assert_same_graph(cache.load(path), graph)
+
+
+def test_changed_file_gets_a_new_entry(tmp_path):
+    path = write(tmp_path / 'graph.txt', EDGE_TEXT)
+    cache = GraphCache(str(tmp_path / 'cache'))
+    first_entry = cache.entry_path(path)
+    cache.load(path)
+    write(tmp_path / 'graph.txt', EDGE_TEXT + '5 7\n')
+    assert cache.entry_path(path) != first_entry
+    assert not cache.is_cached(path)
+    assert_same_graph(cache.load(path), CSRGraph.from_edge_list(path))
+    assert len(os.listdir(tmp_path / 'cache')) == 2
+
+
+def test_content_hash_ignores_modification_time(tmp_path):
+    path = write(tmp_path / 'graph.txt', EDGE_TEXT)
+    cache = GraphCache(str(tmp_path / 'cache'), use_content_hash=True)
+    key = cache.cache_key(path)
+    os.utime(path, ns=(0, 0))
+    assert cache.cache_key(path) == key
+    assert GraphCache(str(tmp_path / 'cache')).cache_key(path) != key
+    write(tmp_path / 'graph.txt', EDGE_TEXT.replace('7 10', '7 9'))
+    assert cache.cache_key(path) != key
+
+
+def test_storing_an_existing_entry_keeps_it(tmp_path):
+    path = write(tmp_path / 'graph.txt', EDGE_TEXT)
+    cache = GraphCache(str(tmp_path / 'cache'))
+    graph = cache.load(path)
+    cache.store(path, CSRGraph.from_edge_list(path))
+    assert os.listdir(tmp_path / 'cache') == [os.path.basename(cache.entry_path(path))]
+    assert_same_graph(cache.open(path), graph)
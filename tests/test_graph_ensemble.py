@@ -0,0 +1,94 @@
+import networkx as nx
+import numpy as np
+import pytest
+from GraphEnsemble import GraphEnsemble, EnsembleBatch, gnp_ensemble_edges
+from GraphAnalyzer import GraphAnalyzer
+from SweepRunner import SweepRunner
+from CommonFunctions import seed_generators, sample_seed
+
+
+F_SPACE = np.linspace(0, 1, 51)
+MODELS = [('ER', (200, 300)), ('ERG', (200, 0.015)), ('BA', (200, 2)), ('WS', (200, 4, 0.1))]
+
+
+def analyzer_curves(model, model_parameters, samples, seed, f_space=F_SPACE, backend='csr'):
+    curves = []
+    for sample in range(samples):
+        seed_generators(sample_seed(seed, sample))
+        graph = GraphAnalyzer(model, model_parameters, backend=backend, generator='numpy')
+        curves.append(graph.giant_component_sweep(f_space))
+    return np.array(curves)
+
+
+@pytest.mark.parametrize('model, model_parameters', MODELS)
+def test_batched_sweep_matches_per_sample_analyzer(model, model_parameters):
+    # batches of 3 leave a shorter last batch
+    ensemble = GraphEnsemble(model, model_parameters, 7, batch_size=3)
+    curves = ensemble.giant_component_curves(F_SPACE, seed=11)
+    assert np.array_equal(curves, analyzer_curves(model, model_parameters, 7, 11))
+
+
+def test_batched_sweep_matches_networkx_backend_for_any_fractions():
+    f_space = np.array([0.9, 0.0, 0.5, 1.0, 0.5, 0.25])
+    ensemble = GraphEnsemble('ERG', (150, 0.02), 4, batch_size=4)
+    curves = ensemble.giant_component_curves(f_space, seed=3)
+    expected = analyzer_curves('ERG', (150, 0.02), 4, 3, f_space=f_space, backend='networkx')
+    assert np.array_equal(curves, expected)
+
+
+def test_batch_sweep_with_given_removal_orders():
+    graphs = [nx.gnm_random_graph(60, 70, seed=seed) for seed in range(5)]
+    edges = np.concatenate([np.array(graph.edges()) + index * 60 for index, graph in enumerate(graphs)])
+    batch = EnsembleBatch(60, 5, edges)
+    removal_orders = np.array([np.random.permutation(60) for _ in graphs])
+    components = batch.giant_component_sweep(F_SPACE, removal_orders)
+    for graph, removal_order, curve in zip(graphs, removal_orders, components):
+        for fraction, giant_component in zip(F_SPACE, curve):
+            remaining = graph.subgraph(removal_order[int(round(60 * fraction)):].tolist())
+            expected = max((len(nodes) for nodes in nx.connected_components(remaining)), default=0)
+            assert giant_component == expected
+
+
+def test_sweep_runner_ensemble_batch_gives_the_same_curve():
+    options = {'backend': 'csr', 'generator': 'numpy'}
+    curves = [SweepRunner('BA', F_SPACE, 9, jobs=1, seed=5, analyzer_options=options,
+                          ensemble_batch=ensemble_batch).run((200, 2))
+              for ensemble_batch in (None, 4)]
+    assert np.array_equal(curves[0], curves[1])
+    with pytest.raises(ValueError):
+        SweepRunner('BA', F_SPACE, 9, ensemble_batch=4)
+    with pytest.raises(ValueError):
+        SweepRunner('ERG', F_SPACE, 9, centrality='degree', ensemble_batch=4)
+
+
+def test_gnp_ensemble_edges_stay_inside_their_samples():
+    N, samples = 50, 20
+    edges = gnp_ensemble_edges(N, 0.1, samples)
+    assert edges.dtype == np.int64
+    assert np.all(edges[:, 0] // N == edges[:, 1] // N)
+    assert np.all(edges[:, 0] < edges[:, 1])
+    assert len(np.unique(edges, axis=0)) == len(edges)
+    expected = 0.1 * samples * N * (N - 1) / 2
+    assert abs(len(edges) - expected) < 5 * np.sqrt(expected)
+
+
+def test_giant_components_and_degrees_per_sample():
+    ensemble = GraphEnsemble('ER', (80, 60), 6, batch_size=6)
+    batch, _ = ensemble.sample_batch(6, seed=2)
+    graphs = [nx.Graph() for _ in range(6)]
+    for graph in graphs:
+        graph.add_nodes_from(range(80))
+    for u, v in batch.csr_graph.edge_array().tolist():
+        graphs[u // 80].add_edge(u % 80, v % 80)
+    assert batch.giant_components().tolist() == \
+        [max(len(nodes) for nodes in nx.connected_components(graph)) for graph in graphs]
+    histograms = batch.degree_histograms()
+    for graph, histogram in zip(graphs, histograms):
+        expected = nx.degree_histogram(graph)
+        assert histogram[:len(expected)].tolist() == expected
+    assert np.allclose(batch.average_degrees(), [2 * 60 / 80] * 6)
+
+
+def test_batch_too_large_for_int32_indices():
+    with pytest.raises(ValueError):
+        EnsembleBatch(2 ** 20, 2 ** 12, np.zeros((0, 2), dtype=np.int64))
@@ -0,0 +1,88 @@
+import networkx as nx
+import numpy as np
+import pytest
+from GraphAnalyzer import GraphAnalyzer
+
+
+BACKENDS = ('networkx', 'csr')
+
+
+@pytest.fixture(scope='module')
+def graph():
+    graph = nx.powerlaw_cluster_graph(400, 3, 0.4, seed=1)
+    graph.add_nodes_from(range(400, 410))
+    return graph
+
+
+def reference_degree_histogram(graph, histogram=None, average_degree=0):
+    # the dict loop the vectorized version replaced
+    histogram = dict(histogram or {})
+    for _, degree in graph.degree():
+        average_degree += degree
+        histogram[degree] = histogram.get(degree, 0) + 1
+    return histogram, average_degree / graph.number_of_nodes()
+
+
+def reference_coefficient_histogram(graph, histogram=None):
+    histogram = dict(histogram or {})
+    for coefficient in nx.clustering(graph).values():
+        coefficient = round(coefficient, 3)
+        histogram[coefficient] = histogram.get(coefficient, 0) + 1
+    return histogram
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_degree_histogram_matches_networkx(graph, backend):
+    analyzer = GraphAnalyzer('custom', 'graph', initial_graph=graph.copy(), backend=backend)
+    counts = analyzer.average_degree_and_histogram()
+    assert counts.tolist() == nx.degree_histogram(graph)
+    histogram, average_degree = reference_degree_histogram(graph)
+    assert analyzer.degree_histogram == histogram
+    assert analyzer.average_degree == pytest.approx(average_degree)
+    assert 0 in analyzer.degree_histogram
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_degree_histogram_accumulates(graph, backend):
+    analyzer = GraphAnalyzer('custom', 'graph', initial_graph=graph.copy(), backend=backend)
+    analyzer.average_degree_and_histogram()
+    analyzer.average_degree_and_histogram(clear=False)
+    histogram, average_degree = reference_degree_histogram(graph)
+    histogram, average_degree = reference_degree_histogram(graph, histogram, average_degree)
+    assert analyzer.degree_histogram == histogram
+    assert analyzer.average_degree == pytest.approx(average_degree)
+    # a histogram of fewer degrees is padded to the accumulated one
+    analyzer.remove_fraction_of_nodes(0.5, centrality='degree')
+    analyzer.graph_degree_list()
+    analyzer.average_degree_and_histogram(clear=False)
+    remaining = analyzer.networkx_graph()
+    for degree, count in reference_degree_histogram(remaining)[0].items():
+        histogram[degree] = histogram.get(degree, 0) + count
+    assert analyzer.degree_histogram == histogram
+    assert analyzer.degree_counts.sum() == 2 * graph.number_of_nodes() + remaining.number_of_nodes()
+    assert analyzer.average_degree_and_histogram().tolist() == nx.degree_histogram(remaining)
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_coefficient_histogram_matches_networkx(graph, backend):
+    analyzer = GraphAnalyzer('custom', 'graph', initial_graph=graph.copy(), backend=backend)
+    values, counts = analyzer.calculate_coefficient_histogram()
+    histogram = reference_coefficient_histogram(graph)
+    assert analyzer.coefficient_histogram == pytest.approx(histogram)
+    assert values.tolist() == sorted(values.tolist())
+    assert counts.sum() == graph.number_of_nodes()
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_coefficient_histogram_accumulates(graph, backend):
+    analyzer = GraphAnalyzer('custom', 'graph', initial_graph=graph.copy(), backend=backend)
+    analyzer.calculate_coefficient_histogram()
+    analyzer.remove_fraction_of_nodes(0.3, centrality='random')
+    analyzer.calculate_clustering_coefficients()
+    analyzer.calculate_coefficient_histogram(clear=False)
+    histogram = reference_coefficient_histogram(graph)
+    histogram = reference_coefficient_histogram(analyzer.networkx_graph(), histogram)
+    assert set(analyzer.coefficient_histogram) == set(histogram)
+    for coefficient, count in histogram.items():
+        assert analyzer.coefficient_histogram[coefficient] == count
+    assert analyzer.coefficient_counts.dtype == np.int64
@@ -0,0 +1,72 @@
+import networkx as nx
+import numpy as np
+import pytest
+from HyperANF import HyperANF, approximate_closeness_centrality, edge_array_from_graph
+from GraphAnalyzer import GraphAnalyzer
+
+
+PRECISION = 10
+# HyperLogLog counters have a relative standard error of 1.04 / sqrt(2^precision)
+BOUND = 4 * 1.04 / np.sqrt(2 ** PRECISION)
+
+
+@pytest.fixture(scope='module')
+def graph():
+    graph = nx.disjoint_union(nx.watts_strogatz_graph(600, 6, 0.05, seed=1),
+                              nx.barabasi_albert_graph(300, 2, seed=2))
+    graph.add_nodes_from(range(900, 905))
+    return graph
+
+
+def run(graph, **kwargs):
+    nodes, edges = edge_array_from_graph(graph)
+    hyper_anf = HyperANF(len(nodes), edges, **kwargs)
+    hyper_anf.run()
+    return hyper_anf
+
+
+def exact_distribution(graph):
+    distribution = {}
+    for _, lengths in nx.all_pairs_shortest_path_length(graph):
+        for length in lengths.values():
+            if length > 0:
+                distribution[length] = distribution.get(length, 0) + 0.5
+    return distribution
+
+
+def test_neighbourhood_function_within_bound(graph):
+    hyper_anf = run(graph, precision=PRECISION)
+    exact = exact_distribution(graph)
+    exact_pairs = graph.number_of_nodes() + 2 * sum(exact.values())
+    assert hyper_anf.neighbourhood_function[0] == pytest.approx(graph.number_of_nodes(), rel=BOUND)
+    assert hyper_anf.neighbourhood_function[-1] == pytest.approx(exact_pairs, rel=BOUND)
+    # registers stop changing at the latest after the largest distance
+    assert len(hyper_anf.neighbourhood_function) - 1 <= max(exact)
+    exact_average = sum(length * count for length, count in exact.items()) / sum(exact.values())
+    assert hyper_anf.average_path() == pytest.approx(exact_average, rel=BOUND)
+
+
+def test_closeness_within_bound(graph):
+    estimate = approximate_closeness_centrality(graph, precision=PRECISION)
+    exact = nx.closeness_centrality(graph)
+    errors = [abs(estimate[node] - exact[node]) / exact[node] for node in graph if exact[node] > 0]
+    assert np.mean(errors) < BOUND
+    assert all(estimate[node] == 0 for node in range(900, 905))
+
+
+def test_chunking_does_not_change_the_result(graph):
+    whole = run(graph, precision=6, seed=3)
+    chunked = run(graph, precision=6, seed=3, chunk_size=7)
+    assert whole.neighbourhood_function == chunked.neighbourhood_function
+    assert np.array_equal(whole.closeness(), chunked.closeness())
+    assert run(graph, precision=6, seed=4).neighbourhood_function != whole.neighbourhood_function
+
+
+def test_analyzer_distance_distribution_on_both_backends(graph):
+    histograms = []
+    for backend in ('networkx', 'csr'):
+        analyzer = GraphAnalyzer('custom', 'graph', initial_graph=graph.copy(), backend=backend)
+        analyzer.estimate_distance_distribution(precision=PRECISION, seed=5)
+        histograms.append(analyzer.path_histogram)
+    assert histograms[0] == histograms[1]
+    assert max(histograms[0]) <= max(exact_distribution(graph))
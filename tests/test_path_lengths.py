@@ -0,0 +1,87 @@
+import networkx as nx
+import numpy as np
+import pytest
+from collections import Counter
+from GraphAnalyzer import GraphAnalyzer
+
+
+def reference_histogram(graph):
+    # every unordered pair of connected nodes once
+    counts = Counter()
+    for _, lengths in nx.all_pairs_shortest_path_length(graph):
+        counts.update(length for length in lengths.values() if length > 0)
+    return {length: count // 2 for length, count in counts.items()}
+
+
+def two_components():
+    graph = nx.disjoint_union(nx.gnm_random_graph(80, 120, seed=1), nx.path_graph(15))
+    graph.add_node(200)
+    return graph
+
+
+GRAPHS = [lambda: nx.gnm_random_graph(150, 300, seed=2), two_components]
+
+
+@pytest.mark.parametrize('make_graph', GRAPHS)
+@pytest.mark.parametrize('backend', ['networkx', 'csr'])
+@pytest.mark.parametrize('jobs', [1, 3, 0])
+def test_path_histogram_matches_networkx(make_graph, backend, jobs):
+    graph = make_graph()
+    analyzer = GraphAnalyzer('custom', 'graph', initial_graph=graph, backend=backend)
+    analyzer.calculate_path_histogram(jobs=jobs)
+    assert analyzer.path_histogram == reference_histogram(graph)
+
+
+def test_path_histogram_accumulates_without_clear():
+    graph = nx.gnm_random_graph(60, 100, seed=3)
+    analyzer = GraphAnalyzer('custom', 'graph', initial_graph=graph)
+    analyzer.calculate_path_histogram()
+    analyzer.calculate_path_histogram(clear=False)
+    assert analyzer.path_histogram == {length: 2 * count
+                                       for length, count in reference_histogram(graph).items()}
+
+
+def test_average_path_and_diameter_from_histogram():
+    graph = nx.gnm_random_graph(100, 250, seed=4)
+    analyzer = GraphAnalyzer('custom', 'graph', initial_graph=graph)
+    analyzer.calculate_path_histogram()
+    analyzer.calculate_diameter_from_histogram()
+    analyzer.calculate_average_path_from_histogram()
+    assert analyzer.diameter == nx.diameter(graph)
+    assert analyzer.average_path == round(nx.average_shortest_path_length(graph), 3)
+
+
+@pytest.mark.parametrize('backend', ['networkx', 'csr'])
+def test_estimate_from_every_source_is_exact(backend):
+    graph = two_components()
+    analyzer = GraphAnalyzer('custom', 'graph', initial_graph=graph, backend=backend)
+    analyzer.estimate_path_histogram(number_of_sources=graph.number_of_nodes())
+    assert analyzer.path_histogram == reference_histogram(graph)
+    assert analyzer.average_path_error == 0
+
+
+def test_sampled_average_path_error_covers_the_exact_value():
+    graph = nx.watts_strogatz_graph(400, 4, 0.05, seed=5)
+    exact = nx.average_shortest_path_length(graph)
+    covered = []
+    for seed in range(100):
+        np.random.seed(seed)
+        analyzer = GraphAnalyzer('custom', 'WS', initial_graph=graph)
+        analyzer.estimate_path_histogram(number_of_sources=30)
+        assert analyzer.path_sources == 30
+        covered.append(abs(analyzer.average_path - exact) <= 2 * analyzer.average_path_error + 0.001)
+    # two standard errors cover about 95%
+    assert np.mean(covered) >= 0.85
+
+
+def test_estimate_stops_at_the_relative_error():
+    graph = nx.gnm_random_graph(1000, 3000, seed=6)
+    analyzer = GraphAnalyzer('custom', 'graph', initial_graph=graph)
+    np.random.seed(0)
+    analyzer.estimate_path_histogram(relative_error=0.01)
+    assert 1 < analyzer.path_sources < 1000
+    assert analyzer.average_path_error <= 0.01 * analyzer.average_path + 0.001
+    # the average over connected pairs, a few nodes are isolated
+    histogram = reference_histogram(graph)
+    exact = sum(length * count for length, count in histogram.items()) / sum(histogram.values())
+    assert abs(analyzer.average_path - exact) < 4 * analyzer.average_path_error + 0.001
@@ -0,0 +1,66 @@
+import networkx as nx
+import numpy as np
+import pytest
+import GraphAnalyzer as graph_analyzer
+from GraphAnalyzer import approximate_betweenness_centrality
+
+
+@pytest.fixture(scope='module')
+def graph():
+    return nx.barabasi_albert_graph(120, 2, seed=1)
+
+
+@pytest.fixture(scope='module')
+def exact(graph):
+    return nx.betweenness_centrality(graph)
+
+
+def recorded_sources(monkeypatch):
+    batches = []
+    subset = nx.betweenness_centrality_subset
+
+    def recording_subset(graph, sources, targets, normalized=False):
+        batches.append(list(sources))
+        return subset(graph, sources, targets, normalized=normalized)
+    monkeypatch.setattr(graph_analyzer.nx, 'betweenness_centrality_subset', recording_subset)
+    return batches
+
+
+def test_every_node_as_pivot_is_exact(graph, exact):
+    estimate = approximate_betweenness_centrality(graph, pivots=graph.number_of_nodes())
+    assert estimate == pytest.approx(exact)
+
+
+def test_pivot_estimate_is_unbiased(graph, exact):
+    np.random.seed(0)
+    runs = 300
+    mean = dict.fromkeys(graph, 0.0)
+    for _ in range(runs):
+        for node, score in approximate_betweenness_centrality(graph, pivots=12).items():
+            mean[node] += score / runs
+    top = sorted(exact, key=exact.get, reverse=True)[:10]
+    for node in top:
+        assert mean[node] == pytest.approx(exact[node], rel=0.1)
+
+
+def test_pivots_come_from_one_permutation(graph, monkeypatch):
+    batches = recorded_sources(monkeypatch)
+    approximate_betweenness_centrality(graph, pivots=8, rank_stability=1.0)
+    sources = [source for batch in batches for source in batch]
+    assert len(sources) == len(set(sources))
+    # the number of pivots doubles until the top ranks stop changing
+    assert [len(batch) for batch in batches[:4]] == [8, 8, 16, 32]
+
+
+def test_stable_ranks_stop_early(monkeypatch):
+    batches = recorded_sources(monkeypatch)
+    graph = nx.star_graph(300)
+    estimate = approximate_betweenness_centrality(graph, pivots=16, rank_stability=0.5,
+                                                  top_fraction=0.01)
+    assert sum(len(batch) for batch in batches) < graph.number_of_nodes()
+    assert max(estimate, key=estimate.get) == 0
+    assert estimate[0] == pytest.approx(1.0)
+
+
+def test_small_graphs_get_zeros():
+    assert approximate_betweenness_centrality(nx.path_graph(2)) == {0: 0.0, 1: 0.0}
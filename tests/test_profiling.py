@@ -0,0 +1,26 @@
+import os
+import pytest
+import Profiling
+from Profiling import profile_call, PROFILE_ENV, PROFILE_DIR_ENV
+
+
+def busy_work():
+    return sum(value * value for value in range(200000))
+
+
+@pytest.mark.parametrize('mode, extensions', [('cprofile', {'.prof', '.txt'}),
+                                               ('sample', {'.collapsed', '.txt'})])
+def test_profile_files(tmp_path, monkeypatch, mode, extensions):
+    # cProfile has no real call stacks, only the sampler writes collapsed ones
+    monkeypatch.setenv(PROFILE_ENV, mode)
+    monkeypatch.setenv(PROFILE_DIR_ENV, str(tmp_path))
+    monkeypatch.setattr(Profiling, 'profile_active', False)
+    assert profile_call('busy', busy_work) == busy_work()
+    assert {os.path.splitext(name)[1] for name in os.listdir(tmp_path)} == extensions
+
+
+def test_disabled_profiling_writes_nothing(tmp_path, monkeypatch):
+    monkeypatch.delenv(PROFILE_ENV, raising=False)
+    monkeypatch.setenv(PROFILE_DIR_ENV, str(tmp_path))
+    assert profile_call('busy', busy_work) == busy_work()
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,98 @@
+import os
+import numpy as np
+import pytest
+import ResultCache as result_cache_module
+from GraphAnalyzer import AverageDegreeCalculator
+from ResultCache import ResultCache, read_cached_sweep_data
+from ResultStore import ResultStore, result_store_path
+
+
+F_SPACE = np.linspace(0, 1, 5)
+ARGUMENTS = {'graph_type': 'ER', 'model_parameters': (100, 0.04), 'strategy': 'random',
+             'f_space': F_SPACE, 'samples': 10}
+
+
+def key(**changes):
+    return ResultCache.key(**dict(ARGUMENTS, **changes))
+
+
+def create_store(sub_dir, degree=3):
+    path = result_store_path('Component', 'ER', 100, 10, degree, str(sub_dir))
+    return ResultStore.create(path, {'model': 'ER'}, F_SPACE)
+
+
+@pytest.mark.parametrize('changes', [{'graph_type': 'BA'},
+                                     {'model_parameters': (200, 0.04)},
+                                     {'model_parameters': (100, 0.05)},
+                                     {'strategy': 'degree'},
+                                     {'f_space': np.linspace(0, 1, 6)},
+                                     {'samples': 11},
+                                     {'seed': 1},
+                                     {'strategy_options': {'k': 10}},
+                                     {'analyzer_options': {'backend': 'csr'}}])
+def test_key_changes_with_every_input(changes):
+    assert key(**changes) != key()
+
+
+def test_key_is_stable():
+    assert key() == key(model_parameters=[100.0, 0.04], seed=None, strategy_options={})
+    # the defaults of GraphAnalyzer are the same as no options at all
+    assert key(analyzer_options={'backend': 'networkx'}) == key()
+    assert key(seed=1) != key(seed=2)
+
+
+def test_key_changes_with_the_code(monkeypatch):
+    original_key = key()
+    monkeypatch.setattr(result_cache_module, 'code_version_hash', None)
+    monkeypatch.setattr(result_cache_module, 'SOURCE_MODULES',
+                        result_cache_module.SOURCE_MODULES[:-1])
+    assert key() != original_key
+    monkeypatch.setattr(result_cache_module, 'code_version_hash', 'edited')
+    assert key() != original_key
+
+
+def test_round_trip_refills_the_store(tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache'))
+    assert cache.get(key()) is None
+    (tmp_path / 'first').mkdir()
+    store = create_store(tmp_path / 'first')
+    curves = np.random.random((10, len(F_SPACE)))
+    store.append(curves, np.arange(10))
+    store.add_wall_time(7.0)
+    cache.put(key(), curves.mean(axis=0), 7, store=store)
+
+    (tmp_path / 'second').mkdir()
+    refilled = create_store(tmp_path / 'second')
+    refilled.append(np.ones((3, len(F_SPACE))), [1, 1, 1])
+    avg_component, time = cache.get(key(), store=refilled)
+    assert np.allclose(avg_component, curves.mean(axis=0))
+    assert time == 7
+    assert np.array_equal(refilled.curves(), store.curves())
+    assert refilled.total_time() == store.total_time()
+    assert refilled.wall_time() == 7
+    assert cache.get(key(samples=11)) is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache'))
+    keys = [key(samples=samples) for samples in (1, 2, 3)]
+    for index, entry_key in enumerate(keys):
+        cache.put(entry_key, np.zeros(len(F_SPACE)), index)
+        os.utime(cache.entry_path(entry_key), (1000 * (index + 1), 1000 * (index + 1)))
+    # reading the oldest entry makes the second one the least recently used
+    cache.get(keys[0])
+    cache.max_bytes = 2 * os.path.getsize(cache.entry_path(keys[0]))
+    cache.evict()
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[2]) is not None
+
+
+def test_cached_sweep_data_needs_every_degree(tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache'))
+    calculator = AverageDegreeCalculator(N=100, degree_to_get=2)
+    cache.put(ResultCache.key('ER', calculator.model_parameters('ER'), 'random', F_SPACE, 10),
+              np.full(len(F_SPACE), 0.5), 3)
+    assert read_cached_sweep_data(cache, 'Component', 'ER', 100, 10, [2, 4], F_SPACE) is None
+    data_dict = read_cached_sweep_data(cache, 'Component', 'ER', 100, 10, [2], F_SPACE)
+    assert data_dict['degrees']['2'] == ([0.5] * len(F_SPACE), 3)
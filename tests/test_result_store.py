@@ -0,0 +1,49 @@
+import numpy as np
+from time import time
+from ResultStore import ResultStore, read_result_stores, result_store_path
+from SweepRunner import SweepRunner
+
+
+F_SPACE = np.linspace(0, 1, 5)
+
+
+def create_store(sub_dir, degree=3, append=False):
+    path = result_store_path('Component', 'ER', 10, 4, degree, str(sub_dir))
+    return ResultStore.create(path, {'model': 'ER'}, F_SPACE, append=append)
+
+
+def test_rows_round_trip(tmp_path):
+    store = create_store(tmp_path)
+    curves = np.random.random((4, len(F_SPACE)))
+    store.append(curves[:3], [1, 2, 3])
+    store.append(curves[3:], [4])
+    assert store.number_of_samples() == 4
+    assert np.allclose(store.curves(), curves)
+    assert np.allclose(store.mean_curve(), curves.astype(np.float32).mean(axis=0))
+    assert store.total_time() == 10
+
+
+def test_wall_time_is_kept_apart_from_sample_times(tmp_path):
+    store = create_store(tmp_path)
+    assert store.wall_time() == 0
+    store.append(np.zeros((2, len(F_SPACE))), [30, 30])
+    store.add_wall_time(12.5)
+    # a resumed run reopens the store and adds its own time
+    store = create_store(tmp_path, append=True)
+    store.add_wall_time(2.5)
+    assert store.wall_time() == 15
+    assert store.number_of_samples() == 2
+    data_dict = read_result_stores('Component', 'ER', 10, 4, [3], sub_dir=str(tmp_path))
+    assert data_dict['degrees']['3'][1] == 15
+    # a new run replaces the store and its time
+    assert create_store(tmp_path).wall_time() == 0
+
+
+def test_sweep_records_wall_time_with_several_jobs(tmp_path):
+    runner = SweepRunner('ER', F_SPACE, 8, jobs=2, seed=3)
+    store = runner.open_store('Component', 40, 2, sub_dir=str(tmp_path))
+    start = time()
+    runner.run((40, 40), store=store)
+    elapsed = time() - start
+    assert store.number_of_samples() == 8
+    assert 0 < store.wall_time() <= elapsed
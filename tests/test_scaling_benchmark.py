@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+from Benchmarks.ScalingBenchmark import (benchmark_cases, find_regressions, run_benchmarks,
+                                         scaling_exponent)
+
+
+def result(times, exponent=None):
+    return {'times': {str(N): case_time for N, case_time in times.items()}, 'exponent': exponent}
+
+
+def test_scaling_exponent():
+    N_list = [100, 1000, 10000]
+    assert scaling_exponent(N_list, [1e-3 * N for N in N_list]) == pytest.approx(1)
+    assert scaling_exponent(N_list, [1e-6 * N ** 2 for N in N_list]) == pytest.approx(2)
+    assert scaling_exponent([100], [0.5]) is None
+
+
+def test_find_regressions():
+    baseline = {'case': result({100: 0.1, 1000: 1.0}, exponent=1.0),
+                'fast_case': result({100: 1e-4}, exponent=None)}
+    assert find_regressions({'case': result({100: 0.12, 1000: 1.2}, exponent=1.0)}, baseline) == []
+    regressions = find_regressions({'case': result({100: 0.1, 1000: 1.5}, exponent=1.0)}, baseline)
+    assert regressions == ['case N=1000: 1.5000 s, baseline 1.0000 s']
+    regressions = find_regressions({'case': result({100: 0.1}, exponent=1.3)}, baseline)
+    assert regressions == ['case: exponent 1.30, baseline 1.00']
+    assert len(find_regressions({'case': result({100: 0.2}, exponent=1.3)}, baseline,
+                                threshold=1.5, exponent_threshold=0.5)) == 0
+    # times under the noise floor, new cases and new N are not compared
+    assert find_regressions({'fast_case': result({100: 5e-4})}, baseline) == []
+    assert find_regressions({'new_case': result({100: 9.0}, exponent=3.0)}, baseline) == []
+    assert find_regressions({'case': result({10000: 99.0})}, baseline) == []
+
+
+@pytest.mark.parametrize('analyzer_options', [{'backend': 'csr', 'generator': 'numpy'},
+                                              {'backend': 'networkx', 'generator': 'networkx'}])
+def test_every_case_runs(analyzer_options):
+    np.random.seed(0)
+    results = run_benchmarks([100, 200], 1, 4, analyzer_options)
+    assert set(results) == set(benchmark_cases(4, analyzer_options))
+    for case_result in results.values():
+        assert set(case_result['times']) == {'100', '200'}
+        assert case_result['exponent'] is not None
+    assert set(run_benchmarks([100], 1, 4, analyzer_options, case_names=['clustering'])) == \
+        {'clustering'}
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+from GraphAnalyzer import GraphAnalyzer
+from StageTimer import StageTimer
+
+
+@pytest.mark.parametrize('backend', ['networkx', 'csr'])
+def test_random_sweep_stages(backend):
+    stage_timer = StageTimer()
+    graph = GraphAnalyzer('ERG', (300, 0.01), backend=backend, stage_timer=stage_timer)
+    graph.giant_component_sweep(np.linspace(0, 1, 11))
+    metrics = stage_timer.metrics()
+    # the random order is removal work, no ranking is computed
+    assert metrics['stage_calls'] == {'generation': 1, 'centrality': 0, 'removal': 1, 'component': 1}
+    assert metrics['stage_times']['removal'] > 0
+
+
+def test_ranking_sweep_stages():
+    stage_timer = StageTimer()
+    graph = GraphAnalyzer('BA', (300, 2), stage_timer=stage_timer)
+    graph.giant_component_sweep(np.linspace(0, 1, 11), centrality='closeness')
+    metrics = stage_timer.metrics()
+    assert metrics['stage_calls']['centrality'] >= 1
+    assert metrics['stage_calls']['removal'] == 0
+    assert metrics['stage_times']['centrality'] > 0
+
+
+def test_nested_stages_add_up_to_the_total():
+    stage_timer = StageTimer()
+    with stage_timer.measure('centrality'):
+        with stage_timer.measure('removal'):
+            sum(range(100000))
+        sum(range(100000))
+    times = stage_timer.metrics()['stage_times']
+    assert times['removal'] > 0 and times['centrality'] > 0
+    assert times['generation'] == 0 and times['component'] == 0
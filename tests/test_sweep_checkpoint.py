@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+from SweepRunner import SweepRunner
+
+
+N = 60
+MODEL_PARAMETERS = (N, 90)
+F_SPACE = np.linspace(0, 1, 11)
+
+
+class Interrupted(Exception):
+    pass
+
+
+def uninterrupted_run(sub_dir):
+    runner = SweepRunner('ER', F_SPACE, 12, jobs=1, seed=7)
+    store = runner.open_store('Component', N, 3, sub_dir=str(sub_dir))
+    return runner.run(MODEL_PARAMETERS, store=store), store.curves()
+
+
+def interrupted_run(sub_dir, monkeypatch, completed_chunks):
+    # the sweep stops after a few chunks, as after a kill
+    shard_results = SweepRunner.shard_results
+
+    def stopping_shard_results(self, model_parameters, indices):
+        for done, result in enumerate(shard_results(self, model_parameters, indices)):
+            if done == completed_chunks:
+                raise Interrupted()
+            yield result
+    monkeypatch.setattr(SweepRunner, 'shard_results', stopping_shard_results)
+    runner = SweepRunner('ER', F_SPACE, 12, jobs=1, seed=7)
+    checkpoint = runner.open_checkpoint('Component', N, sub_dir=str(sub_dir), interval=0)
+    store = runner.open_store('Component', N, 3, sub_dir=str(sub_dir))
+    with pytest.raises(Interrupted):
+        runner.run(MODEL_PARAMETERS, store=store, checkpoint=checkpoint, key='3')
+    monkeypatch.setattr(SweepRunner, 'shard_results', shard_results)
+
+
+@pytest.mark.parametrize('resume_jobs', [1, 2])
+def test_resumed_sweep_matches_uninterrupted_run(tmp_path, monkeypatch, resume_jobs):
+    reference_dir, sub_dir = tmp_path / 'reference', tmp_path / 'resumed'
+    reference_dir.mkdir()
+    sub_dir.mkdir()
+    expected_curve, expected_store = uninterrupted_run(reference_dir)
+    interrupted_run(sub_dir, monkeypatch, completed_chunks=3)
+
+    # a resumed run takes the seed and chunks from the checkpoint, whatever its own
+    runner = SweepRunner('ER', F_SPACE, 12, jobs=resume_jobs)
+    checkpoint = runner.open_checkpoint('Component', N, sub_dir=str(sub_dir), resume=True)
+    assert checkpoint.resumed
+    store = runner.open_store('Component', N, 3, sub_dir=str(sub_dir), append=True)
+    assert 0 < store.number_of_samples() < 12
+    curve = runner.run(MODEL_PARAMETERS, store=store, checkpoint=checkpoint, key='3')
+    checkpoint.remove()
+
+    assert np.array_equal(curve, expected_curve)
+    # chunks finish in any order, the stored samples are the same set of rows
+    assert store.number_of_samples() == 12
+    assert np.array_equal(np.sort(store.curves(), axis=0), np.sort(expected_store, axis=0))
+
+
+def test_seeded_sweep_does_not_depend_on_jobs():
+    curves = [SweepRunner('ER', F_SPACE, 12, jobs=jobs, seed=7).run(MODEL_PARAMETERS)
+              for jobs in (1, 3)]
+    assert np.array_equal(curves[0], curves[1])
+    other_seed = SweepRunner('ER', F_SPACE, 12, jobs=1, seed=8).run(MODEL_PARAMETERS)
+    assert not np.array_equal(curves[0], other_seed)
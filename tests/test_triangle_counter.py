@@ -0,0 +1,47 @@
+import networkx as nx
+import numpy as np
+import pytest
+from TriangleCounter import TriangleCounter
+
+
+GRAPHS = [
+    lambda: nx.gnp_random_graph(200, 0.05, seed=1),
+    lambda: nx.barabasi_albert_graph(300, 4, seed=2),
+    lambda: nx.watts_strogatz_graph(150, 6, 0.1, seed=3),
+    lambda: nx.complete_graph(40),
+    lambda: nx.star_graph(30),
+    lambda: nx.empty_graph(10),
+]
+
+
+def counter(graph, **kwargs):
+    return TriangleCounter(graph.number_of_nodes(), np.array(graph.edges(), dtype=np.int64), **kwargs)
+
+
+@pytest.mark.parametrize('make_graph', GRAPHS)
+@pytest.mark.parametrize('chunk_size', [2 ** 22, 7, 1])
+def test_triangles_match_networkx(make_graph, chunk_size):
+    graph = make_graph()
+    triangles = counter(graph, chunk_size=chunk_size).count()
+    expected = nx.triangles(graph)
+    assert np.array_equal(triangles, [expected[node] for node in range(graph.number_of_nodes())])
+
+
+@pytest.mark.parametrize('make_graph', GRAPHS)
+def test_clustering_matches_networkx(make_graph):
+    graph = make_graph()
+    clustering = counter(graph, chunk_size=5).clustering()
+    expected = nx.clustering(graph)
+    assert np.allclose(clustering['coefficients'],
+                       [expected[node] for node in range(graph.number_of_nodes())])
+    assert clustering['average'] == pytest.approx(nx.average_clustering(graph))
+    assert clustering['transitivity'] == pytest.approx(nx.transitivity(graph))
+
+
+def test_repeated_links_and_self_loops_are_ignored():
+    graph = nx.gnp_random_graph(80, 0.1, seed=4)
+    edges = np.array(graph.edges(), dtype=np.int64)
+    noisy = np.concatenate((edges, edges[:, ::-1], edges[:20], [[5, 5], [9, 9]]))
+    triangles = TriangleCounter(80, noisy).count()
+    expected = nx.triangles(graph)
+    assert np.array_equal(triangles, [expected[node] for node in range(80)])
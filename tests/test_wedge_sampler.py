@@ -0,0 +1,95 @@
+import networkx as nx
+import numpy as np
+import pytest
+from TriangleCounter import WedgeSampler
+from GraphAnalyzer import GraphAnalyzer
+
+
+SEEDS = range(200)
+
+
+@pytest.fixture(scope='module')
+def graph():
+    return nx.watts_strogatz_graph(400, 8, 0.2, seed=11)
+
+
+def sampler(graph, seed):
+    return WedgeSampler(graph.number_of_nodes(), np.array(graph.edges(), dtype=np.int64), seed=seed)
+
+
+def coverage(estimates, exact):
+    return np.mean([lower <= exact <= upper for lower, upper in
+                    (estimate['interval'] for estimate in estimates)])
+
+
+def test_transitivity_interval_coverage(graph):
+    estimates = [sampler(graph, seed).transitivity(2000) for seed in SEEDS]
+    assert coverage(estimates, nx.transitivity(graph)) >= 0.9
+
+
+def test_average_clustering_interval_coverage(graph):
+    estimates = [sampler(graph, seed).average_clustering(2000) for seed in SEEDS]
+    assert coverage(estimates, nx.average_clustering(graph)) >= 0.9
+
+
+def test_local_clustering_interval_coverage(graph):
+    exact = nx.clustering(graph)
+    exact = np.array([exact[node] for node in range(graph.number_of_nodes())])
+    covered = []
+    for seed in range(20):
+        result = sampler(graph, seed).local_clustering(400 * 200)
+        assert result['samples_per_node'] == 200
+        intervals = result['intervals']
+        covered.append((intervals[:, 0] <= exact) & (exact <= intervals[:, 1]))
+    assert np.mean(covered) >= 0.9
+
+
+def test_local_clustering_keeps_within_budget(graph):
+    with pytest.raises(ValueError):
+        sampler(graph, 0).local_clustering(graph.number_of_nodes() - 1)
+
+
+def test_intervals_keep_width_at_exact_proportions():
+    complete = sampler(nx.complete_graph(20), 0)
+    result = complete.transitivity(500)
+    assert result['estimate'] == 1.0
+    assert result['interval'][0] < 1.0 and result['interval'][1] == 1.0
+    tree = sampler(nx.balanced_tree(3, 4), 0)
+    result = tree.average_clustering(500)
+    assert result['estimate'] == 0.0
+    assert result['interval'][0] == 0.0 and result['interval'][1] > 0.0
+
+
+def counted_wedges(monkeypatch):
+    drawn = []
+    closed_wedges = WedgeSampler.closed_wedges
+
+    def counting_closed_wedges(self, centres):
+        drawn.append(len(centres))
+        return closed_wedges(self, centres)
+    monkeypatch.setattr(WedgeSampler, 'closed_wedges', counting_closed_wedges)
+    return drawn
+
+
+@pytest.mark.parametrize('backend', ['networkx', 'csr'])
+def test_sampled_clustering_keeps_within_one_budget(graph, monkeypatch, backend):
+    drawn = counted_wedges(monkeypatch)
+    analyzer = GraphAnalyzer('custom', 'WS', initial_graph=graph.copy(), backend=backend)
+    # fewer wedges than nodes, too few for per-node estimates
+    analyzer.calculate_clustering_coefficients(samples=301, seed=1)
+    assert sum(drawn) == 301
+    assert len(analyzer.coefficients) == 0
+    lower, upper = analyzer.transitivity_interval
+    assert lower <= analyzer.transitivity <= upper
+    lower, upper = analyzer.average_coefficient_interval
+    assert lower <= analyzer.average_coefficient <= upper
+
+
+def test_sampled_local_clustering_is_opt_in(graph, monkeypatch):
+    drawn = counted_wedges(monkeypatch)
+    analyzer = GraphAnalyzer('custom', 'WS', initial_graph=graph.copy())
+    analyzer.calculate_clustering_coefficients(samples=3 * 4000 + 2, seed=1, local=True)
+    assert sum(drawn) == 3 * 4000 + 2
+    assert analyzer.coefficient_intervals.shape == (400, 2)
+    with pytest.raises(ValueError):
+        analyzer.calculate_clustering_coefficients(samples=3 * 399, seed=1, local=True)